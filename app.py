@@ -3,23 +3,58 @@
 import streamlit as st
 from config.constants import ARCOS_RED, PAGE_TITLE, PAGE_LAYOUT, SIDEBAR_STATE
 from utils.session import initialize_session_state
-from utils.exports import get_csv_data, get_excel_data
+from utils.progress import get_completion_tracker
 from components.sidebar import render_sidebar
 from components.header import render_header
 from components.footer import render_footer
 from utils.ui_helpers import render_icon_tabs, render_css
-from tabs.location_hierarchy import render_location_hierarchy_form
-from tabs.trouble_locations import render_trouble_locations_form
-from tabs.job_classifications import render_job_classifications
-from tabs.callout_reasons import render_callout_reasons_form
-from tabs.event_types import render_event_types_form
-from tabs.matrix_locations import render_matrix_locations_callout_types
-from tabs.global_config import render_global_config
-from tabs.data_interfaces import render_data_interfaces
-from tabs.additions import render_additions
-from datetime import datetime
+import importlib
 import uuid
 
+# Tab renderers as (module, function); a tab's module is imported the first
+# time the tab is shown, so cold start only pays for the landing tab
+TAB_RENDERERS = {
+    "Location Hierarchy": ("tabs.location_hierarchy", "render_location_hierarchy_form"),
+    "Trouble Locations": ("tabs.trouble_locations", "render_trouble_locations_form"),
+    "Job Classifications": ("tabs.job_classifications", "render_job_classifications"),
+    "Callout Reasons": ("tabs.callout_reasons", "render_callout_reasons_form"),
+    "Event Types": ("tabs.event_types", "render_event_types_form"),
+    "Callout Type Configuration": ("tabs.matrix_locations", "render_matrix_locations_callout_types"),
+    "Global Configuration": ("tabs.global_config", "render_global_config"),
+    "Data and Interfaces": ("tabs.data_interfaces", "render_data_interfaces"),
+    "Additions": ("tabs.additions", "render_additions")
+}
+
+def load_tab_renderer(tab_name):
+    """Import the module for tab_name on first use and return its render function"""
+    module_name, function_name = TAB_RENDERERS[tab_name]
+    return getattr(importlib.import_module(module_name), function_name)
+
+@st.fragment
+def render_active_tab(current_tab, completed_tabs):
+    """Render the active tab; widget changes inside it rerun only this fragment"""
+    # The active tab is the only one that can write to its section
+    tracker = get_completion_tracker()
+    tracker.mark_dirty(current_tab)
+    
+    try:
+        if current_tab in TAB_RENDERERS:
+            load_tab_renderer(current_tab)()
+            
+    except Exception as e:
+        st.error(f"Error rendering tab: {str(e)}")
+        import traceback
+        print(traceback.format_exc())
+        # Show basic error recovery options
+        st.markdown("### 🔧 Error Recovery")
+        st.info("If you're experiencing issues, try refreshing the page or importing a backup file.")
+        return
+    
+    # The progress bar lives outside this fragment, so rerun the whole app when
+    # this tab's edits change the number of completed sections
+    if tracker.refresh(st.session_state) != completed_tabs:
+        st.rerun()
+
 # Import the new data import module
 try:
     from utils.data_import import render_import_export_section
@@ -69,49 +104,11 @@ def main():
             "Data and Interfaces": "🔗", "Additions": "➕"
         }
 
-        # Calculate completion progress
-        completed_tabs = 0
+        # Calculate completion progress (only sections marked dirty are re-checked)
+        tracker = get_completion_tracker()
+        completed_tabs = tracker.refresh(st.session_state)
         total_tabs = len(tabs)
         
-        # Check each tab for completion
-        if 'hierarchy_data' in st.session_state and st.session_state.hierarchy_data.get("entries") and any(entry.get("level1") for entry in st.session_state.hierarchy_data["entries"]):
-            completed_tabs += 1
-        if 'trouble_locations' in st.session_state and any(loc.get("location") for loc in st.session_state.trouble_locations if loc.get("location")):
-            completed_tabs += 1
-        if 'job_classifications' in st.session_state and any(job.get("title") for job in st.session_state.job_classifications if job.get("title")):
-            completed_tabs += 1
-        if 'selected_callout_reasons' in st.session_state and st.session_state.selected_callout_reasons:
-            completed_tabs += 1
-        if 'event_types' in st.session_state and any(event.get("use") for event in st.session_state.event_types):
-            completed_tabs += 1
-        if 'responses' in st.session_state and any(k.startswith("matrix_") for k in st.session_state.responses):
-            completed_tabs += 1
-        # Fixed: Better check for global configuration
-        if 'global_config_answers' in st.session_state and any(v for v in st.session_state.global_config_answers.values() if v not in (None, '', False, 0)):
-            completed_tabs += 1
-        # Fixed: Better check for data interfaces
-        if 'data_interfaces' in st.session_state:
-            # Check if any top-level values are filled
-            has_data = any(
-                v for v in [
-                    st.session_state.data_interfaces.get('employee_data', ''),
-                    st.session_state.data_interfaces.get('pii_consideration', ''),
-                    st.session_state.data_interfaces.get('hri_oti_review', '')
-                ] if v
-            )
-            # Also check nested dictionaries
-            if not has_data and 'hr_interface' in st.session_state.data_interfaces:
-                has_data = any(v for v in st.session_state.data_interfaces['hr_interface'].values() if v)
-            if not has_data and 'overtime_interface' in st.session_state.data_interfaces:
-                has_data = any(v for v in st.session_state.data_interfaces['overtime_interface'].values() if v)
-            if has_data:
-                completed_tabs += 1
-        # Fixed: Better check for additions
-        if 'additions' in st.session_state:
-            has_additions = any(v for v in st.session_state.additions.values() if v not in (None, '', False, 0, [], {}))
-            if has_additions:
-                completed_tabs += 1
-        
         progress = completed_tabs / total_tabs
         st.progress(progress)
         st.write(f"📊 Progress: {completed_tabs}/{total_tabs} sections completed ({int(progress * 100)}%)")
@@ -120,35 +117,8 @@ def main():
 
         st.markdown("<hr style='margin: 12px 0;'>", unsafe_allow_html=True)
 
-        try:
-            current_tab = st.session_state.get("current_tab", tabs[0])
-            
-            if current_tab == "Location Hierarchy":
-                render_location_hierarchy_form()
-            elif current_tab == "Trouble Locations":
-                render_trouble_locations_form()
-            elif current_tab == "Job Classifications":
-                render_job_classifications()
-            elif current_tab == "Callout Reasons":
-                render_callout_reasons_form()
-            elif current_tab == "Event Types":
-                render_event_types_form()
-            elif current_tab == "Callout Type Configuration":
-                render_matrix_locations_callout_types()
-            elif current_tab == "Global Configuration":
-                render_global_config()
-            elif current_tab == "Data and Interfaces":
-                render_data_interfaces()
-            elif current_tab == "Additions":
-                render_additions()
-                
-        except Exception as e:
-            st.error(f"Error rendering tab: {str(e)}")
-            import traceback
-            print(traceback.format_exc())
-            # Show basic error recovery options
-            st.markdown("### 🔧 Error Recovery")
-            st.info("If you're experiencing issues, try refreshing the page or importing a backup file.")
+        current_tab = st.session_state.get("current_tab", tabs[0])
+        render_active_tab(current_tab, completed_tabs)
 
         # Add some space for the floating footer
         st.markdown("<div style='height: 80px;'></div>", unsafe_allow_html=True)
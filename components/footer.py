@@ -3,12 +3,6 @@
 # ============================================================================
 import streamlit as st
 from datetime import datetime
-from utils.exports import (
-    export_location_hierarchy_to_csv,
-    export_location_hierarchy_to_excel,
-    export_all_data_to_excel,
-    export_all_data_to_csv
-)
 
 def render_footer(unique_id):
     """Render the footer with working export buttons"""
@@ -42,32 +36,41 @@ def render_footer(unique_id):
     """, unsafe_allow_html=True)
     
     # Create a sidebar section for export buttons
+    # (a fragment can only write inside its own container, so enter the sidebar first)
     with st.sidebar:
-        st.markdown("---")
-        st.markdown("### 📤 Export Data")
-        
-        # Export buttons in sidebar
-        if st.button("📄 Export CSV", key=f"sidebar_csv_{unique_id}", use_container_width=True):
-            csv_data = export_all_data_to_csv()
+        render_export_buttons(unique_id)
+
+@st.fragment
+def render_export_buttons(unique_id):
+    """Render the sidebar export buttons; clicking one reruns only this fragment"""
+    st.markdown("---")
+    st.markdown("### 📤 Export Data")
+    
+    # Export buttons in sidebar
+    if st.button("📄 Export CSV", key=f"sidebar_csv_{unique_id}", use_container_width=True):
+        # Imported on click: the export module pulls in pandas
+        from utils.exports import export_all_data_to_csv
+        csv_data = export_all_data_to_csv()
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        st.download_button(
+            label="⬇️ Download CSV",
+            data=csv_data,
+            file_name=f"arcos_sig_complete_{timestamp}.csv",
+            mime="text/csv",
+            key=f"download_csv_sidebar_{timestamp}",
+            use_container_width=True
+        )
+    
+    if st.button("📊 Export Excel", key=f"sidebar_excel_{unique_id}", use_container_width=True):
+        from utils.exports import export_all_data_to_excel
+        excel_data = export_all_data_to_excel()
+        if excel_data:  # Only show download if export was successful
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             st.download_button(
-                label="⬇️ Download CSV",
-                data=csv_data,
-                file_name=f"arcos_sig_complete_{timestamp}.csv",
-                mime="text/csv",
-                key=f"download_csv_sidebar_{timestamp}",
+                label="⬇️ Download Excel",
+                data=excel_data,
+                file_name=f"arcos_sig_complete_{timestamp}.xlsx",
+                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                key=f"download_excel_sidebar_{timestamp}",
                 use_container_width=True
-            )
-        
-        if st.button("📊 Export Excel", key=f"sidebar_excel_{unique_id}", use_container_width=True):
-            excel_data = export_all_data_to_excel()
-            if excel_data:  # Only show download if export was successful
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                st.download_button(
-                    label="⬇️ Download Excel",
-                    data=excel_data,
-                    file_name=f"arcos_sig_complete_{timestamp}.xlsx",
-                    mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                    key=f"download_excel_sidebar_{timestamp}",
-                    use_container_width=True
-                )
\ No newline at end of file
+            )
\ No newline at end of file
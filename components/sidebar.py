@@ -2,11 +2,19 @@
 # SIDEBAR COMPONENT
 # ============================================================================
 import streamlit as st
-from utils.ai_assistant import get_openai_response, save_chat_history
+from utils.assistant_requests import submit_assistant_request, render_assistant_request
+from utils.ai_assistant import get_context_messages, get_recent_messages, clear_chat_history
 from config.constants import ARCOS_RED
+from config.settings import MAX_CHAT_HISTORY
 
+def _assistant_message_html(content):
+    """Return the chat bubble markup for an assistant message"""
+    return (f"<div style='background-color: #e6f7ff; padding: 8px; border-radius: 5px; margin-bottom: 8px;"
+            f"border-left: 3px solid #1E88E5;'><b>Assistant:</b> {content}</div>")
+
+@st.fragment
 def render_sidebar(unique_id):
-    """Render the sidebar with the AI assistant"""
+    """Render the sidebar with the AI assistant; call inside st.sidebar so it reruns on its own"""
     # Logo and title for sidebar
     try:
         st.image("https://www.arcos-inc.com/wp-content/uploads/2020/10/logo-arcos-news.png", width=120)
@@ -34,21 +42,23 @@ def render_sidebar(unique_id):
             current_tab = st.session_state.current_tab
             context = f"The user is working on the ARCOS System Implementation Guide form. Currently on the '{current_tab}' tab."
 
-            # Show spinner while getting response
-            with st.spinner("Getting response..."):
-                # Get response from OpenAI
-                response = get_openai_response(user_question, context)
+            # Stream the answer in the background; it is added to the chat history once complete
+            submit_assistant_request("sidebar", user_question, context, stream=True,
+                                     history=get_context_messages())
 
-                # Store in chat history
-                save_chat_history(user_question, response)
+    render_assistant_request(
+        "sidebar",
+        render_answer=lambda text: st.markdown(_assistant_message_html(text), unsafe_allow_html=True),
+        keep_answer=False
+    )
 
     # Display chat history
     st.markdown('<p style="font-weight: bold; margin-top: 20px;">Chat History</p>', unsafe_allow_html=True)
 
     chat_container = st.container()
     with chat_container:
-        # Show up to 10 most recent messages
-        recent_messages = st.session_state.chat_history[-10:] if len(st.session_state.chat_history) > 0 else []
+        # Show the most recent messages
+        recent_messages = get_recent_messages(MAX_CHAT_HISTORY)
         for message in recent_messages:
             if message["role"] == "user":
                 st.markdown(
@@ -57,13 +67,9 @@ def render_sidebar(unique_id):
                     unsafe_allow_html=True
                 )
             else:
-                st.markdown(
-                    f"<div style='background-color: #e6f7ff; padding: 8px; border-radius: 5px; margin-bottom: 8px;"
-                    f"border-left: 3px solid #1E88E5;'><b>Assistant:</b> {message['content']}</div>", 
-                    unsafe_allow_html=True
-                )
+                st.markdown(_assistant_message_html(message['content']), unsafe_allow_html=True)
 
     # Clear chat history button
     if st.button("Clear Chat History", key=f"clear_chat_{unique_id}", type="secondary"):
-        st.session_state.chat_history = []
+        clear_chat_history()
         st.rerun()
\ No newline at end of file
@@ -1,6 +1,7 @@
 # ============================================================================
 # CONSTANTS AND CONFIGURATION VALUES
 # ============================================================================
+from utils.frozen import freeze
 
 # Streamlit page configuration
 PAGE_TITLE = "ARCOS SIG Form"
@@ -106,8 +107,25 @@ OPENAI_MODEL = "gpt-4o-2024-08-06"
 OPENAI_MAX_TOKENS = 800
 OPENAI_TEMPERATURE = 0.7
 
-# Default data structures
-DEFAULT_HIERARCHY_DATA = {
+# Sections of the Global Configuration Options tab
+GLOBAL_CONFIG_SECTIONS = [
+    "Roster Admin", "Calling Config", "VRU Config",
+    "One-Call Rules", "Availability", "Employee Page",
+    "Work & Rest Rules", "Charge & Credit", "Misc & New Year"
+]
+
+# Topics offered by each tab's help button; the help corpus pre-generates an
+# answer for every (tab, topic) pair (see utils.help_corpus)
+HELP_TOPICS = {
+    "Matrix of Locations and Callout Types": ["Callout Types", "Matrix Configuration", "Best Practices for Callout Types"],
+    "Trouble Locations": ["Trouble Locations", "Pronunciation Guide", "Recording Requirements", "Best Practices"],
+    "Event Types": ["Event Types", "Schedule Exceptions", "Override Configuration", "Mobile Configuration"],
+    "Global Configuration Options": GLOBAL_CONFIG_SECTIONS
+}
+
+# Default data structures, frozen because every session shares them until
+# its first edit (see utils.session.thaw_section)
+DEFAULT_HIERARCHY_DATA = freeze({
     "levels": ["Level 1", "Level 2", "Level 3", "Level 4"],
     "labels": ["Parent Company", "Business Unit", "Division", "OpCenter"],
     "entries": [
@@ -126,31 +144,37 @@ DEFAULT_HIERARCHY_DATA = {
                 "Notification": False,
                 "Notification (No Response)": False
             },
-            "callout_reasons": ""
+            "callout_reasons": "",
+            "row_id": "default"
         }
     ],
     "timezone": "ET / CT / MT / AZ / PT"
-}
+})
 
-DEFAULT_CALLOUT_TYPES = [
+DEFAULT_CALLOUT_TYPES = freeze([
     "Normal", "All Hands on Deck", "Fill Shift", "Travel", 
     "Notification", "Notification (No Response)"
-]
+])
 
-DEFAULT_CALLOUT_REASONS = [
+DEFAULT_CALLOUT_REASONS = freeze([
     "Gas Leak", "Gas Fire", "Gas Emergency", "Car Hit Pole", "Wires Down"
-]
+])
 
-DEFAULT_JOB_CLASSIFICATION = {
+DEFAULT_JOB_CLASSIFICATION = freeze({
     "type": "", 
     "title": "", 
     "ids": ["", "", "", "", ""], 
     "recording": ""
-}
+})
 
-DEFAULT_TROUBLE_LOCATION = {
+DEFAULT_TROUBLE_LOCATION = freeze({
     "recording_needed": True, 
     "id": "", 
     "location": "", 
     "verbiage": ""
-}
\ No newline at end of file
+})
+
+# Starting rows for a new session; a row id only has to be unique within its list
+DEFAULT_JOB_CLASSIFICATIONS = freeze([dict(DEFAULT_JOB_CLASSIFICATION, row_id="default")])
+
+DEFAULT_TROUBLE_LOCATIONS = freeze([dict(DEFAULT_TROUBLE_LOCATION, row_id="default")])
\ No newline at end of file
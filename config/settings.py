@@ -1,6 +1,8 @@
 # ============================================================================
 # ARCOS SIG FORM - CONFIGURATION SETTINGS
 # ============================================================================
+import os
+import tempfile
 
 # ============================================================================
 # APPLICATION SETTINGS
@@ -17,6 +19,10 @@ DEFAULT_TAB = "Location Hierarchy"
 # Enable or disable the AI assistant feature
 ENABLE_AI_ASSISTANT = True
 
+# Upper bound on the app's own import time at cold start, checked by
+# tests/test_import_budget.py
+STARTUP_IMPORT_BUDGET_SECONDS = 0.5
+
 # ============================================================================
 # FILE PATHS
 # ============================================================================
@@ -28,6 +34,9 @@ CALLOUT_REASONS_PATH = "data/callout_reasons.json"
 # Path to SIG descriptions JSON file
 SIG_DESCRIPTIONS_PATH = "data/sig_descriptions.json"
 
+# Pre-generated help answers written by `python -m utils.help_corpus`
+HELP_CORPUS_PATH = "data/help_corpus.json"
+
 # Path to ARCOS logo
 LOGO_PATH = "https://www.arcos-inc.com/wp-content/uploads/2020/10/logo-arcos-news.png"
 
@@ -50,6 +59,62 @@ Consider the user's current task (indicated by the tab they're working on) when
 # Maximum number of chat history messages to display
 MAX_CHAT_HISTORY = 10
 
+# Chat messages kept in session memory; older ones are appended to a
+# per-session JSON-lines log in CHAT_LOG_DIR (None drops them instead).
+# Logs hold user chat content and are deleted once older than
+# CHAT_LOG_MAX_AGE_SECONDS
+CHAT_HISTORY_MAX_MESSAGES = 50
+CHAT_LOG_DIR = os.path.join(tempfile.gettempdir(), "arcos_sig_chat_logs")
+CHAT_LOG_MAX_AGE_SECONDS = 7 * 24 * 60 * 60
+
+# Estimated tokens of recent conversation sent along with a sidebar question
+AI_HISTORY_TOKEN_BUDGET = 1000
+
+# Reference snippets retrieved from the SIG descriptions, callout reasons and
+# global configuration questions are attached to each question, up to
+# AI_CONTEXT_TOP_K snippets and AI_CONTEXT_TOKEN_BUDGET estimated tokens
+AI_CONTEXT_TOP_K = 5
+AI_CONTEXT_TOKEN_BUDGET = 600
+
+# Assistant responses are cached per (model, system context, prompt) and
+# shared by every session, so canned "Get Help" prompts hit the API once
+AI_RESPONSE_CACHE_TTL_SECONDS = 24 * 60 * 60
+AI_RESPONSE_CACHE_MAX_ENTRIES = 256
+
+# Set to a file path (e.g. "data/ai_response_cache.sqlite3") to keep cached
+# responses across restarts; None keeps the cache in memory only
+AI_RESPONSE_CACHE_PATH = None
+
+# Assistant calls run on a thread pool shared by every session; this caps how
+# many are in flight against the API at once
+AI_MAX_CONCURRENT_REQUESTS = 4
+
+# Seconds before a pending assistant call is given up on
+AI_REQUEST_TIMEOUT_SECONDS = 60
+
+# Seconds between checks on a pending assistant call
+AI_POLL_INTERVAL_SECONDS = 1.0
+
+# Seconds between redraws of a streamed answer while it is arriving, short
+# enough that text appears as it streams rather than in jumps
+AI_STREAM_POLL_INTERVAL_SECONDS = 0.1
+
+# Process-wide limits on OpenAI calls: at most AI_RATE_LIMIT_PER_MINUTE calls,
+# with bursts of up to AI_RATE_LIMIT_BURST, queueing for at most
+# AI_QUEUE_TIMEOUT_SECONDS before giving up
+AI_RATE_LIMIT_PER_MINUTE = 60
+AI_RATE_LIMIT_BURST = 10
+AI_QUEUE_TIMEOUT_SECONDS = 30
+
+# Retries with exponential backoff on rate limiting (429) and server errors (5xx)
+AI_MAX_RETRIES = 3
+AI_RETRY_BASE_DELAY_SECONDS = 1.0
+AI_RETRY_MAX_DELAY_SECONDS = 20
+
+# After this many consecutive failures, refuse calls for AI_CIRCUIT_RESET_SECONDS
+AI_CIRCUIT_FAILURE_THRESHOLD = 5
+AI_CIRCUIT_RESET_SECONDS = 30
+
 # ============================================================================
 # EXPORT SETTINGS
 # ============================================================================
@@ -62,4 +127,17 @@ DEFAULT_EXPORT_FILENAME = "arcos_sig"
 INCLUDE_TIMESTAMP_IN_FILENAME = True
 
 # Timestamp format for export filenames
-TIMESTAMP_FORMAT = "%Y%m%d_%H%M%S"
\ No newline at end of file
+TIMESTAMP_FORMAT = "%Y%m%d_%H%M%S"
+
+# Excel exports are assembled in a temporary file that moves from RAM to disk
+# once it grows past this many bytes
+EXCEL_EXPORT_SPOOL_MAX_BYTES = 8 * 1024 * 1024
+
+# ============================================================================
+# IMPORT SETTINGS
+# ============================================================================
+# Configuration for data import functionality
+
+# Number of spreadsheet rows handed to a sheet parser at a time when streaming
+# an Excel import (bounds memory use for very large workbooks)
+IMPORT_CHUNK_ROWS = 2000
\ No newline at end of file
@@ -3,8 +3,8 @@
 # ============================================================================
 import streamlit as st
 import pandas as pd
-import json
-from utils.session import load_callout_reasons
+from utils.callout_catalog import get_callout_catalog, save_callout_catalog
+from utils.reason_search import get_reason_search_index
 
 def render_callout_reasons_form():
     """Render the Callout Reasons form with interactive elements"""
@@ -18,16 +18,16 @@ def render_callout_reasons_form():
         and mark which one should be the default. Each reason has pre-recorded verbiage that will be spoken during callouts.
         """)
     
-    # Load callout reasons
-    callout_reasons = load_callout_reasons()
+    # Load callout reasons (shared across sessions - never mutate these dicts)
+    catalog = get_callout_catalog()
+    callout_reasons = catalog.reasons
     
     # Store selected reasons in session state if not already there
     if 'selected_callout_reasons' not in st.session_state:
-        st.session_state.selected_callout_reasons = [r["ID"] for r in callout_reasons if r.get("Use?") == "x"]
+        st.session_state.selected_callout_reasons = list(catalog.used_ids)
     
     if 'default_callout_reason' not in st.session_state:
-        default_reasons = [r["ID"] for r in callout_reasons if r.get("Default?") == "x"]
-        st.session_state.default_callout_reason = default_reasons[0] if default_reasons else ""
+        st.session_state.default_callout_reason = catalog.default_id
     
     # Split the UI into left and right parts (filters/list on left, preview on right)
     # Using separate containers to avoid nesting issues
@@ -54,26 +54,20 @@ def render_callout_reasons_form():
                     st.session_state.selected_callout_reasons = []
                     st.rerun()
     
-    # Apply filters
-    filtered_reasons = callout_reasons.copy()  # Create a copy to avoid modifying the original
+    # Apply filters as positions into the catalog, looked up in the prebuilt search index
+    search_index = get_reason_search_index(catalog)
+    search_term = search_term.strip()
+    filtered_positions = search_index.search(search_term)
     
-    if search_term:
-        search_term = search_term.lower().strip()  # Normalize and clean the search term
-        
-        # Create a new filtered list based on search term
-        filtered_reasons = []
-        for reason in callout_reasons:
-            # Convert values to strings to avoid type errors
-            reason_id = str(reason.get("ID", "")).lower()
-            reason_label = str(reason.get("Callout Reason Drop-Down Label", "")).lower()
-            
-            # Check if search term appears in either ID or label
-            if search_term in reason_id or search_term in reason_label:
-                filtered_reasons.append(reason)
+    # Fall back to the closest reasons when nothing contains the search term
+    close_matches = bool(search_term) and not filtered_positions
+    if close_matches:
+        filtered_positions = search_index.rank(search_term)
     
     # Apply selected-only filter
     if show_selected_only:
-        filtered_reasons = [r for r in filtered_reasons if r.get("ID") in st.session_state.selected_callout_reasons]
+        selected_ids = set(st.session_state.selected_callout_reasons)
+        filtered_positions = [pos for pos in filtered_positions if search_index.ids[pos] in selected_ids]
     
     # 2. Results count and pagination in separate container
     pagination_container = st.container()
@@ -81,12 +75,14 @@ def render_callout_reasons_form():
         st.markdown('<p class="section-header">Select Callout Reasons to Use</p>', unsafe_allow_html=True)
         
         # Show count of filtered results
+        if close_matches and filtered_positions:
+            st.caption(f"No reasons contain \"{search_term}\". Showing the closest matches instead.")
         if search_term or show_selected_only:
-            st.write(f"Showing {len(filtered_reasons)} of {len(callout_reasons)} reasons")
+            st.write(f"Showing {len(filtered_positions)} of {len(search_index)} reasons")
         
         # Pagination controls in separate row
         items_per_page = 15
-        total_reasons = len(filtered_reasons)
+        total_reasons = len(filtered_positions)
         total_pages = max(1, (total_reasons + items_per_page - 1) // items_per_page)
         
         if 'current_page' not in st.session_state:
@@ -124,7 +120,7 @@ def render_callout_reasons_form():
         if total_reasons == 0:
             st.info("No callout reasons match your filter criteria.")
         else:
-            current_page_reasons = filtered_reasons[start_idx:end_idx]
+            current_page_reasons = [callout_reasons[pos] for pos in filtered_positions[start_idx:end_idx]]
             
             # Create separate container for each reason to avoid nesting issues
             for i, reason in enumerate(current_page_reasons):
@@ -161,9 +157,6 @@ def render_callout_reasons_form():
                         if st.button(f"Set as Default", key=f"default_{reason_id}", 
                                    disabled=not is_checked):
                             st.session_state.default_callout_reason = reason_id
-                            # Update the JSON data
-                            for r in callout_reasons:
-                                r["Default?"] = "x" if r["ID"] == reason_id else ""
                             st.rerun()
                     
                     # Add a separator
@@ -180,7 +173,7 @@ def render_callout_reasons_form():
         
         # Display selected reasons
         if selected_count > 0:
-            selected_reasons = [r for r in callout_reasons if str(r.get("ID", "")) in st.session_state.selected_callout_reasons]
+            selected_reasons = catalog.select(st.session_state.selected_callout_reasons)
             
             # Create a DataFrame for display
             selected_df = pd.DataFrame([{
@@ -194,14 +187,18 @@ def render_callout_reasons_form():
             # Export selected reasons button
             if st.button("Update Configuration"):
                 # Update the Use? and Default? flags in the callout_reasons.json file
-                for r in callout_reasons:
-                    r["Use?"] = "x" if r["ID"] in st.session_state.selected_callout_reasons else ""
-                    r["Default?"] = "x" if r["ID"] == st.session_state.default_callout_reason else ""
+                selected_ids = set(st.session_state.selected_callout_reasons)
+                updated_reasons = [
+                    dict(r, **{
+                        "Use?": "x" if r["ID"] in selected_ids else "",
+                        "Default?": "x" if r["ID"] == st.session_state.default_callout_reason else ""
+                    })
+                    for r in callout_reasons
+                ]
                 
                 # Try to save the updated json
                 try:
-                    with open('data/callout_reasons.json', 'w') as file:
-                        json.dump(callout_reasons, file, indent=2)
+                    save_callout_catalog(updated_reasons)
                     st.success("Callout Reasons configuration updated successfully!")
                 except Exception as e:
                     st.error(f"Error saving configuration: {str(e)}")
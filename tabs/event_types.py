@@ -3,7 +3,11 @@
 # ============================================================================
 import streamlit as st
 from datetime import datetime
-from utils.ai_assistant import get_openai_response, save_chat_history
+from config.constants import HELP_TOPICS
+from utils.assistant_requests import submit_assistant_request, render_assistant_request
+from utils.help_corpus import topic_help_prompt
+from utils.row_ids import ROW_ID_FIELD, new_row_id, remove_row
+from utils.batch_edit import render_batch_toggle, render_batch_form, edited_rows
 
 def render_event_types_form():
     """Render the Event Types form with improved alignment and shorter questions"""
@@ -70,7 +74,8 @@ def render_event_types_form():
                 "make_unavailable": False,
                 "place_status": False,
                 "min_duration": "",
-                "max_duration": ""
+                "max_duration": "",
+                "row_id": new_row_id()
             })
             st.rerun()
     
@@ -81,6 +86,8 @@ def render_event_types_form():
     with filter_cols[1]:
         show_active_only = st.checkbox("Show active only", value=False, key="show_active_events")
     
+    batch_edit = render_batch_toggle("event_types")
+    
     # Apply filter
     filtered_events = st.session_state.event_types
     if show_active_only:
@@ -138,144 +145,14 @@ def render_event_types_form():
             st.markdown(f"<div style='text-align: center; font-weight: bold; font-size: 11px;'>{header}</div>", unsafe_allow_html=True)
     
     # Create rows for each event
-    for i, event in enumerate(filtered_events):
-        # Create a row with the same column proportions
-        event_cols = st.columns(col_widths)
-        
-        with event_cols[0]:
-            event["description"] = st.text_input(
-                "Description", 
-                value=event.get("description", ""), 
-                key=f"event_desc_{i}",
-                label_visibility="collapsed"
-            )
-        
-        with event_cols[1]:
-            event["use"] = st.checkbox(
-                "Use", 
-                value=event.get("use", False), 
-                key=f"event_use_{i}",
-                label_visibility="collapsed"
-            )
-        
-        with event_cols[2]:
-            event["use_in_dropdown"] = st.checkbox(
-                "Dropdown", 
-                value=event.get("use_in_dropdown", False), 
-                key=f"event_dropdown_{i}",
-                label_visibility="collapsed"
-            )
-        
-        with event_cols[3]:
-            event["include_in_override"] = st.checkbox(
-                "Override", 
-                value=event.get("include_in_override", False), 
-                key=f"event_override_{i}",
-                label_visibility="collapsed"
-            )
-        
-        with event_cols[4]:
-            charged_options = ["", "Charged", "Excused"]
-            current_value = event.get("charged_or_excused", "")
-            current_index = 0
-            if current_value in charged_options:
-                current_index = charged_options.index(current_value)
-                
-            event["charged_or_excused"] = st.selectbox(
-                "If override", 
-                charged_options, 
-                index=current_index,
-                key=f"event_charge1_{i}",
-                label_visibility="collapsed"
-            )
-        
-        with event_cols[5]:
-            skipped_options = ["", "Charged", "Excused"]
-            current_value = event.get("employee_on_exception", "")
-            current_index = 0
-            if current_value in skipped_options:
-                current_index = skipped_options.index(current_value)
-                
-            event["employee_on_exception"] = st.selectbox(
-                "If skipped", 
-                skipped_options, 
-                index=current_index,
-                key=f"event_charge2_{i}",
-                label_visibility="collapsed"
-            )
-        
-        with event_cols[6]:
-            inbound_options = ["", "Yes", "No"]
-            current_value = event.get("available_on_inbound", "")
-            current_index = 0
-            if current_value in inbound_options:
-                current_index = inbound_options.index(current_value)
-                
-            event["available_on_inbound"] = st.selectbox(
-                "Inbound", 
-                inbound_options, 
-                index=current_index,
-                key=f"event_inbound_{i}",
-                label_visibility="collapsed"
-            )
-        
-        with event_cols[7]:
-            event["release_mobile"] = st.checkbox(
-                "Release", 
-                value=event.get("release_mobile", False), 
-                key=f"event_release_{i}",
-                label_visibility="collapsed"
-            )
-        
-        with event_cols[8]:
-            event["release_auto"] = st.checkbox(
-                "Auto Rest", 
-                value=event.get("release_auto", False), 
-                key=f"event_auto_{i}",
-                label_visibility="collapsed"
-            )
-        
-        with event_cols[9]:
-            event["make_unavailable"] = st.checkbox(
-                "Unavailable", 
-                value=event.get("make_unavailable", False), 
-                key=f"event_unavail_{i}",
-                label_visibility="collapsed"
-            )
-        
-        with event_cols[10]:
-            event["place_status"] = st.checkbox(
-                "Status", 
-                value=event.get("place_status", False), 
-                key=f"event_status_{i}",
-                label_visibility="collapsed"
-            )
-        
-        with event_cols[11]:
-            event["min_duration"] = st.text_input(
-                "Min", 
-                value=event.get("min_duration", ""), 
-                key=f"event_min_{i}",
-                label_visibility="collapsed"
-            )
-        
-        with event_cols[12]:
-            event["max_duration"] = st.text_input(
-                "Max", 
-                value=event.get("max_duration", ""), 
-                key=f"event_max_{i}",
-                label_visibility="collapsed"
-            )
-        
-        # Delete button in a separate row
-        delete_cols = st.columns([12, 1])
-        with delete_cols[1]:
-            if st.button("🗑️", key=f"del_event_{i}"):
-                st.session_state.event_types.pop(i)
-                st.rerun()
-        
-        # Add separator between rows
-        st.markdown("<hr style='margin: 2px 0; border: none; border-top: 1px solid #ddd;'>", unsafe_allow_html=True)
+    if batch_edit:
+        if render_batch_form("event_types_batch_form", st.session_state.event_types, filtered_events,
+                             lambda _, event: render_event_row(event, col_widths, batch=True),
+                             validate_event_batch):
+            st.rerun()
+    else:
+        for event in filtered_events:
+            render_event_row(event, col_widths)
     
     # Export buttons at the bottom
     export_cols = st.columns(2)
@@ -290,13 +167,189 @@ def render_event_types_form():
         st.markdown('<p class="section-header">Need Help?</p>', unsafe_allow_html=True)
         help_topic = st.selectbox(
             "Select topic for help",
-            ["Event Types", "Schedule Exceptions", "Override Configuration", "Mobile Configuration"]
+            HELP_TOPICS["Event Types"]
         )
         
         if st.button("Get Help", key="get_help"):
-            help_query = f"Explain in detail what I need to know about {help_topic} when configuring ARCOS. Include examples and best practices."
-            with st.spinner("Loading help..."):
-                help_response = get_openai_response(help_query)
-                save_chat_history(f"Help with {help_topic}", help_response)
+            help_query = topic_help_prompt("Event Types", help_topic)
+            submit_assistant_request("event_types_help", help_query, history_label=f"Help with {help_topic}")
+        
+        render_assistant_request("event_types_help")
+
+def _hours(value):
+    """Return a Min/Max Hours entry as a number, None when blank, or False if it isn't a number"""
+    text = str(value).strip()
+    if not text:
+        return None
+    try:
+        hours = float(text)
+    except ValueError:
+        return False
+    return hours if hours >= 0 else False
+
+def validate_event_batch(originals, staged, removed_ids):
+    """Return a message for each edited event type with no description or unusable Min/Max Hours"""
+    errors = []
+    for event in edited_rows(originals, staged, removed_ids):
+        label = f"Event type {event['id']}"
+        if not event["description"].strip():
+            errors.append(f"{label} needs a description")
+        min_hours, max_hours = _hours(event["min_duration"]), _hours(event["max_duration"])
+        if min_hours is False:
+            errors.append(f"{label}: Min Hours must be a number of hours")
+        if max_hours is False:
+            errors.append(f"{label}: Max Hours must be a number of hours")
+        if isinstance(min_hours, float) and isinstance(max_hours, float) and min_hours > max_hours:
+            errors.append(f"{label}: Min Hours is more than Max Hours")
+    return errors
+
+def render_event_row(event, col_widths, batch=False):
+    """Render the editor row for one event type.
+    
+    In batch mode the row is inside a form, so the delete button becomes a
+    checkbox whose value is returned.
+    """
+    # Widget keys follow the row, not its position in the (possibly filtered) list
+    row_id = event[ROW_ID_FIELD]
+    
+    # Create a row with the same column proportions
+    event_cols = st.columns(col_widths)
+    
+    with event_cols[0]:
+        event["description"] = st.text_input(
+            "Description", 
+            value=event.get("description", ""), 
+            key=f"event_desc_{row_id}",
+            label_visibility="collapsed"
+        )
+    
+    with event_cols[1]:
+        event["use"] = st.checkbox(
+            "Use", 
+            value=event.get("use", False), 
+            key=f"event_use_{row_id}",
+            label_visibility="collapsed"
+        )
+    
+    with event_cols[2]:
+        event["use_in_dropdown"] = st.checkbox(
+            "Dropdown", 
+            value=event.get("use_in_dropdown", False), 
+            key=f"event_dropdown_{row_id}",
+            label_visibility="collapsed"
+        )
+    
+    with event_cols[3]:
+        event["include_in_override"] = st.checkbox(
+            "Override", 
+            value=event.get("include_in_override", False), 
+            key=f"event_override_{row_id}",
+            label_visibility="collapsed"
+        )
+    
+    with event_cols[4]:
+        charged_options = ["", "Charged", "Excused"]
+        current_value = event.get("charged_or_excused", "")
+        current_index = 0
+        if current_value in charged_options:
+            current_index = charged_options.index(current_value)
+            
+        event["charged_or_excused"] = st.selectbox(
+            "If override", 
+            charged_options, 
+            index=current_index,
+            key=f"event_charge1_{row_id}",
+            label_visibility="collapsed"
+        )
+    
+    with event_cols[5]:
+        skipped_options = ["", "Charged", "Excused"]
+        current_value = event.get("employee_on_exception", "")
+        current_index = 0
+        if current_value in skipped_options:
+            current_index = skipped_options.index(current_value)
+            
+        event["employee_on_exception"] = st.selectbox(
+            "If skipped", 
+            skipped_options, 
+            index=current_index,
+            key=f"event_charge2_{row_id}",
+            label_visibility="collapsed"
+        )
+    
+    with event_cols[6]:
+        inbound_options = ["", "Yes", "No"]
+        current_value = event.get("available_on_inbound", "")
+        current_index = 0
+        if current_value in inbound_options:
+            current_index = inbound_options.index(current_value)
             
-            st.info(help_response)
\ No newline at end of file
+        event["available_on_inbound"] = st.selectbox(
+            "Inbound", 
+            inbound_options, 
+            index=current_index,
+            key=f"event_inbound_{row_id}",
+            label_visibility="collapsed"
+        )
+    
+    with event_cols[7]:
+        event["release_mobile"] = st.checkbox(
+            "Release", 
+            value=event.get("release_mobile", False), 
+            key=f"event_release_{row_id}",
+            label_visibility="collapsed"
+        )
+    
+    with event_cols[8]:
+        event["release_auto"] = st.checkbox(
+            "Auto Rest", 
+            value=event.get("release_auto", False), 
+            key=f"event_auto_{row_id}",
+            label_visibility="collapsed"
+        )
+    
+    with event_cols[9]:
+        event["make_unavailable"] = st.checkbox(
+            "Unavailable", 
+            value=event.get("make_unavailable", False), 
+            key=f"event_unavail_{row_id}",
+            label_visibility="collapsed"
+        )
+    
+    with event_cols[10]:
+        event["place_status"] = st.checkbox(
+            "Status", 
+            value=event.get("place_status", False), 
+            key=f"event_status_{row_id}",
+            label_visibility="collapsed"
+        )
+    
+    with event_cols[11]:
+        event["min_duration"] = st.text_input(
+            "Min", 
+            value=event.get("min_duration", ""), 
+            key=f"event_min_{row_id}",
+            label_visibility="collapsed"
+        )
+    
+    with event_cols[12]:
+        event["max_duration"] = st.text_input(
+            "Max", 
+            value=event.get("max_duration", ""), 
+            key=f"event_max_{row_id}",
+            label_visibility="collapsed"
+        )
+    
+    # Delete button in a separate row
+    removed = False
+    delete_cols = st.columns([12, 1])
+    with delete_cols[1]:
+        if batch:
+            removed = st.checkbox("🗑️", key=f"batch_del_event_{row_id}", help="Remove this event type on Apply")
+        elif st.button("🗑️", key=f"del_event_{row_id}"):
+            remove_row(st.session_state.event_types, row_id)
+            st.rerun()
+    
+    # Add separator between rows
+    st.markdown("<hr style='margin: 2px 0; border: none; border-top: 1px solid #ddd;'>", unsafe_allow_html=True)
+    return removed
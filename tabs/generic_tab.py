@@ -3,7 +3,8 @@
 # ============================================================================
 import streamlit as st
 import json
-from utils.ai_assistant import get_openai_response, save_chat_history
+from utils.assistant_requests import submit_assistant_request, render_assistant_request
+from utils.help_corpus import field_help_prompt
 
 def render_generic_tab(tab_name):
     """Render a generic form for tabs that are not yet implemented with custom UI"""
@@ -48,12 +49,10 @@ def render_generic_tab(tab_name):
                     
                     # Add a help button for this field
                     if st.button(f"Get more help with {field_name}", key=f"help_{field_key}"):
-                        help_query = f"Explain in detail what information is needed for the '{field_name}' section in the '{tab_name}' tab of the ARCOS System Implementation Guide. Include examples, best practices, and common configurations."
-                        with st.spinner("Loading help..."):
-                            help_response = get_openai_response(help_query)
-                            save_chat_history(f"Help with {field_name}", help_response)
-                        
-                        st.info(help_response)
+                        help_query = field_help_prompt(tab_name, field_name)
+                        submit_assistant_request(f"help_{field_key}", help_query, history_label=f"Help with {field_name}")
+                    
+                    render_assistant_request(f"help_{field_key}")
         else:
             st.write(f"This tab allows you to configure {tab_name} settings in ARCOS.")
             
@@ -4,7 +4,9 @@
 import streamlit as st
 import pandas as pd
 import io
-from utils.ai_assistant import get_openai_response, save_chat_history
+from config.constants import GLOBAL_CONFIG_SECTIONS
+from utils.assistant_requests import submit_assistant_request, render_assistant_request
+from utils.help_corpus import topic_help_prompt
 
 def render_global_config():
     """Render the Global Configuration Options form"""
@@ -15,11 +17,7 @@ def render_global_config():
         st.session_state.global_config_answers = {}
     
     # Tab configuration
-    tab_labels = [
-        "Roster Admin", "Calling Config", "VRU Config",
-        "One-Call Rules", "Availability", "Employee Page",
-        "Work & Rest Rules", "Charge & Credit", "Misc & New Year"
-    ]
+    tab_labels = GLOBAL_CONFIG_SECTIONS
     tabs = st.tabs(tab_labels)
     
     # Compute total and answered questions
@@ -34,11 +32,9 @@ def render_global_config():
         with tab:
             # AI Help toggle
             if st.button("🤖 Need Help?", key=f"help_{tab_labels[i]}"):
-                help_query = f"Provide detailed guidance on completing the {tab_labels[i]} section of the Global Configuration Options in ARCOS."
-                with st.spinner("Getting expert assistance..."):
-                    help_response = get_openai_response(help_query)
-                    save_chat_history(f"Help with {tab_labels[i]}", help_response)
-                st.info(help_response)
+                help_query = topic_help_prompt("Global Configuration Options", tab_labels[i])
+                submit_assistant_request(f"global_config_help_{tab_labels[i]}", help_query, history_label=f"Help with {tab_labels[i]}")
+            render_assistant_request(f"global_config_help_{tab_labels[i]}")
             
             # Render specific tab content
             render_tab_content(tab_labels[i])
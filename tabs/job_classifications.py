@@ -4,6 +4,10 @@
 import streamlit as st
 import pandas as pd
 from config.constants import DEFAULT_JOB_CLASSIFICATION
+from utils.frozen import thaw
+from utils.session import thaw_section
+from utils.row_ids import ROW_ID_FIELD, remove_row, with_row_id
+from utils.batch_edit import render_batch_toggle, render_batch_form, edited_rows, rows_after, shared_values
 
 def render_job_classifications():
     """Render the Job Classifications form with interactive elements"""
@@ -22,60 +26,26 @@ def render_job_classifications():
     
     # Initialize the job classifications if not already in session state
     if 'job_classifications' not in st.session_state:
-        st.session_state.job_classifications = [DEFAULT_JOB_CLASSIFICATION]
+        st.session_state.job_classifications = [with_row_id(thaw(DEFAULT_JOB_CLASSIFICATION))]
+    # This tab writes job classifications back every run, so stop sharing the defaults
+    thaw_section('job_classifications')
     
     # Add new job classification button
     if st.button("➕ Add Job Classification"):
-        st.session_state.job_classifications.append(DEFAULT_JOB_CLASSIFICATION.copy())
+        st.session_state.job_classifications.append(with_row_id(thaw(DEFAULT_JOB_CLASSIFICATION)))
         st.rerun()
     
+    batch_edit = render_batch_toggle("job_classifications")
+    
     # Display and edit job classifications - avoiding nested columns
-    for i, job in enumerate(st.session_state.job_classifications):
-        st.markdown(f"<hr style='margin: 10px 0;'>", unsafe_allow_html=True)
-        st.markdown(f"<p><b>Job Classification #{i+1}</b></p>", unsafe_allow_html=True)
-        
-        # Type and title in separate container
-        type_title_container = st.container()
-        with type_title_container:
-            type_title_cols = st.columns([2, 3])
-            with type_title_cols[0]:
-                job["type"] = st.selectbox(
-                    "Type", 
-                    ["", "Journeyman", "Apprentice"], 
-                    index=["", "Journeyman", "Apprentice"].index(job["type"]) if job["type"] in ["", "Journeyman", "Apprentice"] else 0,
-                    key=f"job_type_{i}"
-                )
-            with type_title_cols[1]:
-                job["title"] = st.text_input("Job Classification Title", value=job["title"], key=f"job_title_{i}")
-        
-        # IDs in separate container
-        st.markdown("<p><b>Job Classification IDs</b> (up to 5)</p>", unsafe_allow_html=True)
-        ids_container = st.container()
-        with ids_container:
-            id_cols = st.columns(5)
-            for j in range(5):
-                with id_cols[j]:
-                    # Ensure we have enough id slots
-                    while len(job["ids"]) <= j:
-                        job["ids"].append("")
-                    job["ids"][j] = st.text_input(f"ID {j+1}", value=job["ids"][j], key=f"job_id_{i}_{j}")
-        
-        # Recording in separate container
-        recording_container = st.container()
-        with recording_container:
-            job["recording"] = st.text_input(
-                "Recording Verbiage (what should be spoken during callout)", 
-                value=job["recording"], 
-                key=f"job_rec_{i}",
-                help="Leave blank if same as Job Title"
-            )
-        
-        # Delete button in separate container
-        delete_container = st.container()
-        with delete_container:
-            if st.button("🗑️ Remove", key=f"del_job_{i}"):
-                st.session_state.job_classifications.pop(i)
-                st.rerun()
+    jobs = st.session_state.job_classifications
+    if batch_edit:
+        if render_batch_form("job_classifications_batch_form", jobs, jobs,
+                             lambda i, job: render_job_row(i, job, batch=True), validate_job_batch):
+            st.rerun()
+    else:
+        for i, job in enumerate(jobs):
+            render_job_row(i, job)
     
     # Preview in separate container
     preview_container = st.container()
@@ -100,4 +70,74 @@ def render_job_classifications():
             else:
                 st.info("Add job classifications to see the preview.")
         else:
-            st.info("No job classifications added yet.")
\ No newline at end of file
+            st.info("No job classifications added yet.")
+
+def validate_job_batch(originals, staged, removed_ids):
+    """Return a message for each edited job classification with no title or an ID another one uses"""
+    errors = []
+    shared_ids = shared_values(rows_after(st.session_state.job_classifications, staged, removed_ids),
+                               lambda job: job["ids"])
+    for job in edited_rows(originals, staged, removed_ids):
+        label = f"'{job['title']}'" if job["title"] else "A job classification"
+        if not job["title"]:
+            errors.append(f"{label} needs a title")
+        errors.extend(f"{label} uses ID '{job_id}', which another job classification also uses"
+                      for job_id in dict.fromkeys(job["ids"]) if job_id in shared_ids)
+    return errors
+
+def render_job_row(i, job, batch=False):
+    """Render the editor for one job classification.
+    
+    In batch mode the row is inside a form, so the Remove button becomes a
+    checkbox whose value is returned.
+    """
+    # Widget keys follow the row, not its position
+    row_id = job[ROW_ID_FIELD]
+    st.markdown(f"<hr style='margin: 10px 0;'>", unsafe_allow_html=True)
+    st.markdown(f"<p><b>Job Classification #{i+1}</b></p>", unsafe_allow_html=True)
+    
+    # Type and title in separate container
+    type_title_container = st.container()
+    with type_title_container:
+        type_title_cols = st.columns([2, 3])
+        with type_title_cols[0]:
+            job["type"] = st.selectbox(
+                "Type", 
+                ["", "Journeyman", "Apprentice"], 
+                index=["", "Journeyman", "Apprentice"].index(job["type"]) if job["type"] in ["", "Journeyman", "Apprentice"] else 0,
+                key=f"job_type_{row_id}"
+            )
+        with type_title_cols[1]:
+            job["title"] = st.text_input("Job Classification Title", value=job["title"], key=f"job_title_{row_id}")
+    
+    # IDs in separate container
+    st.markdown("<p><b>Job Classification IDs</b> (up to 5)</p>", unsafe_allow_html=True)
+    ids_container = st.container()
+    with ids_container:
+        id_cols = st.columns(5)
+        for j in range(5):
+            with id_cols[j]:
+                # Ensure we have enough id slots
+                while len(job["ids"]) <= j:
+                    job["ids"].append("")
+                job["ids"][j] = st.text_input(f"ID {j+1}", value=job["ids"][j], key=f"job_id_{row_id}_{j}")
+    
+    # Recording in separate container
+    recording_container = st.container()
+    with recording_container:
+        job["recording"] = st.text_input(
+            "Recording Verbiage (what should be spoken during callout)", 
+            value=job["recording"], 
+            key=f"job_rec_{row_id}",
+            help="Leave blank if same as Job Title"
+        )
+    
+    # Delete button in separate container
+    delete_container = st.container()
+    with delete_container:
+        if batch:
+            return st.checkbox("🗑️ Remove on Apply", key=f"batch_del_job_{row_id}")
+        if st.button("🗑️ Remove", key=f"del_job_{row_id}"):
+            remove_row(st.session_state.job_classifications, row_id)
+            st.rerun()
+    return False
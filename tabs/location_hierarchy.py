@@ -2,12 +2,28 @@
 # LOCATION HIERARCHY TAB
 # ============================================================================
 import streamlit as st
-from utils.ui_helpers import render_color_key, create_horizontal_rule, show_info_box
+from utils.ui_helpers import render_color_key, create_horizontal_rule, show_info_box, render_pagination_controls
+from utils.session import thaw_section
+from utils.row_ids import ROW_ID_FIELD, new_row_id, remove_row
+from utils.batch_edit import render_batch_toggle, render_batch_form
+from utils.hierarchy_index import get_hierarchy_index, entry_path
+from utils.hierarchy_validation import batch_issues, get_hierarchy_validator
+
+# Page size options for the hierarchy editor
+HIERARCHY_PAGE_SIZES = [10, 25, 50, 100]
+
+# Column labels for the fields named in validation issues
+ISSUE_FIELD_LABELS = {"level1": "Level 1", "level2": "Level 2", "level3": "Level 3", "level4": "Level 4",
+                      "codes": "Codes"}
 
 def render_location_hierarchy_form():
     """Render the Location Hierarchy form with integrated callout types and reasons"""
     st.markdown('<p class="tab-header">Location Hierarchy - Complete Configuration</p>', unsafe_allow_html=True)
     
+    # The editor below writes every visible entry back each run, so stop sharing the defaults
+    thaw_section('hierarchy_data')
+    index = get_hierarchy_index()
+    
     # Display descriptive text
     with st.expander("Instructions", expanded=False):
         st.markdown("""
@@ -29,27 +45,15 @@ def render_location_hierarchy_form():
     
     # Add New Location button
     if st.button("➕ Add New Location Entry"):
-        st.session_state.hierarchy_data["entries"].append(
-            {
-                "level1": "", 
-                "level2": "", 
-                "level3": "", 
-                "level4": "", 
-                "timezone": "", 
-                "codes": ["", "", "", "", ""],
-                "callout_types": {
-                    "Normal": False,
-                    "All Hands on Deck": False,
-                    "Fill Shift": False,
-                    "Travel": False,
-                    "Notification": False,
-                    "Notification (No Response)": False
-                },
-                "callout_reasons": ""
-            }
-        )
+        append_hierarchy_entry(new_hierarchy_entry())
         st.rerun()
     
+    # Jump to a freshly added entry (must happen before the search widget is created)
+    if st.session_state.pop("hierarchy_show_last", False):
+        st.session_state.hierarchy_search = ""
+        st.session_state.hierarchy_last_search = ""
+        st.session_state.hierarchy_page = len(st.session_state.hierarchy_data["entries"])
+    
     # Default time zone info
     st.markdown('<p class="section-header">Default Time Zone</p>', unsafe_allow_html=True)
     st.write("Set a default time zone to be used when a specific zone is not specified for a location entry.")
@@ -60,6 +64,27 @@ def render_location_hierarchy_form():
     # Preview of hierarchy structure in table format
     st.markdown('<p class="section-header">Hierarchy Entries</p>', unsafe_allow_html=True)
     
+    # Search and page size - only the visible page of entries is rendered
+    search_cols = st.columns([3, 1])
+    with search_cols[0]:
+        search_term = st.text_input("Search by level name or code", key="hierarchy_search")
+    with search_cols[1]:
+        page_size = st.selectbox("Entries per page", HIERARCHY_PAGE_SIZES, index=1, key="hierarchy_page_size")
+    
+    # Go back to the first page whenever the search changes
+    if search_term != st.session_state.get("hierarchy_last_search", ""):
+        st.session_state.hierarchy_page = 0
+    st.session_state.hierarchy_last_search = search_term
+    
+    batch_edit = render_batch_toggle("hierarchy")
+    
+    entries = st.session_state.hierarchy_data["entries"]
+    matching_indices = find_hierarchy_entries(entries, search_term)
+    if search_term:
+        st.write(f"Showing {len(matching_indices)} of {len(entries)} entries")
+    
+    start_idx, end_idx = render_pagination_controls(len(matching_indices), page_size, "hierarchy_page")
+    
     # Display a table header without using columns
     labels = st.session_state.hierarchy_data["labels"]
     st.markdown(f"""
@@ -74,226 +99,24 @@ def render_location_hierarchy_form():
     </div>
     """, unsafe_allow_html=True)
     
-    # Instead of nesting columns, we'll create a separate row for each entry
-    for i, entry in enumerate(st.session_state.hierarchy_data["entries"]):
-        # Creating separate containers for each row to avoid nesting columns
-        entry_container = st.container()
-        
-        # Use a simple single-level column layout for each entry
-        with entry_container:
-            row_cols = st.columns([0.5, 2, 2, 2, 2, 2, 0.5])
-            
-            with row_cols[0]:
-                st.write(f"#{i+1}")
-            
-            with row_cols[1]:
-                entry["level1"] = st.text_input("Level 1", value=entry["level1"], key=f"lvl1_{i}", 
-                                              placeholder=f"Enter {labels[0]}", label_visibility="collapsed")
-            
-            with row_cols[2]:
-                entry["level2"] = st.text_input("Level 2", value=entry["level2"], key=f"lvl2_{i}", 
-                                              placeholder=f"Enter {labels[1]}", label_visibility="collapsed")
-            
-            with row_cols[3]:
-                entry["level3"] = st.text_input("Level 3", value=entry["level3"], key=f"lvl3_{i}", 
-                                              placeholder=f"Enter {labels[2]}", label_visibility="collapsed")
-            
-            with row_cols[4]:
-                entry["level4"] = st.text_input("Level 4", value=entry["level4"], key=f"lvl4_{i}", 
-                                              placeholder=f"Enter {labels[3]}", label_visibility="collapsed")
-            
-            with row_cols[5]:
-                entry["timezone"] = st.text_input("Time Zone", value=entry.get("timezone", ""), key=f"tz_{i}",
-                                               placeholder=st.session_state.hierarchy_data["timezone"], 
-                                               label_visibility="collapsed")
-            
-            with row_cols[6]:
-                # Delete button
-                if st.button("🗑️", key=f"del_{i}", help="Remove this entry"):
-                    st.session_state.hierarchy_data["entries"].pop(i)
-                    st.rerun()
-        
-        # Sub-branch buttons in a separate container
-        if entry["level1"]:
-            branch_container = st.container()
-            with branch_container:
-                sb_cols = st.columns([4, 2, 2, 2, 2])
-                
-                # Add Business Unit button (only if level1 is filled)
-                with sb_cols[1]:
-                    if st.button(f"+ Add Business Unit", key=f"add_bu_{i}", 
-                               help=f"Add a new Business Unit under {entry['level1']}"):
-                        new_entry = {
-                            "level1": entry["level1"],
-                            "level2": "",
-                            "level3": "",
-                            "level4": "",
-                            "timezone": entry.get("timezone", ""),
-                            "codes": ["", "", "", "", ""],
-                            "callout_types": {
-                                "Normal": False,
-                                "All Hands on Deck": False,
-                                "Fill Shift": False,
-                                "Travel": False,
-                                "Notification": False,
-                                "Notification (No Response)": False
-                            },
-                            "callout_reasons": ""
-                        }
-                        st.session_state.hierarchy_data["entries"].append(new_entry)
-                        st.rerun()
-                
-                # Add Division button (only if level1 and level2 are filled)
-                with sb_cols[2]:
-                    if entry["level2"]:
-                        if st.button(f"+ Add Division", key=f"add_div_{i}", 
-                                   help=f"Add a new Division under {entry['level2']}"):
-                            new_entry = {
-                                "level1": entry["level1"],
-                                "level2": entry["level2"],
-                                "level3": "",
-                                "level4": "",
-                                "timezone": entry.get("timezone", ""),
-                                "codes": ["", "", "", "", ""],
-                                "callout_types": {
-                                    "Normal": False,
-                                    "All Hands on Deck": False,
-                                    "Fill Shift": False,
-                                    "Travel": False,
-                                    "Notification": False,
-                                    "Notification (No Response)": False
-                                },
-                                "callout_reasons": ""
-                            }
-                            st.session_state.hierarchy_data["entries"].append(new_entry)
-                            st.rerun()
-                
-                # Add OpCenter button (only if level1, level2, and level3 are filled)
-                with sb_cols[3]:
-                    if entry["level2"] and entry["level3"]:
-                        if st.button(f"+ Add OpCenter", key=f"add_op_{i}", 
-                                   help=f"Add a new OpCenter under {entry['level3']}"):
-                            new_entry = {
-                                "level1": entry["level1"],
-                                "level2": entry["level2"],
-                                "level3": entry["level3"],
-                                "level4": "",
-                                "timezone": entry.get("timezone", ""),
-                                "codes": ["", "", "", "", ""],
-                                "callout_types": {
-                                    "Normal": False,
-                                    "All Hands on Deck": False,
-                                    "Fill Shift": False,
-                                    "Travel": False,
-                                    "Notification": False,
-                                    "Notification (No Response)": False
-                                },
-                                "callout_reasons": ""
-                            }
-                            st.session_state.hierarchy_data["entries"].append(new_entry)
-                            st.rerun()
-        
-        # LEVEL 4 CONFIGURATION in a separate container
-        if entry["level4"]:
-            with st.expander(f"Configure {entry['level4']} Details", expanded=False):
-                # 1. LOCATION CODES SECTION
-                st.markdown(f"<div style='margin: 10px 0;'><b>Location Codes for {entry['level4']}</b></div>", unsafe_allow_html=True)
-                
-                # Split code fields into separate containers to avoid nesting
-                for j in range(0, 5, 5):  # Step by 5 to create separate rows
-                    code_container = st.container()
-                    with code_container:
-                        code_cols = st.columns(5)
-                        for k in range(5):
-                            idx = j + k
-                            if idx < 5:  # Ensure we don't go out of bounds
-                                with code_cols[k]:
-                                    if idx < len(entry["codes"]):
-                                        entry["codes"][idx] = st.text_input(f"Code {idx+1}", 
-                                                                        value=entry["codes"][idx], 
-                                                                        key=f"code_{i}_{idx}")
-                                    else:
-                                        # Ensure we have 5 codes
-                                        while len(entry["codes"]) <= idx:
-                                            entry["codes"].append("")
-                                        entry["codes"][idx] = st.text_input(f"Code {idx+1}", 
-                                                                        value="", 
-                                                                        key=f"code_{i}_{idx}")
-                
-                st.markdown("<hr style='margin: 15px 0;'>", unsafe_allow_html=True)
-                
-                # 2. CALLOUT TYPES SECTION
-                st.markdown(f"<div style='margin: 10px 0;'><b>Callout Types for {entry['level4']}</b></div>", unsafe_allow_html=True)
-                st.write("Select the callout types available for this location:")
-                
-                # Split checkboxes into separate groups to avoid nesting
-                ct_container1 = st.container()
-                with ct_container1:
-                    ct_cols1 = st.columns(3)
-                    with ct_cols1[0]:
-                        entry["callout_types"]["Normal"] = st.checkbox(
-                            "Normal", 
-                            value=entry["callout_types"].get("Normal", False),
-                            key=f"ct_normal_{i}"
-                        )
-                    
-                    with ct_cols1[1]:
-                        entry["callout_types"]["All Hands on Deck"] = st.checkbox(
-                            "All Hands on Deck", 
-                            value=entry["callout_types"].get("All Hands on Deck", False),
-                            key=f"ct_ahod_{i}"
-                        )
-                    
-                    with ct_cols1[2]:
-                        entry["callout_types"]["Fill Shift"] = st.checkbox(
-                            "Fill Shift", 
-                            value=entry["callout_types"].get("Fill Shift", False),
-                            key=f"ct_fill_{i}"
-                        )
-                
-                ct_container2 = st.container()
-                with ct_container2:
-                    ct_cols2 = st.columns(3)
-                    with ct_cols2[0]:
-                        entry["callout_types"]["Travel"] = st.checkbox(
-                            "Travel", 
-                            value=entry["callout_types"].get("Travel", False),
-                            key=f"ct_travel_{i}"
-                        )
-                    
-                    with ct_cols2[1]:
-                        entry["callout_types"]["Notification"] = st.checkbox(
-                            "Notification", 
-                            value=entry["callout_types"].get("Notification", False),
-                            key=f"ct_notif_{i}"
-                        )
-                    
-                    with ct_cols2[2]:
-                        entry["callout_types"]["Notification (No Response)"] = st.checkbox(
-                            "Notification (No Response)", 
-                            value=entry["callout_types"].get("Notification (No Response)", False),
-                            key=f"ct_notif_nr_{i}"
-                        )
-                
-                st.markdown("<hr style='margin: 15px 0;'>", unsafe_allow_html=True)
-                
-                # 3. CALLOUT REASONS SECTION
-                st.markdown(f"<div style='margin: 10px 0;'><b>Callout Reasons for {entry['level4']}</b></div>", unsafe_allow_html=True)
-                st.write("Enter applicable callout reasons for this location (comma-separated):")
-                
-                entry["callout_reasons"] = st.text_area(
-                    "Callout Reasons",
-                    value=entry.get("callout_reasons", ""),
-                    height=100,
-                    key=f"reasons_{i}",
-                    placeholder="Gas Leak, Gas Fire, Gas Emergency, Car Hit Pole, Wires Down"
-                )
-            
-            st.markdown("<hr style='margin: 10px 0;'>", unsafe_allow_html=True)
-        else:
-            if entry["level1"] or entry["level2"] or entry["level3"]:
-                st.info(f"Enter {labels[3]} to complete this entry and add location codes, callout types, and reasons.")
-            st.markdown("<hr style='margin: 10px 0;'>", unsafe_allow_html=True)
+    # Instead of nesting columns, we'll create a separate row for each visible entry.
+    # Entries on other pages keep their values in session state untouched.
+    page_indices = matching_indices[start_idx:end_idx]
+    if batch_edit:
+        # The whole page is committed by one Apply instead of one rerun per field
+        applied = render_batch_form("hierarchy_batch_form", entries, [entries[i] for i in page_indices],
+                                    lambda pos, entry: render_hierarchy_entry(page_indices[pos], entry, labels, batch=True),
+                                    lambda originals, staged, removed_ids: validate_hierarchy_batch(index, originals, staged, removed_ids))
+        if applied:
+            changed, removed = applied
+            for entry in changed:
+                index.update(entry)
+            for row_id in removed:
+                index.remove(row_id)
+            st.rerun()
+    else:
+        for i in page_indices:
+            render_hierarchy_entry(i, entries[i], labels)
     
     # Show preview in a separate container to avoid nesting
     preview_container = st.container()
@@ -301,9 +124,11 @@ def render_location_hierarchy_form():
         st.markdown('<p class="section-header">Hierarchy Preview</p>', unsafe_allow_html=True)
         
         # Generate a text representation of the hierarchy
-        preview_text = generate_hierarchy_preview(st.session_state.hierarchy_data)
+        preview_text = generate_hierarchy_preview(index)
         st.code(preview_text)
         
+        render_validation_issues(index)
+        
         # Display sample hierarchy from example
         st.markdown('<p class="section-header">Sample Hierarchy</p>', unsafe_allow_html=True)
         st.info("""
@@ -320,68 +145,292 @@ def render_location_hierarchy_form():
                 [Callout Reasons: Car Hit Pole, Wires Down]
         """)
 
-def generate_hierarchy_preview(hierarchy_data):
-    """Create a tree structure to organize the hierarchy and return a text representation"""
-    # Create a tree structure to organize the hierarchy
-    tree = {}
+def new_hierarchy_entry(level1="", level2="", level3="", timezone=""):
+    """Create a blank hierarchy entry, optionally inheriting parent levels"""
+    return {
+        "level1": level1,
+        "level2": level2,
+        "level3": level3,
+        "level4": "",
+        "timezone": timezone,
+        "codes": ["", "", "", "", ""],
+        "callout_types": {
+            "Normal": False,
+            "All Hands on Deck": False,
+            "Fill Shift": False,
+            "Travel": False,
+            "Notification": False,
+            "Notification (No Response)": False
+        },
+        "callout_reasons": "",
+        "row_id": new_row_id()
+    }
+
+def append_hierarchy_entry(entry):
+    """Append an entry and show the page containing it on the next run"""
+    st.session_state.hierarchy_data["entries"].append(entry)
+    get_hierarchy_index().add(entry)
+    st.session_state.hierarchy_show_last = True
+
+def find_hierarchy_entries(entries, search_term):
+    """Return the indices of entries whose level names or codes contain the search term"""
+    term = search_term.lower().strip() if search_term else ""
+    if not term:
+        return list(range(len(entries)))
     
-    # Populate the tree
-    for entry in hierarchy_data["entries"]:
-        if not entry["level1"]:
-            continue
-            
-        l1 = entry["level1"]
-        if l1 not in tree:
-            tree[l1] = {}
-        
-        if entry["level2"]:
-            l2 = entry["level2"]
-            if l2 not in tree[l1]:
-                tree[l1][l2] = {}
-            
-            if entry["level3"]:
-                l3 = entry["level3"]
-                if l3 not in tree[l1][l2]:
-                    tree[l1][l2][l3] = []
-                
-                if entry["level4"]:
-                    l4_info = {
-                        "name": entry["level4"],
-                        "codes": [c for c in entry["codes"] if c],
-                        "timezone": entry["timezone"],
-                        "callout_types": [ct for ct, enabled in entry["callout_types"].items() if enabled],
-                        "callout_reasons": entry["callout_reasons"]
-                    }
-                    tree[l1][l2][l3].append(l4_info)
+    matches = []
+    for i, entry in enumerate(entries):
+        values = [entry.get("level1", ""), entry.get("level2", ""), entry.get("level3", ""), entry.get("level4", "")]
+        values.extend(entry.get("codes", []))
+        if any(term in str(v).lower() for v in values if v):
+            matches.append(i)
+    return matches
+
+def validate_hierarchy_batch(index, originals, staged, removed_ids):
+    """Return a message for each edited level name or code in a batch that breaks the location rules"""
+    return [issue.message for issue in batch_issues(index, originals, staged, removed_ids)]
+
+def render_validation_issues(index):
+    """Show every location rule the hierarchy currently breaks, one row per issue"""
+    issues = get_hierarchy_validator().refresh(index)
+    if not issues:
+        return
     
-    # Generate the text representation
+    st.warning(f"{len(issues)} location rule issue(s) found in the hierarchy.")
+    with st.expander("Show issues", expanded=False):
+        st.dataframe([
+            {
+                "Location": " > ".join(entry_path(index.rows[issue.row_id])) if issue.row_id in index.rows else "",
+                "Field": ISSUE_FIELD_LABELS.get(issue.field, issue.field),
+                "Problem": issue.message
+            }
+            for issue in issues
+        ], use_container_width=True, hide_index=True)
+
+def render_hierarchy_entry(i, entry, labels, batch=False):
+    """Render the editor row, sub-branch buttons and Level 4 details for one entry.
+    
+    In batch mode the row is inside a form: buttons are left out and the delete
+    button becomes a Remove checkbox, whose value is returned.
+    """
+    # Widget keys follow the entry, not its position, so deleting a row leaves the others alone
+    row_id = entry[ROW_ID_FIELD]
+    index = get_hierarchy_index()
+    # Creating separate containers for each row to avoid nesting columns
+    entry_container = st.container()
+
+    # Use a simple single-level column layout for each entry
+    with entry_container:
+        row_cols = st.columns([0.5, 2, 2, 2, 2, 2, 0.5])
+
+        with row_cols[0]:
+            st.write(f"#{i+1}")
+
+        with row_cols[1]:
+            entry["level1"] = st.text_input("Level 1", value=entry["level1"], key=f"lvl1_{row_id}", 
+                                          placeholder=f"Enter {labels[0]}", label_visibility="collapsed")
+
+        with row_cols[2]:
+            entry["level2"] = st.text_input("Level 2", value=entry["level2"], key=f"lvl2_{row_id}", 
+                                          placeholder=f"Enter {labels[1]}", label_visibility="collapsed")
+
+        with row_cols[3]:
+            entry["level3"] = st.text_input("Level 3", value=entry["level3"], key=f"lvl3_{row_id}", 
+                                          placeholder=f"Enter {labels[2]}", label_visibility="collapsed")
+
+        with row_cols[4]:
+            entry["level4"] = st.text_input("Level 4", value=entry["level4"], key=f"lvl4_{row_id}", 
+                                          placeholder=f"Enter {labels[3]}", label_visibility="collapsed")
+
+        with row_cols[5]:
+            entry["timezone"] = st.text_input("Time Zone", value=entry.get("timezone", ""), key=f"tz_{row_id}",
+                                           placeholder=st.session_state.hierarchy_data["timezone"], 
+                                           label_visibility="collapsed")
+
+        with row_cols[6]:
+            if batch:
+                removed = st.checkbox("🗑️", key=f"batch_del_{row_id}", help="Remove this entry on Apply")
+            else:
+                # Delete button
+                removed = False
+                if st.button("🗑️", key=f"del_{row_id}", help="Remove this entry"):
+                    remove_row(st.session_state.hierarchy_data["entries"], row_id)
+                    index.remove(row_id)
+                    st.rerun()
+
+    # Sub-branch buttons in a separate container (forms can't hold buttons)
+    if entry["level1"] and not batch:
+        branch_container = st.container()
+        with branch_container:
+            sb_cols = st.columns([4, 2, 2, 2, 2])
+
+            # Add Business Unit button (only if level1 is filled)
+            with sb_cols[1]:
+                if st.button(f"+ Add Business Unit", key=f"add_bu_{row_id}", 
+                           help=f"Add a new Business Unit under {entry['level1']} "
+                                f"({index.child_count((entry['level1'],))} so far)"):
+                    append_hierarchy_entry(new_hierarchy_entry(level1=entry["level1"], timezone=entry.get("timezone", "")))
+                    st.rerun()
+
+            # Add Division button (only if level1 and level2 are filled)
+            with sb_cols[2]:
+                if entry["level2"]:
+                    if st.button(f"+ Add Division", key=f"add_div_{row_id}", 
+                               help=f"Add a new Division under {entry['level2']} "
+                                    f"({index.child_count((entry['level1'], entry['level2']))} so far)"):
+                        append_hierarchy_entry(new_hierarchy_entry(level1=entry["level1"], level2=entry["level2"], timezone=entry.get("timezone", "")))
+                        st.rerun()
+
+            # Add OpCenter button (only if level1, level2, and level3 are filled)
+            with sb_cols[3]:
+                if entry["level2"] and entry["level3"]:
+                    if st.button(f"+ Add OpCenter", key=f"add_op_{row_id}", 
+                               help=f"Add a new OpCenter under {entry['level3']} "
+                                    f"({index.child_count((entry['level1'], entry['level2'], entry['level3']))} so far)"):
+                        append_hierarchy_entry(new_hierarchy_entry(level1=entry["level1"], level2=entry["level2"], level3=entry["level3"], timezone=entry.get("timezone", "")))
+                        st.rerun()
+
+    # LEVEL 4 CONFIGURATION in a separate container
+    if entry["level4"]:
+        with st.expander(f"Configure {entry['level4']} Details", expanded=False):
+            # 1. LOCATION CODES SECTION
+            st.markdown(f"<div style='margin: 10px 0;'><b>Location Codes for {entry['level4']}</b></div>", unsafe_allow_html=True)
+
+            # Split code fields into separate containers to avoid nesting
+            for j in range(0, 5, 5):  # Step by 5 to create separate rows
+                code_container = st.container()
+                with code_container:
+                    code_cols = st.columns(5)
+                    for k in range(5):
+                        idx = j + k
+                        if idx < 5:  # Ensure we don't go out of bounds
+                            with code_cols[k]:
+                                if idx < len(entry["codes"]):
+                                    entry["codes"][idx] = st.text_input(f"Code {idx+1}", 
+                                                                    value=entry["codes"][idx], 
+                                                                    key=f"code_{row_id}_{idx}")
+                                else:
+                                    # Ensure we have 5 codes
+                                    while len(entry["codes"]) <= idx:
+                                        entry["codes"].append("")
+                                    entry["codes"][idx] = st.text_input(f"Code {idx+1}", 
+                                                                    value="", 
+                                                                    key=f"code_{row_id}_{idx}")
+
+            st.markdown("<hr style='margin: 15px 0;'>", unsafe_allow_html=True)
+
+            # 2. CALLOUT TYPES SECTION
+            st.markdown(f"<div style='margin: 10px 0;'><b>Callout Types for {entry['level4']}</b></div>", unsafe_allow_html=True)
+            st.write("Select the callout types available for this location:")
+
+            # Split checkboxes into separate groups to avoid nesting
+            ct_container1 = st.container()
+            with ct_container1:
+                ct_cols1 = st.columns(3)
+                with ct_cols1[0]:
+                    entry["callout_types"]["Normal"] = st.checkbox(
+                        "Normal", 
+                        value=entry["callout_types"].get("Normal", False),
+                        key=f"ct_normal_{row_id}"
+                    )
+
+                with ct_cols1[1]:
+                    entry["callout_types"]["All Hands on Deck"] = st.checkbox(
+                        "All Hands on Deck", 
+                        value=entry["callout_types"].get("All Hands on Deck", False),
+                        key=f"ct_ahod_{row_id}"
+                    )
+
+                with ct_cols1[2]:
+                    entry["callout_types"]["Fill Shift"] = st.checkbox(
+                        "Fill Shift", 
+                        value=entry["callout_types"].get("Fill Shift", False),
+                        key=f"ct_fill_{row_id}"
+                    )
+
+            ct_container2 = st.container()
+            with ct_container2:
+                ct_cols2 = st.columns(3)
+                with ct_cols2[0]:
+                    entry["callout_types"]["Travel"] = st.checkbox(
+                        "Travel", 
+                        value=entry["callout_types"].get("Travel", False),
+                        key=f"ct_travel_{row_id}"
+                    )
+
+                with ct_cols2[1]:
+                    entry["callout_types"]["Notification"] = st.checkbox(
+                        "Notification", 
+                        value=entry["callout_types"].get("Notification", False),
+                        key=f"ct_notif_{row_id}"
+                    )
+
+                with ct_cols2[2]:
+                    entry["callout_types"]["Notification (No Response)"] = st.checkbox(
+                        "Notification (No Response)", 
+                        value=entry["callout_types"].get("Notification (No Response)", False),
+                        key=f"ct_notif_nr_{row_id}"
+                    )
+
+            st.markdown("<hr style='margin: 15px 0;'>", unsafe_allow_html=True)
+
+            # 3. CALLOUT REASONS SECTION
+            st.markdown(f"<div style='margin: 10px 0;'><b>Callout Reasons for {entry['level4']}</b></div>", unsafe_allow_html=True)
+            st.write("Enter applicable callout reasons for this location (comma-separated):")
+
+            entry["callout_reasons"] = st.text_area(
+                "Callout Reasons",
+                value=entry.get("callout_reasons", ""),
+                height=100,
+                key=f"reasons_{row_id}",
+                placeholder="Gas Leak, Gas Fire, Gas Emergency, Car Hit Pole, Wires Down"
+            )
+
+        st.markdown("<hr style='margin: 10px 0;'>", unsafe_allow_html=True)
+    else:
+        if entry["level1"] or entry["level2"] or entry["level3"]:
+            st.info(f"Enter {labels[3]} to complete this entry and add location codes, callout types, and reasons.")
+        st.markdown("<hr style='margin: 10px 0;'>", unsafe_allow_html=True)
+    
+    # Keep the index in step with this row's edits (batch rows are indexed on Apply)
+    if not batch:
+        index.update(entry)
+    return removed
+
+def generate_hierarchy_preview(index):
+    """Return a text representation of the hierarchy tree held by index"""
     lines = []
     
-    for l1, l1_children in tree.items():
-        lines.append(f"• {l1}")
+    for l1 in index.root.children.values():
+        lines.append(f"• {l1.name}")
         
-        for l2, l2_children in l1_children.items():
-            lines.append(f"  • {l2}")
+        for l2 in l1.children.values():
+            lines.append(f"  • {l2.name}")
             
-            for l3, l3_children in l2_children.items():
-                lines.append(f"    • {l3}")
+            for l3 in l2.children.values():
+                lines.append(f"    • {l3.name}")
                 
-                for l4_info in l3_children:
-                    lines.append(f"      • {l4_info['name']}")
-                    
-                    if l4_info["codes"]:
-                        lines.append(f"        (Codes: {', '.join(l4_info['codes'])})")
-                    
-                    if l4_info["timezone"]:
-                        lines.append(f"        [Time Zone: {l4_info['timezone']}]")
-                    
-                    if l4_info["callout_types"]:
-                        lines.append(f"        [Callout Types: {', '.join(l4_info['callout_types'])}]")
-                    
-                    if l4_info["callout_reasons"]:
-                        lines.append(f"        [Callout Reasons: {l4_info['callout_reasons']}]")
+                for l4 in l3.children.values():
+                    # Every entry ending at this Level 4 location is listed with its own details
+                    for row_id in l4.row_ids:
+                        entry = index.rows[row_id]
+                        lines.append(f"      • {l4.name}")
+                        
+                        codes = [c for c in entry["codes"] if c]
+                        if codes:
+                            lines.append(f"        (Codes: {', '.join(codes)})")
+                        
+                        if entry["timezone"]:
+                            lines.append(f"        [Time Zone: {entry['timezone']}]")
+                        
+                        callout_types = [ct for ct, enabled in entry["callout_types"].items() if enabled]
+                        if callout_types:
+                            lines.append(f"        [Callout Types: {', '.join(callout_types)}]")
+                        
+                        if entry["callout_reasons"]:
+                            lines.append(f"        [Callout Reasons: {entry['callout_reasons']}]")
     
     if not lines:
         return "No entries yet. Use the form on the left to add location hierarchy entries."
     
-    return "\n".join(lines)
\ No newline at end of file
+    return "\n".join(lines)
@@ -3,7 +3,14 @@
 # ============================================================================
 import streamlit as st
 import pandas as pd
-from utils.ai_assistant import get_openai_response, save_chat_history
+from config.constants import HELP_TOPICS
+from utils.assistant_requests import submit_assistant_request, render_assistant_request
+from utils.help_corpus import topic_help_prompt
+from utils.matrix_store import get_callout_matrix
+from utils.session import thaw_section
+
+# Above this many locations the grid editor is the default editing mode
+MATRIX_CHECKBOX_LIMIT = 25
 
 def render_matrix_locations_callout_types():
     """Render the Matrix of Locations and Callout Types with interactive elements"""
@@ -48,7 +55,7 @@ def render_matrix_locations_callout_types():
                         callout_type = callout_types[idx]
                         st.write(f"🔹 {callout_type}")
                         if st.button("Remove", key=f"rm_co_{idx}", help=f"Remove {callout_type}"):
-                            st.session_state.callout_types.pop(idx)
+                            thaw_section('callout_types').pop(idx)
                             st.rerun()
         
         # Add new callout type - in a separate row
@@ -59,7 +66,7 @@ def render_matrix_locations_callout_types():
         with add_cols[1]:
             if st.button("Add"):
                 if new_callout and new_callout not in st.session_state.callout_types:
-                    st.session_state.callout_types.append(new_callout)
+                    thaw_section('callout_types').append(new_callout)
                     st.rerun()
         
         # Matrix configuration
@@ -69,43 +76,21 @@ def render_matrix_locations_callout_types():
         matrix_data = create_matrix_data()
         
         if matrix_data:
-            # Display each location in its own section
-            for i, row in enumerate(matrix_data):
-                location = row["Location"]
-                st.write(f"**{row['Display']}**")
-                
-                # Calculate number of columns and rows needed for checkboxes
-                num_callout_types = len(st.session_state.callout_types)
-                max_cols_per_row = 4  # Maximum 4 checkboxes per row
-                num_checkbox_rows = (num_callout_types + max_cols_per_row - 1) // max_cols_per_row
-                
-                # Create rows of checkboxes
-                for row_idx in range(num_checkbox_rows):
-                    # Create columns for this row
-                    check_cols = st.columns(max_cols_per_row)
-                    
-                    # Fill columns with checkboxes
-                    for col_idx in range(max_cols_per_row):
-                        ct_idx = row_idx * max_cols_per_row + col_idx
-                        
-                        # Check if we still have callout types
-                        if ct_idx < num_callout_types:
-                            with check_cols[col_idx]:
-                                ct = st.session_state.callout_types[ct_idx]
-                                # Create a unique key for each checkbox that includes the location index and callout type index
-                                checkbox_key = f"matrix_{i}_{location}_{ct_idx}_{ct}".replace(" ", "_")
-                                
-                                # Store the actual response key (which we'll still use for data storage)
-                                response_key = f"matrix_{location}_{ct}".replace(" ", "_")
-                                
-                                # Use the checkbox with unique key, but store in the original response key
-                                st.session_state.responses[response_key] = st.checkbox(
-                                    ct, 
-                                    value=row.get(ct, False), 
-                                    key=checkbox_key  # Using the unique key here
-                                )
-                
-                st.markdown("<hr style='margin: 10px 0;'>", unsafe_allow_html=True)
+            # Large matrices default to the grid editor (one widget instead of one per cell)
+            edit_modes = ["Grid editor", "Checkboxes"]
+            edit_mode = st.radio(
+                "Editing mode",
+                edit_modes,
+                index=0 if len(matrix_data) > MATRIX_CHECKBOX_LIMIT else 1,
+                horizontal=True,
+                key="matrix_edit_mode"
+            )
+            
+            if edit_mode == "Grid editor":
+                render_matrix_grid_editor(matrix_data)
+                render_matrix_bulk_operations(matrix_data)
+            else:
+                render_matrix_checkboxes(matrix_data)
         else:
             st.warning("Add Level 4 locations in the Location Hierarchy tab first to configure this matrix.")
     
@@ -127,20 +112,131 @@ def render_matrix_locations_callout_types():
         st.markdown('<p class="section-header">Need Help?</p>', unsafe_allow_html=True)
         help_topic = st.selectbox(
             "Select topic for help",
-            ["Callout Types", "Matrix Configuration", "Best Practices for Callout Types"]
+            HELP_TOPICS["Matrix of Locations and Callout Types"]
         )
         
         if st.button("Get Help"):
-            help_query = f"Explain in detail what I need to know about {help_topic} when configuring the Matrix of Locations and Callout Types in ARCOS. Include examples and best practices."
-            with st.spinner("Loading help..."):
-                help_response = get_openai_response(help_query)
-                save_chat_history(f"Help with {help_topic}", help_response)
+            help_query = topic_help_prompt("Matrix of Locations and Callout Types", help_topic)
+            submit_assistant_request("matrix_help", help_query, history_label=f"Help with {help_topic}")
+        
+        render_assistant_request("matrix_help")
+                
+def render_matrix_checkboxes(matrix_data):
+    """Render one checkbox per location and callout type"""
+    matrix = get_callout_matrix()
+    
+    # Display each location in its own section
+    for i, row in enumerate(matrix_data):
+        location = row["Location"]
+        st.write(f"**{row['Display']}**")
+        
+        # Calculate number of columns and rows needed for checkboxes
+        num_callout_types = len(st.session_state.callout_types)
+        max_cols_per_row = 4  # Maximum 4 checkboxes per row
+        num_checkbox_rows = (num_callout_types + max_cols_per_row - 1) // max_cols_per_row
+        
+        # Create rows of checkboxes
+        for row_idx in range(num_checkbox_rows):
+            # Create columns for this row
+            check_cols = st.columns(max_cols_per_row)
             
-            st.info(help_response)
+            # Fill columns with checkboxes
+            for col_idx in range(max_cols_per_row):
+                ct_idx = row_idx * max_cols_per_row + col_idx
                 
+                # Check if we still have callout types
+                if ct_idx < num_callout_types:
+                    with check_cols[col_idx]:
+                        ct = st.session_state.callout_types[ct_idx]
+                        # Create a unique key for each checkbox that includes the location index and callout type index
+                        checkbox_key = f"matrix_{i}_{location}_{ct_idx}_{ct}".replace(" ", "_")
+                        
+                        # Use the checkbox with unique key, but store in the original response key
+                        row[ct] = st.checkbox(
+                            ct, 
+                            value=row.get(ct, False), 
+                            key=checkbox_key  # Using the unique key here
+                        )
+                        matrix.set(location, ct, row[ct])
+        
+        st.markdown("<hr style='margin: 10px 0;'>", unsafe_allow_html=True)
+
+def render_matrix_grid_editor(matrix_data):
+    """Render the whole matrix as a single editable grid and write back changed cells only"""
+    matrix = get_callout_matrix()
+    callout_types = list(st.session_state.callout_types)
+    grid_df = pd.DataFrame(
+        [[row["Display"]] + [bool(row[ct]) for ct in callout_types] for row in matrix_data],
+        columns=["Location"] + callout_types
+    )
+    
+    # Grid edits are stored relative to the rows passed in, so start a fresh editor
+    # whenever the locations or callout types change or a bulk operation is applied
+    layout = tuple(row["Location"] for row in matrix_data) + tuple(callout_types)
+    editor_key = f"matrix_editor_{st.session_state.get('matrix_editor_version', 0)}_{hash(layout)}"
+    
+    edited_df = st.data_editor(
+        grid_df,
+        key=editor_key,
+        disabled=["Location"],
+        hide_index=True,
+        use_container_width=True
+    )
+    
+    # Only the cells that differ from the stored matrix are written back
+    for ct in callout_types:
+        changed_rows = (edited_df[ct] != grid_df[ct]).to_numpy().nonzero()[0]
+        for row_pos in changed_rows:
+            row = matrix_data[row_pos]
+            row[ct] = bool(edited_df[ct].iat[row_pos])
+            matrix.set(row["Location"], ct, row[ct])
+
+def render_matrix_bulk_operations(matrix_data):
+    """Render bulk select/clear controls for a callout type, a location or a whole Level 2"""
+    st.markdown('<p class="section-header">Bulk Operations</p>', unsafe_allow_html=True)
+    
+    scopes = ["Callout Type (column)", "Location (row)", "All locations in a Level 2"]
+    bulk_cols = st.columns([2, 3])
+    with bulk_cols[0]:
+        scope = st.selectbox("Apply to", scopes, key="matrix_bulk_scope")
+    with bulk_cols[1]:
+        if scope == scopes[0]:
+            target = st.selectbox("Callout Type", st.session_state.callout_types, key="matrix_bulk_ct")
+        elif scope == scopes[1]:
+            displays = [row["Display"] for row in matrix_data]
+            target = st.selectbox("Location", range(len(matrix_data)), format_func=lambda i: displays[i],
+                                  key="matrix_bulk_location")
+        else:
+            level2_names = sorted(set(row["Level2"] for row in matrix_data if row["Level2"]))
+            target = st.selectbox("Level 2", level2_names, key="matrix_bulk_level2")
+    
+    # Work out which locations and callout types the operation covers
+    if target is None:
+        return
+    if scope == scopes[0]:
+        locations, callout_types = [row["Location"] for row in matrix_data], [target]
+    elif scope == scopes[1]:
+        locations, callout_types = [matrix_data[target]["Location"]], st.session_state.callout_types
+    else:
+        locations = [row["Location"] for row in matrix_data if row["Level2"] == target]
+        callout_types = st.session_state.callout_types
+    
+    action_cols = st.columns(2)
+    with action_cols[0]:
+        select_all = st.button("Select All", key="matrix_bulk_select", use_container_width=True)
+    with action_cols[1]:
+        clear_all = st.button("Clear All", key="matrix_bulk_clear", use_container_width=True)
+    
+    if select_all or clear_all:
+        get_callout_matrix().set_many(locations, callout_types, bool(select_all))
+        st.session_state.matrix_editor_version = st.session_state.get("matrix_editor_version", 0) + 1
+        st.rerun()
+
 def create_matrix_data():
     """Create a DataFrame to represent the matrix with full hierarchy path"""
     matrix_data = []
+    matrix = get_callout_matrix()
+    callout_types = st.session_state.callout_types
     
     # Add entries from location hierarchy
     for entry in st.session_state.hierarchy_data["entries"]:
@@ -161,14 +257,11 @@ def create_matrix_data():
             # Use the level4 name as the key for data storage
             location_name = entry["level4"]
             
-            row_data = {"Location": location_name, "Display": location_display, "Path": path_str}
+            row_data = {"Location": location_name, "Display": location_display, "Path": path_str,
+                        "Level2": entry["level2"]}
             
             # Add a column for each callout type
-            for ct in st.session_state.callout_types:
-                key = f"matrix_{location_name}_{ct}".replace(" ", "_")
-                if key not in st.session_state.responses:
-                    st.session_state.responses[key] = False
-                row_data[ct] = st.session_state.responses[key]
+            row_data.update(zip(callout_types, matrix.row(location_name, callout_types)))
             
             matrix_data.append(row_data)
     
@@ -189,8 +282,7 @@ def create_preview_data(matrix_data):
         # Use the hierarchical display name for the preview
         display_row = {"Location": row["Display"]}
         for ct in st.session_state.callout_types:
-            key = f"matrix_{row['Location']}_{ct}".replace(" ", "_")
-            display_row[ct] = "X" if key in st.session_state.responses and st.session_state.responses[key] else ""
+            display_row[ct] = "X" if row.get(ct) else ""
         preview_data.append(display_row)
     
     return preview_data
\ No newline at end of file
@@ -3,7 +3,12 @@
 # ============================================================================
 import streamlit as st
 import pandas as pd
-from utils.ai_assistant import get_openai_response, save_chat_history
+from config.constants import HELP_TOPICS
+from utils.assistant_requests import submit_assistant_request, render_assistant_request
+from utils.help_corpus import topic_help_prompt
+from utils.session import thaw_section
+from utils.row_ids import ROW_ID_FIELD, new_row_id, remove_row
+from utils.batch_edit import render_batch_toggle, render_batch_form, edited_rows, rows_after, shared_values
 
 def render_trouble_locations_form():
     """Render the Trouble Locations form with interactive elements"""
@@ -24,8 +29,12 @@ def render_trouble_locations_form():
     # Initialize trouble locations in session state if not already there
     if 'trouble_locations' not in st.session_state:
         st.session_state.trouble_locations = [
-            {"recording_needed": True, "id": "", "location": "", "verbiage": ""}
+            {"recording_needed": True, "id": "", "location": "", "verbiage": "", "row_id": new_row_id()}
         ]
+    # This tab writes trouble locations back every run, so stop sharing the defaults
+    thaw_section('trouble_locations')
+    
+    batch_edit = render_batch_toggle("trouble_locations")
     
     # Create table header
     st.markdown("""
@@ -39,53 +48,20 @@ def render_trouble_locations_form():
     """, unsafe_allow_html=True)
     
     # Display existing entries
-    for i, location in enumerate(st.session_state.trouble_locations):
-        location_container = st.container()
-        with location_container:
-            cols = st.columns([1, 1, 2, 2, 0.5])
-            
-            with cols[0]:
-                location["recording_needed"] = st.checkbox(
-                    "Recording Needed", 
-                    value=location.get("recording_needed", True),
-                    key=f"rec_needed_{i}",
-                    label_visibility="collapsed"
-                )
-            
-            with cols[1]:
-                location["id"] = st.text_input(
-                    "ID", 
-                    value=location.get("id", ""),
-                    key=f"loc_id_{i}",
-                    label_visibility="collapsed"
-                )
-            
-            with cols[2]:
-                location["location"] = st.text_input(
-                    "Trouble Location", 
-                    value=location.get("location", ""),
-                    key=f"loc_name_{i}",
-                    label_visibility="collapsed"
-                )
-            
-            with cols[3]:
-                location["verbiage"] = st.text_input(
-                    "Verbiage (Pronunciation)", 
-                    value=location.get("verbiage", ""),
-                    key=f"loc_verbiage_{i}",
-                    label_visibility="collapsed",
-                    placeholder="e.g., rok-ferd"
-                )
-            
-            with cols[4]:
-                if st.button("🗑️", key=f"del_loc_{i}", help="Remove this location"):
-                    st.session_state.trouble_locations.pop(i)
-                    st.rerun()
+    locations = st.session_state.trouble_locations
+    if batch_edit:
+        if render_batch_form("trouble_locations_batch_form", locations, locations,
+                             lambda _, location: render_trouble_location_row(location, batch=True),
+                             validate_trouble_location_batch):
+            st.rerun()
+    else:
+        for location in locations:
+            render_trouble_location_row(location)
     
     # Add New Entry button
     if st.button("➕ Add Trouble Location"):
         st.session_state.trouble_locations.append(
-            {"recording_needed": True, "id": "", "location": "", "verbiage": ""}
+            {"recording_needed": True, "id": "", "location": "", "verbiage": "", "row_id": new_row_id()}
         )
         st.rerun()
     
@@ -132,13 +108,77 @@ def render_trouble_locations_form():
     
     help_topic = st.selectbox(
         "Select topic for help",
-        ["Trouble Locations", "Pronunciation Guide", "Recording Requirements", "Best Practices"]
+        HELP_TOPICS["Trouble Locations"]
     )
     
     if st.button("Get Help"):
-        help_query = f"Explain in detail what I need to know about {help_topic} when configuring the Trouble Locations tab in ARCOS. Include examples and best practices."
-        with st.spinner("Loading help..."):
-            help_response = get_openai_response(help_query)
-            save_chat_history(f"Help with {help_topic}", help_response)
+        help_query = topic_help_prompt("Trouble Locations", help_topic)
+        submit_assistant_request("trouble_locations_help", help_query, history_label=f"Help with {help_topic}")
+    
+    render_assistant_request("trouble_locations_help")
+
+def validate_trouble_location_batch(originals, staged, removed_ids):
+    """Return a message for each edited trouble location with no name or an ID another one uses"""
+    errors = []
+    shared_ids = shared_values(rows_after(st.session_state.trouble_locations, staged, removed_ids),
+                               lambda location: [location["id"]])
+    for location in edited_rows(originals, staged, removed_ids):
+        label = f"'{location['location']}'" if location["location"] else "A trouble location"
+        if not location["location"]:
+            errors.append(f"{label} needs a name")
+        if location["id"] in shared_ids:
+            errors.append(f"{label} uses ID '{location['id']}', which another trouble location also uses")
+    return errors
+
+def render_trouble_location_row(location, batch=False):
+    """Render the editor row for one trouble location.
+    
+    In batch mode the row is inside a form, so the delete button becomes a
+    checkbox whose value is returned.
+    """
+    # Widget keys follow the row, not its position
+    row_id = location[ROW_ID_FIELD]
+    location_container = st.container()
+    with location_container:
+        cols = st.columns([1, 1, 2, 2, 0.5])
+        
+        with cols[0]:
+            location["recording_needed"] = st.checkbox(
+                "Recording Needed", 
+                value=location.get("recording_needed", True),
+                key=f"rec_needed_{row_id}",
+                label_visibility="collapsed"
+            )
+        
+        with cols[1]:
+            location["id"] = st.text_input(
+                "ID", 
+                value=location.get("id", ""),
+                key=f"loc_id_{row_id}",
+                label_visibility="collapsed"
+            )
+        
+        with cols[2]:
+            location["location"] = st.text_input(
+                "Trouble Location", 
+                value=location.get("location", ""),
+                key=f"loc_name_{row_id}",
+                label_visibility="collapsed"
+            )
+        
+        with cols[3]:
+            location["verbiage"] = st.text_input(
+                "Verbiage (Pronunciation)", 
+                value=location.get("verbiage", ""),
+                key=f"loc_verbiage_{row_id}",
+                label_visibility="collapsed",
+                placeholder="e.g., rok-ferd"
+            )
         
-        st.info(help_response)
\ No newline at end of file
+        with cols[4]:
+            if batch:
+                return st.checkbox("🗑️", key=f"batch_del_loc_{row_id}", help="Remove this location on Apply")
+            if st.button("🗑️", key=f"del_loc_{row_id}", help="Remove this location"):
+                remove_row(st.session_state.trouble_locations, row_id)
+                st.rerun()
+    return False
@@ -0,0 +1,10 @@
+# ============================================================================
+# TEST CONFIGURATION
+# ============================================================================
+# Lets the tests import the app's packages when pytest is run from any directory.
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
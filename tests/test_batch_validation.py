@@ -0,0 +1,66 @@
+# ============================================================================
+# BATCH APPLY VALIDATION ON THE ROW TABS
+# ============================================================================
+import os
+import pytest
+from streamlit.testing.v1 import AppTest
+from conftest import ROOT
+from config.constants import DEFAULT_JOB_CLASSIFICATION
+from utils.frozen import thaw
+from utils.row_ids import with_row_id
+
+@pytest.fixture
+def open_batch_tab(monkeypatch):
+    """Return a function opening a tab in batch mode"""
+    monkeypatch.chdir(ROOT)
+    at = AppTest.from_file(os.path.join(ROOT, "app.py"), default_timeout=60)
+    at.run()
+    
+    def open_tab(tab, section):
+        at.session_state["current_tab"] = tab
+        at.run()
+        at.toggle(key=f"{section}_batch_edit").set_value(True).run()
+        return at
+    return open_tab
+
+def _apply(at):
+    next(button for button in at.button if button.label == "✅ Apply changes").click().run()
+
+def test_event_type_hours_must_be_numbers(open_batch_tab):
+    at = open_batch_tab("Event Types", "event_types")
+    event = at.session_state["event_types"][0]
+    at.text_input(key=f"event_min_{event['row_id']}").input("two")
+    _apply(at)
+    assert "Min Hours must be a number of hours" in at.error[0].value
+    assert at.session_state["event_types"][0]["min_duration"] == event["min_duration"]
+    
+    at.text_input(key=f"event_min_{event['row_id']}").input("2")
+    _apply(at)
+    assert not at.error
+    assert at.session_state["event_types"][0]["min_duration"] == "2"
+
+def test_job_classification_ids_must_be_unique(open_batch_tab):
+    at = open_batch_tab("Job Classifications", "job_classifications")
+    other = with_row_id(thaw(DEFAULT_JOB_CLASSIFICATION))
+    other.update(title="Apprentice Lineman", ids=["100", "", "", "", ""])
+    at.session_state["job_classifications"].append(other)
+    at.run()
+    
+    first = at.session_state["job_classifications"][0]["row_id"]
+    at.text_input(key=f"job_title_{first}").input("Lineman")
+    at.text_input(key=f"job_id_{first}_0").input("100")
+    _apply(at)
+    assert "'Lineman' uses ID '100'" in at.error[0].value
+    
+    at.text_input(key=f"job_title_{first}").input("Lineman")
+    at.text_input(key=f"job_id_{first}_0").input("101")
+    _apply(at)
+    assert not at.error
+    assert at.session_state["job_classifications"][0]["ids"][0] == "101"
+
+def test_trouble_location_needs_a_name(open_batch_tab):
+    at = open_batch_tab("Trouble Locations", "trouble_locations")
+    location = at.session_state["trouble_locations"][0]["row_id"]
+    at.text_input(key=f"loc_id_{location}").input("001")
+    _apply(at)
+    assert "needs a name" in at.error[0].value
@@ -0,0 +1,85 @@
+# ============================================================================
+# LOCATION HIERARCHY BATCH APPLY
+# ============================================================================
+# Batch Apply checks only the edited rows, with uniqueness judged against the
+# page as it will be after the batch, so duplicates can be fixed or swapped.
+import os
+import pytest
+from streamlit.testing.v1 import AppTest
+from conftest import ROOT
+from tabs.location_hierarchy import new_hierarchy_entry
+
+def _entry(level4, code):
+    entry = new_hierarchy_entry("Acme", "North", "Ops")
+    entry["level4"] = level4
+    entry["codes"][0] = code
+    return entry
+
+@pytest.fixture
+def app(monkeypatch):
+    """The app on the Location Hierarchy tab in batch mode, with two Level 4 locations"""
+    monkeypatch.chdir(ROOT)
+    at = AppTest.from_file(os.path.join(ROOT, "app.py"), default_timeout=60)
+    at.run()
+    at.session_state["hierarchy_data"]["entries"] = [_entry("Baytown", "DUP"), _entry("Bellaire", "DUP")]
+    at.run()
+    at.toggle(key="hierarchy_batch_edit").set_value(True).run()
+    return at
+
+def _entries(at):
+    return at.session_state["hierarchy_data"]["entries"]
+
+def _apply(at):
+    next(button for button in at.button if button.label == "✅ Apply changes").click().run()
+
+def test_fix_duplicate_code_via_batch_apply(app):
+    first = _entries(app)[0]["row_id"]
+    app.text_input(key=f"code_{first}_0").input("UNIQUE1")
+    _apply(app)
+    assert not app.error
+    assert _entries(app)[0]["codes"][0] == "UNIQUE1"
+    assert "DUP" not in app.session_state["hierarchy_index"].duplicate_codes
+
+def test_unrelated_edit_applies_despite_existing_duplicate(app):
+    first = _entries(app)[0]["row_id"]
+    app.text_input(key=f"tz_{first}").input("CT")
+    _apply(app)
+    assert not app.error
+    assert _entries(app)[0]["timezone"] == "CT"
+
+def test_swap_codes_via_batch_apply(app):
+    first, second = (entry["row_id"] for entry in _entries(app))
+    app.text_input(key=f"code_{first}_0").input("A1")
+    app.text_input(key=f"code_{second}_0").input("B1")
+    _apply(app)
+    app.text_input(key=f"code_{first}_0").input("B1")
+    app.text_input(key=f"code_{second}_0").input("A1")
+    _apply(app)
+    assert not app.error
+    assert [entry["codes"][0] for entry in _entries(app)] == ["B1", "A1"]
+
+def test_new_duplicate_is_rejected(app):
+    first, second = (entry["row_id"] for entry in _entries(app))
+    app.text_input(key=f"code_{first}_0").input("A1")
+    app.text_input(key=f"code_{second}_0").input("B1")
+    _apply(app)
+    app.text_input(key=f"code_{second}_0").input("A1")
+    _apply(app)
+    assert "Code 'A1' is already used by another location" in app.error[0].value
+    assert _entries(app)[1]["codes"][0] == "B1"
+
+def test_new_level4_applies_before_its_code_inputs_exist(app):
+    app.session_state["hierarchy_data"]["entries"].append(new_hierarchy_entry("Acme", "North", "Ops"))
+    app.run()
+    new = _entries(app)[2]["row_id"]
+    app.text_input(key=f"lvl4_{new}").input("Pasadena")
+    _apply(app)
+    assert not app.error
+    assert _entries(app)[2]["level4"] == "Pasadena"
+
+def test_clearing_the_code_of_an_existing_level4_is_rejected(app):
+    first = _entries(app)[0]["row_id"]
+    app.text_input(key=f"code_{first}_0").input("")
+    _apply(app)
+    assert "needs a location code" in app.error[0].value
+    assert _entries(app)[0]["codes"][0] == "DUP"
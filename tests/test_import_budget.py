@@ -0,0 +1,46 @@
+# ============================================================================
+# COLD START IMPORT BUDGET
+# ============================================================================
+# Imports the app the way a fresh server process does and fails if startup
+# takes longer than STARTUP_IMPORT_BUDGET_SECONDS or loads a dependency that
+# should only load on first use.
+import json
+import subprocess
+import sys
+import pytest
+from config.settings import DEFAULT_TAB, STARTUP_IMPORT_BUDGET_SECONDS
+from conftest import ROOT
+
+# Heavy dependencies that must not load before the feature using them is opened
+DEFERRED_MODULES = ["pandas", "openai", "openpyxl", "xlsxwriter"]
+
+# Runs in a fresh interpreter; streamlit itself is imported first so only the
+# app's own startup cost is measured
+_PROBE = """
+import json, sys, time, logging
+logging.disable(logging.CRITICAL)
+import streamlit
+started = time.perf_counter()
+import app
+app.load_tab_renderer(sys.argv[1])
+elapsed = time.perf_counter() - started
+print(json.dumps({"elapsed": elapsed, "modules": sorted(sys.modules)}))
+"""
+
+@pytest.fixture(scope="module")
+def cold_start():
+    """(seconds, loaded module names) for importing the app and its landing tab"""
+    result = subprocess.run([sys.executable, "-c", _PROBE, DEFAULT_TAB], cwd=ROOT,
+                            capture_output=True, text=True, check=True)
+    probe = json.loads(result.stdout.strip().splitlines()[-1])
+    return probe["elapsed"], set(probe["modules"])
+
+def test_cold_start_within_budget(cold_start):
+    elapsed, _ = cold_start
+    assert elapsed <= STARTUP_IMPORT_BUDGET_SECONDS, (
+        f"cold start imports took {elapsed:.3f}s (budget {STARTUP_IMPORT_BUDGET_SECONDS:.3f}s)")
+
+def test_heavy_dependencies_load_on_first_use(cold_start):
+    _, modules = cold_start
+    loaded = [name for name in DEFERRED_MODULES if name in modules]
+    assert not loaded, f"loaded at startup but should load on first use: {', '.join(loaded)}"
@@ -0,0 +1,46 @@
+# ============================================================================
+# JSON BACKUP ROUND TRIP
+# ============================================================================
+# Exporting a session to JSON and loading it back must restore every section,
+# including the callout type matrix, which backups store as a plain dict.
+import pytest
+from streamlit.testing.v1 import AppTest
+from conftest import ROOT
+from utils.matrix_store import CalloutMatrix
+
+def _backup_round_trip_app():
+    import json
+    import runpy
+    import streamlit as st
+    from utils.data_import import export_session_to_json, load_session_data
+    from utils.matrix_store import get_callout_matrix
+
+    step = st.session_state.pop("backup_step", None)
+    if step == "export":
+        get_callout_matrix().set("Baytown", "Normal", True)
+        st.session_state.backup = export_session_to_json()
+    elif step == "load":
+        del st.session_state["callout_matrix"]
+        load_session_data(json.loads(st.session_state.backup))
+    runpy.run_path("app.py", run_name="__main__")
+
+@pytest.fixture
+def app(monkeypatch):
+    monkeypatch.chdir(ROOT)
+    at = AppTest.from_function(_backup_round_trip_app, default_timeout=60)
+    at.run()
+    return at
+
+def test_json_backup_round_trip(app):
+    app.session_state["backup_step"] = "export"
+    app.run()
+    assert '"callout_matrix"' in app.session_state["backup"]
+
+    app.session_state["backup_step"] = "load"
+    app.run()
+    # Loading a file reruns the app
+    app.run()
+    assert not app.exception
+    matrix = app.session_state["callout_matrix"]
+    assert isinstance(matrix, CalloutMatrix)
+    assert matrix.get("Baytown", "Normal")
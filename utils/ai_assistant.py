@@ -2,70 +2,229 @@
 # AI ASSISTANT FUNCTIONALITY
 # ============================================================================
 import streamlit as st
-import openai
 import os
+import threading
 from config.constants import OPENAI_MODEL, OPENAI_MAX_TOKENS, OPENAI_TEMPERATURE
+from config.settings import AI_REQUEST_TIMEOUT_SECONDS, AI_HISTORY_TOKEN_BUDGET
+from utils.chat_history import ChatHistory
+from utils.help_corpus import build_system_content, lookup_help_answer
+from utils.rate_limiter import get_openai_gate, is_retryable_error, remaining_seconds
+from utils.response_cache import get_response_cache, response_cache_key
+from utils.retrieval import build_reference_context
 
 # ============================================================================
 # OPENAI CLIENT INITIALIZATION
 # ============================================================================
+PLACEHOLDER_RESPONSE = ("This is a placeholder response since the OpenAI API key is not configured. "
+                        "In a real deployment, this would be a helpful response from the AI model.")
+
+class DummyClient:
+    """Offline stand-in for the OpenAI client that answers with placeholder text.
+    
+    Supports stream=True by playing the placeholder back word by word, shaped
+    like the chunks of a real streamed completion.
+    """
+    # Placeholder answers are never cached
+    is_placeholder = True
+    
+    # Seconds between streamed chunks
+    stream_delay = 0.02
+    
+    def __init__(self):
+        self.chat = self
+        self.completions = self
+    
+    def create(self, stream=False, **kwargs):
+        from collections import namedtuple
+        if stream:
+            return self._stream(namedtuple)
+        Choice = namedtuple('Choice', ['message'])
+        Message = namedtuple('Message', ['content'])
+        Response = namedtuple('Response', ['choices'])
+        
+        msg = Message(content=PLACEHOLDER_RESPONSE)
+        choices = [Choice(message=msg)]
+        return Response(choices=choices)
+    
+    def _stream(self, namedtuple):
+        import time
+        Delta = namedtuple('Delta', ['content'])
+        Choice = namedtuple('Choice', ['delta'])
+        Chunk = namedtuple('Chunk', ['choices'])
+        
+        words = PLACEHOLDER_RESPONSE.split(" ")
+        for i, word in enumerate(words):
+            time.sleep(self.stream_delay)
+            yield Chunk(choices=[Choice(delta=Delta(content=word if i == 0 else " " + word))])
+
 def initialize_openai_client():
     """Initialize the OpenAI client with API key from secrets"""
     try:
-        client = openai.OpenAI(api_key=st.secrets["OPENAI_API_KEY"])
+        # Imported here: the openai package is slow to load and only needed once a question is asked
+        import openai
+        # Retries are handled by the rate limiter's backoff instead of the client
+        client = openai.OpenAI(api_key=st.secrets["OPENAI_API_KEY"], timeout=AI_REQUEST_TIMEOUT_SECONDS,
+                               max_retries=0)
         return client
     except Exception as e:
         print(f"Warning: OpenAI client initialization failed - {str(e)}")
         # Create a dummy client for demo purposes when API key is not available
-        class DummyClient:
-            def __init__(self):
-                self.chat = self
-                self.completions = self
-            
-            def create(self, **kwargs):
-                from collections import namedtuple
-                Choice = namedtuple('Choice', ['message'])
-                Message = namedtuple('Message', ['content'])
-                Response = namedtuple('Response', ['choices'])
-                
-                msg = Message(content="This is a placeholder response since the OpenAI API key is not configured. In a real deployment, this would be a helpful response from the AI model.")
-                choices = [Choice(message=msg)]
-                return Response(choices=choices)
-        
         return DummyClient()
 
-# Initialize the OpenAI client
-client = initialize_openai_client()
+_client = None
+_client_lock = threading.Lock()
+
+def get_client():
+    """Return the shared OpenAI client, initializing it on first use"""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = initialize_openai_client()
+    return _client
+
+def _is_placeholder_client():
+    return getattr(get_client(), "is_placeholder", False)
+
+def _build_messages(system_content, prompt, history=()):
+    return ([{"role": "system", "content": system_content}]
+            + list(history)
+            + [{"role": "user", "content": prompt}])
+
+def _is_retryable_error(exc):
+    """Retry rate limiting, server errors and dropped connections"""
+    import openai
+    return isinstance(exc, (openai.APIConnectionError, openai.APITimeoutError)) or is_retryable_error(exc)
+
+def _timeout_kwargs(deadline):
+    # Each attempt's HTTP timeout is capped at the time left before deadline
+    if deadline is None:
+        return {}
+    return {"timeout": max(remaining_seconds(deadline), 1.0)}
 
-def get_openai_response(prompt, context=""):
-    """Get response from OpenAI API"""
+def request_completion(system_content, prompt, deadline=None):
+    """Send one chat completion request through the rate limiter and return the response text.
+    
+    deadline is a time.monotonic() value after which the caller no longer
+    wants the answer; queueing and retries stop there.
+    """
+    response = get_openai_gate(_is_retryable_error).call(lambda: get_client().chat.completions.create(
+        model=OPENAI_MODEL,
+        messages=_build_messages(system_content, prompt),
+        max_tokens=OPENAI_MAX_TOKENS,
+        temperature=OPENAI_TEMPERATURE,
+        **_timeout_kwargs(deadline)
+    ), deadline)
+    return response.choices[0].message.content
+
+def _stream_completion(system_content, prompt, history=(), deadline=None):
+    """Send one streamed chat completion request through the rate limiter and yield its text chunks"""
+    stream = get_openai_gate(_is_retryable_error).stream(lambda: get_client().chat.completions.create(
+        model=OPENAI_MODEL,
+        messages=_build_messages(system_content, prompt, history),
+        max_tokens=OPENAI_MAX_TOKENS,
+        temperature=OPENAI_TEMPERATURE,
+        stream=True,
+        **_timeout_kwargs(deadline)
+    ), deadline)
+    for chunk in stream:
+        # The final chunk of a stream may carry no choices or an empty delta
+        if chunk.choices and chunk.choices[0].delta.content:
+            yield chunk.choices[0].delta.content
+
+def build_grounded_system_content(prompt, context=""):
+    """Return the system message for prompt with the most relevant reference snippets attached"""
+    system_content = build_system_content(context)
+    reference = build_reference_context(prompt)
+    if reference:
+        system_content += ("\n\nAnswer concisely, relying on this reference material where it applies:\n"
+                           + reference)
+    return system_content
+
+def get_openai_response(prompt, context="", deadline=None):
+    """Get response from OpenAI API, reusing pre-generated and cached answers to identical requests.
+    
+    deadline (a time.monotonic() value) is passed on to request_completion.
+    """
     try:
-        messages = [
-            {"role": "system", "content": "You are a helpful expert on ARCOS system implementation. " + context},
-            {"role": "user", "content": prompt}
-        ]
+        # Pre-generated help answers need no API call
+        answer = lookup_help_answer(prompt, context)
+        if answer is not None:
+            return answer
         
-        response = client.chat.completions.create(
-            model=OPENAI_MODEL,
-            messages=messages,
-            max_tokens=OPENAI_MAX_TOKENS,
-            temperature=OPENAI_TEMPERATURE
-        )
-        return response.choices[0].message.content
+        system_content = build_grounded_system_content(prompt, context)
+        key = response_cache_key(OPENAI_MODEL, system_content, prompt)
+        if _is_placeholder_client():
+            return request_completion(system_content, prompt, deadline)
+        
+        return get_response_cache().get_or_compute(key, lambda: request_completion(system_content, prompt, deadline))
     except Exception as e:
         return f"Error: {str(e)}"
 
+def stream_openai_response(prompt, context="", history=None, deadline=None):
+    """Yield the response from OpenAI API in chunks as they arrive.
+    
+    history is a list of earlier role/content messages sent ahead of prompt.
+    Without history, a pre-generated or cached answer is yielded in one piece
+    and a streamed answer is added to the response cache once it completes.
+    Errors are yielded as an "Error: ..." chunk. Queueing, retries and the
+    stream itself stop at deadline (a time.monotonic() value).
+    """
+    history = history or []
+    if not history:
+        answer = lookup_help_answer(prompt, context)
+        if answer is not None:
+            yield answer
+            return
+    
+    system_content = build_grounded_system_content(prompt, context)
+    # Answers to follow-up questions depend on the conversation, so they aren't shared
+    cacheable = not history and not _is_placeholder_client()
+    key = response_cache_key(OPENAI_MODEL, system_content, prompt)
+    
+    if cacheable:
+        cached = get_response_cache().get(key)
+        if cached is not None:
+            yield cached
+            return
+    
+    chunks = []
+    try:
+        for text in _stream_completion(system_content, prompt, history, deadline):
+            chunks.append(text)
+            yield text
+    except Exception as e:
+        yield f"Error: {str(e)}"
+        return
+    
+    if cacheable and chunks:
+        get_response_cache().put(key, "".join(chunks))
+
+def get_chat_history():
+    """Return this session's chat history store, creating it on first use"""
+    history = st.session_state.get('chat_history')
+    if not isinstance(history, ChatHistory):
+        messages = history or []
+        history = ChatHistory()
+        for message in messages:
+            history.append(message["role"], message["content"])
+        st.session_state.chat_history = history
+    return history
+
 def save_chat_history(user_question, response):
     """Save user question and AI response to chat history"""
-    st.session_state.chat_history.append({"role": "user", "content": user_question})
-    st.session_state.chat_history.append({"role": "assistant", "content": response})
+    history = get_chat_history()
+    history.append("user", user_question)
+    history.append("assistant", response)
 
 def get_recent_messages(limit=10):
     """Get the most recent messages from chat history"""
-    if len(st.session_state.chat_history) > 0:
-        return st.session_state.chat_history[-limit:]
-    return []
+    return get_chat_history().recent(limit)
+
+def get_context_messages(token_budget=AI_HISTORY_TOKEN_BUDGET):
+    """Get the recent conversation turns that fit in token_budget, to send with a follow-up question"""
+    return get_chat_history().context_messages(token_budget)
 
 def clear_chat_history():
     """Clear the chat history"""
-    st.session_state.chat_history = []
\ No newline at end of file
+    get_chat_history().clear()
@@ -0,0 +1,147 @@
+# ============================================================================
+# BACKGROUND AI ASSISTANT REQUESTS
+# ============================================================================
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+import streamlit as st
+from config.settings import (
+    AI_MAX_CONCURRENT_REQUESTS,
+    AI_REQUEST_TIMEOUT_SECONDS,
+    AI_POLL_INTERVAL_SECONDS,
+    AI_STREAM_POLL_INTERVAL_SECONDS
+)
+from utils.ai_assistant import get_openai_response, stream_openai_response, save_chat_history
+from utils.help_corpus import lookup_help_answer
+
+_executor = None
+_executor_lock = threading.Lock()
+
+def get_assistant_executor():
+    """Return the process-wide thread pool that runs assistant calls for every session"""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=AI_MAX_CONCURRENT_REQUESTS,
+                                               thread_name_prefix="assistant")
+    return _executor
+
+class AssistantRequest:
+    """One assistant call running in the background, tracked in session state"""
+
+    def __init__(self, prompt, context="", history_label=None, stream=False, history=None):
+        self.prompt = prompt
+        self.context = context
+        self.history = history
+        self.history_label = history_label or prompt
+        self.stream = stream
+        self.chunks = []
+        self.started = time.time()
+        # Passed to the API gate so a call the UI has given up on stops queueing and retrying
+        self.deadline = time.monotonic() + AI_REQUEST_TIMEOUT_SECONDS
+        self.timed_out = False
+        self.recorded = False
+        self.future = None
+
+    def run(self):
+        # Runs on a pool thread: no session state access here
+        if self.stream:
+            for chunk in stream_openai_response(self.prompt, self.context, self.history, self.deadline):
+                self.chunks.append(chunk)
+        else:
+            self.chunks.append(get_openai_response(self.prompt, self.context, self.deadline))
+
+    @property
+    def text(self):
+        """Response text received so far"""
+        if self.timed_out:
+            return f"Error: The assistant did not respond within {AI_REQUEST_TIMEOUT_SECONDS} seconds."
+        if self.future is not None and self.future.done() and self.future.exception() is not None:
+            return f"Error: {str(self.future.exception())}"
+        return "".join(self.chunks)
+
+    @property
+    def pending(self):
+        """True until the call finishes or times out"""
+        if self.timed_out or self.future.done():
+            return False
+        if time.time() - self.started > AI_REQUEST_TIMEOUT_SECONDS:
+            # The worker may still be running; its late answer is discarded
+            self.timed_out = True
+            self.future.cancel()
+            return False
+        return True
+
+def _assistant_requests():
+    if 'assistant_requests' not in st.session_state:
+        st.session_state.assistant_requests = {}
+    return st.session_state.assistant_requests
+
+def submit_assistant_request(slot, prompt, context="", history_label=None, stream=False, history=None):
+    """Start an assistant call in the background, replacing any earlier request in slot.
+
+    history is a list of earlier conversation messages sent with a streamed
+    prompt. Prompts answered by the pre-generated help corpus complete
+    immediately without using a worker thread.
+    """
+    request = AssistantRequest(prompt, context, history_label, stream, history)
+    answer = None if history else lookup_help_answer(prompt, context)
+    if answer is not None:
+        request.chunks.append(answer)
+        request.future = Future()
+        request.future.set_result(None)
+    else:
+        request.future = get_assistant_executor().submit(request.run)
+    _assistant_requests()[slot] = request
+    return request
+
+def get_assistant_request(slot):
+    """Return the request last submitted in slot, or None"""
+    return _assistant_requests().get(slot)
+
+def _finish_request(slot, request, keep_answer):
+    # Record the finished exchange once, on the script thread
+    if not request.recorded:
+        save_chat_history(request.history_label, request.text)
+        request.recorded = True
+    if not keep_answer:
+        _assistant_requests().pop(slot, None)
+
+def _render_pending_request(slot, render_answer):
+    """Show a pending request's progress and rerun the app once it has finished"""
+    request = get_assistant_request(slot)
+    if request is None:
+        return
+    if not request.pending:
+        st.rerun()
+    partial = request.text
+    if partial:
+        render_answer(partial + " ▌")
+    else:
+        st.caption(f"⏳ Waiting for the assistant... ({int(time.time() - request.started)}s)")
+
+# A fragment lets a pending request poll without rerunning the page; streamed
+# answers are redrawn more often so their text appears as it arrives
+_poll_pending_request = st.fragment(run_every=AI_POLL_INTERVAL_SECONDS)(_render_pending_request)
+_poll_pending_stream = st.fragment(run_every=AI_STREAM_POLL_INTERVAL_SECONDS)(_render_pending_request)
+
+def render_assistant_request(slot, render_answer=st.info, keep_answer=True):
+    """Render the request in slot: progress while pending, the answer once complete.
+
+    Finished answers are saved to the chat history. With keep_answer=False the
+    request is dropped once recorded instead of being shown on later reruns.
+    """
+    request = get_assistant_request(slot)
+    if request is None:
+        return None
+
+    if request.pending:
+        poll = _poll_pending_stream if request.stream else _poll_pending_request
+        poll(slot, render_answer)
+        return None
+
+    _finish_request(slot, request, keep_answer)
+    if keep_answer:
+        render_answer(request.text)
+    return request.text
@@ -0,0 +1,80 @@
+# ============================================================================
+# BATCHED ROW EDITING
+# ============================================================================
+# Optional editing mode for the row-based tabs: a page of rows is rendered
+# inside one form, so field edits stay in the browser until "Apply" commits
+# them all in a single rerun.
+import copy
+from collections import Counter
+import streamlit as st
+from utils.row_ids import ROW_ID_FIELD, remove_row
+
+def render_batch_toggle(section):
+    """Render the batch editing switch for section and return whether it is on"""
+    return st.toggle(
+        "Batch editing",
+        key=f"{section}_batch_edit",
+        help="Edit a whole page of rows and save them together with Apply, instead of rerunning after every field"
+    )
+
+def edited_rows(originals, staged, removed_ids, fields=None):
+    """Return the kept staged rows that differ from their original, comparing only fields if given"""
+    edited = []
+    for original, row in zip(originals, staged):
+        if row[ROW_ID_FIELD] in removed_ids:
+            continue
+        if any(original.get(field) != row.get(field) for field in (fields or row.keys())):
+            edited.append(row)
+    return edited
+
+def rows_after(rows, staged, removed_ids):
+    """Return rows as they would be once the batch is applied"""
+    staged_by_id = {row[ROW_ID_FIELD]: row for row in staged}
+    return [staged_by_id.get(row[ROW_ID_FIELD], row) for row in rows if row[ROW_ID_FIELD] not in removed_ids]
+
+def shared_values(rows, values_of):
+    """Return the non-blank values found in more than one row; values_of(row) lists a row's values"""
+    counts = Counter(value for row in rows for value in set(values_of(row)) if value)
+    return {value for value, count in counts.items() if count > 1}
+
+def apply_row_changes(rows, originals, staged, removed_ids):
+    """Write staged values into their original rows and drop removed rows; return (changed rows, removed row ids)"""
+    changed = []
+    for original, row in zip(originals, staged):
+        if row[ROW_ID_FIELD] in removed_ids:
+            continue
+        changes = {field: value for field, value in row.items() if original.get(field) != value}
+        if changes:
+            original.update(changes)
+            changed.append(original)
+    removed = [row_id for row_id in removed_ids if remove_row(rows, row_id)]
+    return changed, removed
+
+def render_batch_form(form_key, rows, page_rows, render_row, validate_batch=None):
+    """Render page_rows in one form and apply the edits to rows when Apply is pressed.
+
+    render_row(position, row) draws the widgets for one row, writing into a
+    staged copy, and returns True if the row is marked for removal. On Apply
+    validate_batch(page_rows, staged rows, removed row ids) returns a list of
+    messages, typically for the edited rows only (see edited_rows and
+    rows_after); the changes and removals are applied together only if there
+    are none. Returns (changed rows, removed row ids) if a batch was applied,
+    otherwise None.
+    """
+    staged = [copy.deepcopy(row) for row in page_rows]
+    with st.form(form_key):
+        removed_ids = {row[ROW_ID_FIELD] for position, row in enumerate(staged) if render_row(position, row)}
+        submitted = st.form_submit_button("✅ Apply changes", type="primary")
+
+    if not submitted:
+        return None
+
+    errors = validate_batch(page_rows, staged, removed_ids) if validate_batch is not None else []
+    if errors:
+        st.error("Nothing was applied. Fix these rows and press Apply again:\n\n" +
+                 "\n".join(f"- {error}" for error in errors))
+        return None
+
+    changed, removed = apply_row_changes(rows, page_rows, staged, removed_ids)
+    st.toast(f"Applied {len(changed)} edited and {len(removed)} removed row(s)")
+    return changed, removed
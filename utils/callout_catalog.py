@@ -0,0 +1,82 @@
+# ============================================================================
+# CALLOUT REASON CATALOG
+# ============================================================================
+import json
+import os
+import threading
+from config.settings import CALLOUT_REASONS_PATH
+
+ID_FIELD = "ID"
+LABEL_FIELD = "Callout Reason Drop-Down Label"
+
+# Basic set used when the JSON file can't be loaded
+FALLBACK_CALLOUT_REASONS = [
+    {"ID": "0", "Callout Reason Drop-Down Label": "", "Use?": "x", "Default?": "x", "Verbiage": "n/a"},
+    {"ID": "1001", "Callout Reason Drop-Down Label": "Broken Line", "Use?": "x", "Default?": "", "Verbiage": "Pre-recorded"},
+    {"ID": "1002", "Callout Reason Drop-Down Label": "Depression Road", "Use?": "x", "Default?": "", "Verbiage": "Pre-recorded"},
+    {"ID": "1003", "Callout Reason Drop-Down Label": "Depression Yard", "Use?": "x", "Default?": "", "Verbiage": "Pre-recorded"},
+    {"ID": "1007", "Callout Reason Drop-Down Label": "Emergency", "Use?": "x", "Default?": "", "Verbiage": "Pre-recorded"},
+    {"ID": "1008", "Callout Reason Drop-Down Label": "Odor", "Use?": "x", "Default?": "", "Verbiage": "Pre-recorded"}
+]
+
+class CalloutReasonCatalog:
+    """Parsed callout reasons plus lookup indexes, shared by every session"""
+
+    def __init__(self, reasons, mtime=None):
+        self.reasons = reasons
+        self.mtime = mtime
+        self.by_id = {str(r.get(ID_FIELD, "")): r for r in reasons}
+        self.by_label = {str(r.get(LABEL_FIELD, "")): r for r in reasons}
+        self.used_ids = [str(r.get(ID_FIELD, "")) for r in reasons if r.get("Use?") == "x"]
+        self.default_ids = [str(r.get(ID_FIELD, "")) for r in reasons if r.get("Default?") == "x"]
+
+    def __len__(self):
+        return len(self.reasons)
+
+    @property
+    def default_id(self):
+        """First reason flagged as Default?, or an empty string"""
+        return self.default_ids[0] if self.default_ids else ""
+
+    def select(self, ids):
+        """Return the reasons whose ID is in ids, in catalog order"""
+        wanted = set(str(i) for i in ids)
+        return [r for r in self.reasons if str(r.get(ID_FIELD, "")) in wanted]
+
+_catalog = None
+_catalog_lock = threading.Lock()
+
+def _file_mtime(path):
+    try:
+        return os.path.getmtime(path)
+    except OSError:
+        return None
+
+def get_callout_catalog(path=CALLOUT_REASONS_PATH):
+    """Return the process-wide catalog, reloading it only when the file changes"""
+    global _catalog
+    mtime = _file_mtime(path)
+    catalog = _catalog
+    if catalog is not None and catalog.mtime == mtime:
+        return catalog
+
+    with _catalog_lock:
+        if _catalog is not None and _catalog.mtime == mtime:
+            return _catalog
+        try:
+            with open(path, 'r') as file:
+                reasons = json.load(file)
+        except Exception as e:
+            print(f"Error loading callout reasons: {str(e)}")
+            reasons = FALLBACK_CALLOUT_REASONS
+        _catalog = CalloutReasonCatalog(reasons, mtime)
+        return _catalog
+
+def save_callout_catalog(reasons, path=CALLOUT_REASONS_PATH):
+    """Write reasons back to the JSON file and refresh the shared catalog"""
+    global _catalog
+    with _catalog_lock:
+        with open(path, 'w') as file:
+            json.dump(reasons, file, indent=2)
+        _catalog = CalloutReasonCatalog(reasons, _file_mtime(path))
+        return _catalog
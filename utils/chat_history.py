@@ -0,0 +1,118 @@
+# ============================================================================
+# CHAT HISTORY STORE
+# ============================================================================
+import json
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from config.settings import CHAT_HISTORY_MAX_MESSAGES, CHAT_LOG_DIR, CHAT_LOG_MAX_AGE_SECONDS
+from utils.retrieval import estimate_tokens
+
+# Old logs are swept at most this often per process
+_PRUNE_INTERVAL_SECONDS = 60 * 60
+
+_last_prune = 0.0
+_prune_lock = threading.Lock()
+
+def prune_chat_logs(log_dir, max_age=CHAT_LOG_MAX_AGE_SECONDS):
+    """Delete chat logs in log_dir not written to for max_age seconds; returns how many were removed"""
+    cutoff = time.time() - max_age
+    removed = 0
+    try:
+        names = os.listdir(log_dir)
+    except OSError:
+        return 0
+    for name in names:
+        path = os.path.join(log_dir, name)
+        if not (name.startswith("chat_") and name.endswith(".jsonl")):
+            continue
+        try:
+            if os.path.getmtime(path) < cutoff:
+                os.remove(path)
+                removed += 1
+        except OSError:
+            pass
+    return removed
+
+def _maybe_prune_chat_logs(log_dir):
+    # Abandoned sessions never clear their logs, so new sessions sweep them up
+    global _last_prune
+    with _prune_lock:
+        if time.time() - _last_prune < _PRUNE_INTERVAL_SECONDS:
+            return
+        _last_prune = time.time()
+    prune_chat_logs(log_dir)
+
+class ChatHistory:
+    """Ring buffer of the most recent chat messages for one session.
+
+    Once the buffer holds max_messages, each new message pushes the oldest one
+    out to an append-only JSON-lines log under log_dir, so session memory
+    stays flat however long the conversation runs. Logs older than
+    CHAT_LOG_MAX_AGE_SECONDS are deleted; with no log_dir the pushed-out
+    messages are dropped.
+    """
+
+    def __init__(self, max_messages=CHAT_HISTORY_MAX_MESSAGES, log_dir=CHAT_LOG_DIR):
+        self.messages = deque(maxlen=max_messages)
+        self.log_dir = log_dir
+        self.log_path = os.path.join(log_dir, f"chat_{uuid.uuid4().hex}.jsonl") if log_dir else None
+        self.spilled = 0
+        if log_dir:
+            _maybe_prune_chat_logs(log_dir)
+
+    def __len__(self):
+        return len(self.messages)
+
+    def __iter__(self):
+        return iter(self.messages)
+
+    def _spill(self, message):
+        if not self.log_path:
+            return
+        try:
+            os.makedirs(self.log_dir, exist_ok=True)
+            with open(self.log_path, 'a') as file:
+                file.write(json.dumps(message, separators=(',', ':')) + "\n")
+            self.spilled += 1
+        except OSError as e:
+            print(f"Warning: could not write chat log - {str(e)}")
+
+    def append(self, role, content):
+        """Add a message, spilling the oldest one to disk if the buffer is full"""
+        if len(self.messages) == self.messages.maxlen:
+            self._spill(self.messages[0])
+        self.messages.append({"role": role, "content": content, "ts": time.time()})
+
+    def recent(self, limit):
+        """Return up to the last limit messages, oldest first"""
+        if limit <= 0:
+            return []
+        return list(self.messages)[-limit:]
+
+    def context_messages(self, token_budget):
+        """Return the most recent messages that fit in token_budget, as role/content dicts in order"""
+        selected = []
+        remaining = token_budget
+        for message in reversed(self.messages):
+            cost = estimate_tokens(message["content"])
+            if cost > remaining:
+                break
+            selected.append({"role": message["role"], "content": message["content"]})
+            remaining -= cost
+        # Drop a leading assistant reply whose question didn't fit
+        if selected and selected[-1]["role"] == "assistant":
+            selected.pop()
+        return selected[::-1]
+
+    def clear(self):
+        """Forget every message, including the spilled log"""
+        self.messages.clear()
+        if self.spilled:
+            try:
+                os.remove(self.log_path)
+            except OSError:
+                pass
+            self.spilled = 0
@@ -2,14 +2,249 @@
 # DATA IMPORT MODULE - utils/data_import.py
 # ============================================================================
 import streamlit as st
-import pandas as pd
+import importlib.util
 import json
 import io
 from typing import Dict, Any
 from datetime import datetime
+from config.settings import IMPORT_CHUNK_ROWS
+from utils.progress import mark_section_dirty
+from utils.export_cache import content_hash, get_export_cache
+from utils.matrix_store import CalloutMatrix, get_callout_matrix
+from utils.migrations import migrate_session
+from utils.row_ids import ROW_ID_FIELD, new_row_id
 
-def parse_excel_import(uploaded_file) -> Dict[str, Any]:
-    """Parse uploaded Excel file and return session state data"""
+# Cell text treated as a checked box when importing boolean columns
+TRUE_VALUES = {"true", "x", "yes", "y", "1", "1.0"}
+
+HIERARCHY_CALLOUT_TYPES = [
+    "Normal", "All Hands on Deck", "Fill Shift", "Travel",
+    "Notification", "Notification (No Response)"
+]
+
+EVENT_TYPE_TEXT_FIELDS = [
+    "id", "description", "charged_or_excused", "available_on_inbound",
+    "employee_on_exception", "min_duration", "max_duration"
+]
+
+EVENT_TYPE_FLAG_FIELDS = [
+    "use", "use_in_dropdown", "include_in_override", "release_mobile",
+    "release_auto", "make_unavailable", "place_status"
+]
+
+def _column(df, *names, default=""):
+    """Return the first of names that is a column of df, or a column filled with default"""
+    for name in names:
+        if name in df.columns:
+            return df[name]
+    import pandas as pd
+    return pd.Series([default] * len(df), index=df.index, dtype=object)
+
+def _text_values(df, *names):
+    """Convert a column to a list of strings, with empty cells as ''"""
+    col = _column(df, *names)
+    return col.astype(str).where(col.notna(), "").tolist()
+
+def _flag_values(df, *names, default=False):
+    """Convert a column to a list of booleans, with empty cells as default"""
+    col = _column(df, *names, default=default)
+    flags = col.astype(str).str.strip().str.lower().isin(TRUE_VALUES)
+    return flags.where(col.notna(), default).astype(bool).tolist()
+
+def _marked_values(df, name, mark='x'):
+    """Return a boolean list that is True where the column holds the given mark"""
+    return (_column(df, name).astype(str).str.strip().str.lower() == mark).tolist()
+
+def _records(columns):
+    """Zip converted columns (field name -> list of values) into row dicts, each with a new row id"""
+    names = list(columns) + [ROW_ID_FIELD]
+    return [dict(zip(names, values + (new_row_id(),))) for values in zip(*columns.values())]
+
+def _unflatten_dict(flat_dict, sep='_'):
+    """Convert flattened dictionary back to nested structure"""
+    result = {}
+    for key, value in flat_dict.items():
+        parts = key.split(sep)
+        d = result
+        for part in parts[:-1]:
+            if part not in d:
+                d[part] = {}
+            d = d[part]
+        d[parts[-1]] = value
+    return result
+
+def _setting_values(df, key_column):
+    """Return a {key: str(value)} dict for the rows of a key/value sheet that have a value"""
+    keys = _column(df, key_column).astype(str)
+    values = _column(df, 'Value')
+    filled = values.notna()
+    return dict(zip(keys[filled].tolist(), values[filled].astype(str).tolist()))
+
+def _convert_config_value(value):
+    """Turn 'true'/'false' and digit strings back into booleans and integers"""
+    text = str(value)
+    if text.lower() in ('true', 'false'):
+        return text.lower() == 'true'
+    if text.isdigit():
+        return int(text)
+    return text
+
+def parse_hierarchy_sheet(df, session_data):
+    """Append Location Hierarchy rows to session_data"""
+    codes = zip(*[_text_values(df, f'codes[{i}]', f'code_{i}') for i in range(5)])
+    callout_types = zip(*[_flag_values(df, f'callout_types[{ct}]', ct) for ct in HIERARCHY_CALLOUT_TYPES])
+    entries = _records({
+        "level1": _text_values(df, 'level1'),
+        "level2": _text_values(df, 'level2'),
+        "level3": _text_values(df, 'level3'),
+        "level4": _text_values(df, 'level4'),
+        "timezone": _text_values(df, 'timezone'),
+        "codes": [list(c) for c in codes],
+        "callout_types": [dict(zip(HIERARCHY_CALLOUT_TYPES, flags)) for flags in callout_types],
+        "callout_reasons": _text_values(df, 'callout_reasons')
+    })
+    
+    hierarchy_data = session_data.setdefault('hierarchy_data', {
+        "levels": ["Level 1", "Level 2", "Level 3", "Level 4"],
+        "labels": ["Parent Company", "Business Unit", "Division", "OpCenter"],
+        "entries": [],
+        "timezone": "ET / CT / MT / AZ / PT"
+    })
+    hierarchy_data["entries"].extend(entries)
+
+def parse_job_classifications_sheet(df, session_data):
+    """Append Job Classifications rows to session_data"""
+    ids = zip(*[_text_values(df, f'ID_{i+1}') for i in range(5)])
+    jobs = _records({
+        "type": _text_values(df, 'Type'),
+        "title": _text_values(df, 'Title'),
+        "recording": _text_values(df, 'Recording'),
+        "ids": [list(i) for i in ids]
+    })
+    session_data.setdefault('job_classifications', []).extend(jobs)
+
+def parse_trouble_locations_sheet(df, session_data):
+    """Append Trouble Locations rows to session_data"""
+    locations = _records({
+        "recording_needed": _flag_values(df, 'recording_needed', default=True),
+        "id": _text_values(df, 'id'),
+        "location": _text_values(df, 'location'),
+        "verbiage": _text_values(df, 'verbiage')
+    })
+    session_data.setdefault('trouble_locations', []).extend(locations)
+
+def parse_event_types_sheet(df, session_data):
+    """Append Event Types rows to session_data"""
+    columns = {field: _text_values(df, field) for field in EVENT_TYPE_TEXT_FIELDS}
+    columns.update({field: _flag_values(df, field) for field in EVENT_TYPE_FLAG_FIELDS})
+    session_data.setdefault('event_types', []).extend(_records(columns))
+
+def parse_callout_reasons_sheet(df, session_data):
+    """Collect the reasons marked Use? and the last reason marked Default?"""
+    ids = _column(df, 'ID').astype(str).tolist()
+    used = _marked_values(df, 'Use?')
+    defaults = [reason_id for reason_id, flag in zip(ids, _marked_values(df, 'Default?')) if flag]
+    
+    session_data.setdefault('selected_callout_reasons', []).extend(
+        reason_id for reason_id, flag in zip(ids, used) if flag
+    )
+    if defaults:
+        session_data['default_callout_reason'] = defaults[-1]
+    else:
+        session_data.setdefault('default_callout_reason', "")
+
+def parse_callout_type_config_sheet(df, session_data):
+    """Load the X marks of the CT_* columns into a callout type matrix"""
+    matrix = session_data.setdefault('callout_matrix', CalloutMatrix())
+    locations = _column(df, 'Location').astype(str)
+    for col in df.columns:
+        if str(col).startswith('CT_'):
+            callout_type = col[3:]  # Remove 'CT_' prefix
+            marked = _marked_values(df, col, mark='x')
+            matrix.set_many(locations[marked].tolist(), [callout_type], True)
+
+def parse_global_configuration_sheet(df, session_data):
+    """Load Configuration_Key/Value rows, restoring booleans and integers"""
+    keys = _column(df, 'Configuration_Key').astype(str).tolist()
+    values = _column(df, 'Value')
+    converted = [
+        _convert_config_value(value) if filled else None
+        for value, filled in zip(values.tolist(), values.notna().tolist())
+    ]
+    session_data.setdefault('global_config_answers', {}).update(zip(keys, converted))
+
+def parse_data_interfaces_sheet(df, session_data):
+    """Collect flattened Interface_Setting rows (nested by finish_excel_import)"""
+    session_data.setdefault('data_interfaces', {}).update(_setting_values(df, 'Interface_Setting'))
+
+def parse_additions_sheet(df, session_data):
+    """Collect flattened Addition_Setting rows (nested by finish_excel_import)"""
+    session_data.setdefault('additions', {}).update(_setting_values(df, 'Addition_Setting'))
+
+def parse_other_responses_sheet(df, session_data):
+    """Load Key/Value rows into responses"""
+    session_data.setdefault('responses', {}).update(_setting_values(df, 'Key'))
+
+def finish_excel_import(session_data):
+    """Turn the flattened settings collected from the sheets back into nested dicts"""
+    for key in ('data_interfaces', 'additions'):
+        if key in session_data:
+            session_data[key] = _unflatten_dict(session_data[key])
+    return session_data
+
+# Sheet name -> parser, in the order sheets are applied
+SHEET_PARSERS = {
+    'Location Hierarchy': parse_hierarchy_sheet,
+    'Job Classifications': parse_job_classifications_sheet,
+    'Trouble Locations': parse_trouble_locations_sheet,
+    'Event Types': parse_event_types_sheet,
+    'Callout Reasons': parse_callout_reasons_sheet,
+    'Callout Type Config': parse_callout_type_config_sheet,
+    'Global Configuration': parse_global_configuration_sheet,
+    'Data Interfaces': parse_data_interfaces_sheet,
+    'Additions': parse_additions_sheet,
+    'Other Responses': parse_other_responses_sheet
+}
+
+def iter_sheet_chunks(worksheet, chunk_rows=IMPORT_CHUNK_ROWS):
+    """Yield a read-only worksheet as DataFrames of at most chunk_rows rows.
+    
+    A sheet without data rows yields one empty DataFrame, so its parser still
+    replaces the section (an emptied sheet clears it).
+    """
+    import pandas as pd
+    rows = worksheet.iter_rows(values_only=True)
+    header = next(rows, None)
+    if header is None:
+        yield pd.DataFrame()
+        return
+    
+    columns = [str(c) if c is not None else f"Unnamed: {i}" for i, c in enumerate(header)]
+    width = len(columns)
+    chunk = []
+    yielded = False
+    for row in rows:
+        # Skip blank rows (read-only sheets often report trailing empty rows)
+        if all(v is None for v in row):
+            continue
+        if len(row) != width:
+            row = tuple(row[:width]) + (None,) * (width - len(row))
+        chunk.append(row)
+        if len(chunk) >= chunk_rows:
+            yield pd.DataFrame(chunk, columns=columns)
+            yielded = True
+            chunk = []
+    if chunk or not yielded:
+        yield pd.DataFrame(chunk, columns=columns)
+
+def parse_excel_import(uploaded_file, progress_callback=None) -> Dict[str, Any]:
+    """Parse uploaded Excel file and return session state data.
+    
+    Known sheets are streamed with openpyxl in read-only mode and handed to the
+    sheet parsers in chunks, so the whole workbook is never loaded at once.
+    progress_callback, if given, is called as (rows_done, rows_total, sheet_name);
+    rows_total is an estimate taken from the sheet dimensions.
+    """
     try:
         # Check if openpyxl is available
         try:
@@ -21,223 +256,25 @@ def parse_excel_import(uploaded_file) -> Dict[str, Any]:
             st.markdown("**Alternative:** Export as JSON format instead of Excel for now.")
             return {}
         
-        # Read all sheets from the Excel file
-        excel_data = pd.read_excel(uploaded_file, sheet_name=None, engine='openpyxl')
-        
         session_data = {}
-        
-        # Parse Location Hierarchy
-        if 'Location Hierarchy' in excel_data:
-            df = excel_data['Location Hierarchy']
-            entries = []
-            for _, row in df.iterrows():
-                # Handle codes properly - look for codes columns or list representation
-                codes = ["", "", "", "", ""]
-                for i in range(5):
-                    code_val = row.get(f'codes[{i}]', row.get(f'code_{i}', ''))
-                    if pd.notna(code_val):
-                        codes[i] = str(code_val)
-                
-                # Handle callout_types properly
-                callout_types = {
-                    "Normal": bool(row.get('callout_types[Normal]', row.get('Normal', False))),
-                    "All Hands on Deck": bool(row.get('callout_types[All Hands on Deck]', row.get('All Hands on Deck', False))),
-                    "Fill Shift": bool(row.get('callout_types[Fill Shift]', row.get('Fill Shift', False))),
-                    "Travel": bool(row.get('callout_types[Travel]', row.get('Travel', False))),
-                    "Notification": bool(row.get('callout_types[Notification]', row.get('Notification', False))),
-                    "Notification (No Response)": bool(row.get('callout_types[Notification (No Response)]', row.get('Notification (No Response)', False)))
-                }
-                
-                entry = {
-                    "level1": str(row.get('level1', '')) if pd.notna(row.get('level1')) else '',
-                    "level2": str(row.get('level2', '')) if pd.notna(row.get('level2')) else '',
-                    "level3": str(row.get('level3', '')) if pd.notna(row.get('level3')) else '',
-                    "level4": str(row.get('level4', '')) if pd.notna(row.get('level4')) else '',
-                    "timezone": str(row.get('timezone', '')) if pd.notna(row.get('timezone')) else '',
-                    "codes": codes,
-                    "callout_types": callout_types,
-                    "callout_reasons": str(row.get('callout_reasons', '')) if pd.notna(row.get('callout_reasons')) else ''
-                }
-                entries.append(entry)
-            
-            session_data['hierarchy_data'] = {
-                "levels": ["Level 1", "Level 2", "Level 3", "Level 4"],
-                "labels": ["Parent Company", "Business Unit", "Division", "OpCenter"],
-                "entries": entries,
-                "timezone": "ET / CT / MT / AZ / PT"
-            }
-        
-        # Parse Job Classifications
-        if 'Job Classifications' in excel_data:
-            df = excel_data['Job Classifications']
-            job_classifications = []
-            for _, row in df.iterrows():
-                ids = ["", "", "", "", ""]
-                for i in range(5):
-                    id_val = row.get(f'ID_{i+1}', '')
-                    if pd.notna(id_val):
-                        ids[i] = str(id_val)
-                
-                job = {
-                    "type": str(row.get('Type', '')) if pd.notna(row.get('Type')) else '',
-                    "title": str(row.get('Title', '')) if pd.notna(row.get('Title')) else '',
-                    "recording": str(row.get('Recording', '')) if pd.notna(row.get('Recording')) else '',
-                    "ids": ids
-                }
-                job_classifications.append(job)
-            session_data['job_classifications'] = job_classifications
-        
-        # Parse Trouble Locations
-        if 'Trouble Locations' in excel_data:
-            df = excel_data['Trouble Locations']
-            trouble_locations = []
-            for _, row in df.iterrows():
-                location = {
-                    "recording_needed": bool(row.get('recording_needed', True)),
-                    "id": str(row.get('id', '')) if pd.notna(row.get('id')) else '',
-                    "location": str(row.get('location', '')) if pd.notna(row.get('location')) else '',
-                    "verbiage": str(row.get('verbiage', '')) if pd.notna(row.get('verbiage')) else ''
-                }
-                trouble_locations.append(location)
-            session_data['trouble_locations'] = trouble_locations
-        
-        # Parse Event Types
-        if 'Event Types' in excel_data:
-            df = excel_data['Event Types']
-            event_types = []
-            for _, row in df.iterrows():
-                event = {
-                    "id": str(row.get('id', '')) if pd.notna(row.get('id')) else '',
-                    "description": str(row.get('description', '')) if pd.notna(row.get('description')) else '',
-                    "use": bool(row.get('use', False)),
-                    "use_in_dropdown": bool(row.get('use_in_dropdown', False)),
-                    "include_in_override": bool(row.get('include_in_override', False)),
-                    "charged_or_excused": str(row.get('charged_or_excused', '')) if pd.notna(row.get('charged_or_excused')) else '',
-                    "available_on_inbound": str(row.get('available_on_inbound', '')) if pd.notna(row.get('available_on_inbound')) else '',
-                    "employee_on_exception": str(row.get('employee_on_exception', '')) if pd.notna(row.get('employee_on_exception')) else '',
-                    "release_mobile": bool(row.get('release_mobile', False)),
-                    "release_auto": bool(row.get('release_auto', False)),
-                    "make_unavailable": bool(row.get('make_unavailable', False)),
-                    "place_status": bool(row.get('place_status', False)),
-                    "min_duration": str(row.get('min_duration', '')) if pd.notna(row.get('min_duration')) else '',
-                    "max_duration": str(row.get('max_duration', '')) if pd.notna(row.get('max_duration')) else ''
-                }
-                event_types.append(event)
-            session_data['event_types'] = event_types
-        
-        # Parse Callout Reasons
-        if 'Callout Reasons' in excel_data:
-            df = excel_data['Callout Reasons']
-            selected_reasons = []
-            default_reason = ""
-            for _, row in df.iterrows():
-                if str(row.get('Use?', '')).strip().lower() == 'x':
-                    selected_reasons.append(str(row.get('ID', '')))
-                if str(row.get('Default?', '')).strip().lower() == 'x':
-                    default_reason = str(row.get('ID', ''))
-            session_data['selected_callout_reasons'] = selected_reasons
-            session_data['default_callout_reason'] = default_reason
-        
-        # Parse Callout Type Configuration
-        if 'Callout Type Config' in excel_data:
-            df = excel_data['Callout Type Config']
-            responses = {}
-            for _, row in df.iterrows():
-                location = str(row.get('Location', ''))
-                for col in df.columns:
-                    if col.startswith('CT_'):
-                        callout_type = col[3:]  # Remove 'CT_' prefix
-                        key = f"matrix_{location}_{callout_type}".replace(" ", "_")
-                        responses[key] = (str(row[col]).strip().upper() == 'X')
-            if 'responses' not in session_data:
-                session_data['responses'] = {}
-            session_data['responses'].update(responses)
-        
-        # Parse Global Configuration
-        if 'Global Configuration' in excel_data:
-            df = excel_data['Global Configuration']
-            global_config = {}
-            for _, row in df.iterrows():
-                key = str(row.get('Configuration_Key', ''))
-                value = row.get('Value', '')
-                # Try to convert value to appropriate type
-                if pd.notna(value):
-                    if str(value).lower() in ['true', 'false']:
-                        value = str(value).lower() == 'true'
-                    elif str(value).isdigit():
-                        value = int(value)
-                    else:
-                        value = str(value)
-                global_config[key] = value
-            session_data['global_config_answers'] = global_config
-        
-        # Parse Data Interfaces
-        if 'Data Interfaces' in excel_data:
-            df = excel_data['Data Interfaces']
-            data_interfaces = {}
-            
-            def unflatten_dict(flat_dict, sep='_'):
-                """Convert flattened dictionary back to nested structure"""
-                result = {}
-                for key, value in flat_dict.items():
-                    if pd.notna(value):
-                        parts = key.split(sep)
-                        d = result
-                        for part in parts[:-1]:
-                            if part not in d:
-                                d[part] = {}
-                            d = d[part]
-                        d[parts[-1]] = str(value)
-                return result
-            
-            flat_data = {}
-            for _, row in df.iterrows():
-                key = str(row.get('Interface_Setting', ''))
-                value = row.get('Value', '')
-                if pd.notna(value):
-                    flat_data[key] = value
-            
-            session_data['data_interfaces'] = unflatten_dict(flat_data)
-        
-        # Parse Additions
-        if 'Additions' in excel_data:
-            df = excel_data['Additions']
-            additions = {}
-            
-            def unflatten_dict(flat_dict, sep='_'):
-                result = {}
-                for key, value in flat_dict.items():
-                    if pd.notna(value):
-                        parts = key.split(sep)
-                        d = result
-                        for part in parts[:-1]:
-                            if part not in d:
-                                d[part] = {}
-                            d = d[part]
-                        d[parts[-1]] = str(value)
-                return result
-            
-            flat_data = {}
-            for _, row in df.iterrows():
-                key = str(row.get('Addition_Setting', ''))
-                value = row.get('Value', '')
-                if pd.notna(value):
-                    flat_data[key] = value
+        workbook = openpyxl.load_workbook(uploaded_file, read_only=True, data_only=True)
+        try:
+            # Read only the sheets we know how to parse
+            sheets = [(name, parse_sheet) for name, parse_sheet in SHEET_PARSERS.items()
+                      if name in workbook.sheetnames]
+            rows_total = sum(max((workbook[name].max_row or 1) - 1, 0) for name, _ in sheets)
+            rows_done = 0
             
-            session_data['additions'] = unflatten_dict(flat_data)
-        
-        # Parse Other Responses
-        if 'Other Responses' in excel_data:
-            df = excel_data['Other Responses']
-            if 'responses' not in session_data:
-                session_data['responses'] = {}
-            for _, row in df.iterrows():
-                key = str(row.get('Key', ''))
-                value = row.get('Value', '')
-                if pd.notna(value):
-                    session_data['responses'][key] = str(value)
+            for sheet_name, parse_sheet in sheets:
+                for chunk in iter_sheet_chunks(workbook[sheet_name]):
+                    parse_sheet(chunk, session_data)
+                    rows_done += len(chunk)
+                    if progress_callback:
+                        progress_callback(rows_done, max(rows_total, rows_done), sheet_name)
+        finally:
+            workbook.close()
         
-        return session_data
+        return finish_excel_import(session_data)
         
     except Exception as e:
         st.error(f"Error parsing Excel file: {str(e)}")
@@ -261,6 +298,14 @@ def load_session_data(session_data: Dict[str, Any]):
         # Load each section into session state
         for key, value in session_data.items():
             st.session_state[key] = value
+        # Backups store the matrix as a plain dict, whatever their schema version
+        if 'callout_matrix' in session_data:
+            get_callout_matrix(st.session_state)
+        
+        # Bring the loaded data up to date; files without a schema_version predate it
+        st.session_state.schema_version = session_data.get('schema_version', 0)
+        migrate_session(st.session_state)
+        mark_section_dirty()
         
         st.success("✅ Data loaded successfully! All sections have been restored.")
         return True
@@ -268,40 +313,59 @@ def load_session_data(session_data: Dict[str, Any]):
         st.error(f"Error loading session data: {str(e)}")
         return False
 
+# Session state keys saved in a JSON backup, in file order
+JSON_EXPORT_KEYS = [
+    'schema_version', 'hierarchy_data', 'job_classifications', 'trouble_locations',
+    'event_types', 'selected_callout_reasons', 'default_callout_reason',
+    'responses', 'global_config_answers', 'data_interfaces', 'additions',
+    'callout_types', 'callout_matrix'
+]
+
+def _json_fragment(key, value):
+    """Render one top-level "key": value member exactly as json.dumps(..., indent=2) nests it"""
+    body = json.dumps(value, indent=2, default=str).replace("\n", "\n  ")
+    return f"  {json.dumps(key)}: {body}"
+
 def export_session_to_json():
-    """Export current session state to JSON for backup"""
+    """Export current session state to JSON for backup.
+    
+    Each section is serialized into a cached fragment keyed on its content
+    hash, so only sections that changed since the last export are re-encoded.
+    """
     try:
+        cache = get_export_cache()
+        
         # Collect all relevant session state data
-        export_data = {}
+        sections = []
+        for key in JSON_EXPORT_KEYS:
+            if key in st.session_state:
+                value = st.session_state[key]
+                if key == 'callout_matrix':
+                    value = get_callout_matrix().to_dict()
+                sections.append((key, value, content_hash(value)))
         
-        keys_to_export = [
-            'hierarchy_data', 'job_classifications', 'trouble_locations',
-            'event_types', 'selected_callout_reasons', 'default_callout_reason',
-            'responses', 'global_config_answers', 'data_interfaces', 'additions',
-            'callout_types'
-        ]
+        if not sections:
+            return "{}"
         
-        for key in keys_to_export:
-            if key in st.session_state:
-                export_data[key] = st.session_state[key]
+        def build_json():
+            fragments = [
+                cache.fetch(("json", key), digest, lambda: _json_fragment(key, value))
+                for key, value, digest in sections
+            ]
+            return "{\n" + ",\n".join(fragments) + "\n}"
         
-        # Convert to JSON string
-        json_string = json.dumps(export_data, indent=2, default=str)
-        return json_string
+        return cache.fetch(("json",), content_hash([(key, digest) for key, _, digest in sections]), build_json)
     except Exception as e:
         st.error(f"Error exporting session to JSON: {str(e)}")
         return ""
 
+@st.fragment
 def render_import_export_section():
-    """Render the import/export section in the main app"""
+    """Render the import/export section in the main app; loading a file reruns the whole app"""
     st.markdown("### 📁 Data Import/Export")
     
-    # Check available dependencies
-    try:
-        import openpyxl
-        excel_available = True
-    except ImportError:
-        excel_available = False
+    # Check available dependencies without importing them
+    excel_available = importlib.util.find_spec("openpyxl") is not None
     
     # Show dependency status
     if not excel_available:
@@ -344,7 +408,14 @@ def render_import_export_section():
             if st.button("🔄 Load Data", type="primary"):
                 with st.spinner("Loading data..."):
                     if uploaded_file.name.endswith('.xlsx'):
-                        session_data = parse_excel_import(uploaded_file)
+                        progress_bar = st.progress(0.0)
+                        progress_text = st.empty()
+                        
+                        def show_import_progress(rows_done, rows_total, sheet_name):
+                            progress_bar.progress(min(rows_done / rows_total, 1.0) if rows_total else 1.0)
+                            progress_text.caption(f"Importing {sheet_name}: {rows_done:,} of {rows_total:,} rows")
+                        
+                        session_data = parse_excel_import(uploaded_file, show_import_progress)
                     elif uploaded_file.name.endswith('.json'):
                         session_data = parse_json_import(uploaded_file)
                     else:
@@ -0,0 +1,47 @@
+# ============================================================================
+# EXPORT CACHE
+# ============================================================================
+import hashlib
+import pickle
+import streamlit as st
+
+def content_hash(value):
+    """Return a short digest of a section's content"""
+    try:
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+    except Exception:
+        data = repr(value).encode("utf-8")
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+class ExportCache:
+    """Rendered export payloads, each stored with the content hash it was built from.
+
+    Keys name a payload, e.g. ("json", "hierarchy_data") for one section's JSON
+    fragment or ("xlsx",) for a whole workbook. A payload is rebuilt only when
+    the hash passed in differs from the one it was stored under.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self.hits = 0
+        self.misses = 0
+
+    def fetch(self, key, digest, build):
+        """Return the payload stored under key for digest, calling build() on a miss"""
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == digest:
+            self.hits += 1
+            return entry[1]
+        self.misses += 1
+        payload = build()
+        self._entries[key] = (digest, payload)
+        return payload
+
+    def clear(self):
+        self._entries.clear()
+
+def get_export_cache():
+    """Return this session's export cache, creating it on first use"""
+    if 'export_cache' not in st.session_state:
+        st.session_state.export_cache = ExportCache()
+    return st.session_state.export_cache
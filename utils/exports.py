@@ -5,7 +5,13 @@ import streamlit as st
 import pandas as pd
 import io
 import base64
+import tempfile
 from datetime import datetime
+from config.settings import EXCEL_EXPORT_SPOOL_MAX_BYTES
+from utils.callout_catalog import get_callout_catalog
+from utils.export_cache import content_hash, get_export_cache
+from utils.matrix_store import get_callout_matrix
+from utils.row_ids import ROW_ID_FIELD
 
 def get_csv_data(df: pd.DataFrame) -> str:
     """Return the CSV data (as a string) for a given DataFrame."""
@@ -26,17 +32,21 @@ def get_excel_data(df: pd.DataFrame) -> bytes:
         st.error("❌ Missing dependency: xlsxwriter is required for Excel export")
         return b""
 
+def _records_frame(records):
+    """Return a DataFrame of records without the internal row_id column"""
+    return pd.DataFrame(records).drop(columns=[ROW_ID_FIELD], errors='ignore')
+
 def export_location_hierarchy_to_csv():
     """Export location hierarchy data to CSV"""
     if 'hierarchy_data' in st.session_state:
-        df_export = pd.DataFrame(st.session_state.hierarchy_data["entries"])
+        df_export = _records_frame(st.session_state.hierarchy_data["entries"])
         return get_csv_data(df_export)
     return ""
 
 def export_location_hierarchy_to_excel():
     """Export location hierarchy data to Excel"""
     if 'hierarchy_data' in st.session_state:
-        df_export = pd.DataFrame(st.session_state.hierarchy_data["entries"])
+        df_export = _records_frame(st.session_state.hierarchy_data["entries"])
         return get_excel_data(df_export)
     return b""
 
@@ -79,28 +89,28 @@ def export_job_classifications_to_excel():
 def export_trouble_locations_to_csv():
     """Export trouble locations data to CSV"""
     if 'trouble_locations' in st.session_state:
-        df_export = pd.DataFrame(st.session_state.trouble_locations)
+        df_export = _records_frame(st.session_state.trouble_locations)
         return get_csv_data(df_export)
     return ""
 
 def export_trouble_locations_to_excel():
     """Export trouble locations data to Excel"""
     if 'trouble_locations' in st.session_state:
-        df_export = pd.DataFrame(st.session_state.trouble_locations)
+        df_export = _records_frame(st.session_state.trouble_locations)
         return get_excel_data(df_export)
     return b""
 
 def export_event_types_to_csv():
     """Export event types data to CSV"""
     if 'event_types' in st.session_state:
-        df_export = pd.DataFrame(st.session_state.event_types)
+        df_export = _records_frame(st.session_state.event_types)
         return get_csv_data(df_export)
     return ""
 
 def export_event_types_to_excel():
     """Export event types data to Excel"""
     if 'event_types' in st.session_state:
-        df_export = pd.DataFrame(st.session_state.event_types)
+        df_export = _records_frame(st.session_state.event_types)
         return get_excel_data(df_export)
     return b""
 
@@ -108,10 +118,8 @@ def export_callout_reasons_to_csv():
     """Export callout reasons data to CSV"""
     if 'selected_callout_reasons' in st.session_state:
         # Get the actual callout reasons data
-        from utils.session import load_callout_reasons
         try:
-            callout_reasons = load_callout_reasons()
-            selected_reasons = [r for r in callout_reasons if r["ID"] in st.session_state.selected_callout_reasons]
+            selected_reasons = get_callout_catalog().select(st.session_state.selected_callout_reasons)
             df_export = pd.DataFrame(selected_reasons)
             return get_csv_data(df_export)
         except:
@@ -121,20 +129,20 @@ def export_callout_reasons_to_csv():
 def export_callout_reasons_to_excel():
     """Export callout reasons data to Excel"""
     if 'selected_callout_reasons' in st.session_state:
-        from utils.session import load_callout_reasons
         try:
-            callout_reasons = load_callout_reasons()
-            selected_reasons = [r for r in callout_reasons if r["ID"] in st.session_state.selected_callout_reasons]
+            selected_reasons = get_callout_catalog().select(st.session_state.selected_callout_reasons)
             df_export = pd.DataFrame(selected_reasons)
             return get_excel_data(df_export)
         except:
             pass
     return b""
 
-def export_callout_type_configuration_to_csv():
-    """Export callout type configuration (matrix) data to CSV"""
+def build_callout_matrix_rows():
+    """Build one export row per Level 4 location with an X for each assigned callout type"""
     data = []
-    if 'hierarchy_data' in st.session_state and 'responses' in st.session_state:
+    if 'hierarchy_data' in st.session_state:
+        matrix = get_callout_matrix()
+        callout_types = st.session_state.get('callout_types', [])
         for entry in st.session_state.hierarchy_data["entries"]:
             if entry["level4"]:
                 row = {
@@ -143,12 +151,15 @@ def export_callout_type_configuration_to_csv():
                 }
                 
                 # Add callout types
-                if 'callout_types' in st.session_state:
-                    for ct in st.session_state.callout_types:
-                        key = f"matrix_{entry['level4']}_{ct}".replace(" ", "_")
-                        row[f"CT_{ct}"] = "X" if st.session_state.responses.get(key, False) else ""
+                for ct, assigned in zip(callout_types, matrix.row(entry["level4"], callout_types)):
+                    row[f"CT_{ct}"] = "X" if assigned else ""
                 
                 data.append(row)
+    return data
+
+def export_callout_type_configuration_to_csv():
+    """Export callout type configuration (matrix) data to CSV"""
+    data = build_callout_matrix_rows()
     
     if data:
         df_export = pd.DataFrame(data)
@@ -175,18 +186,6 @@ def export_data_interfaces_to_csv():
     if 'data_interfaces' in st.session_state:
         data = []
         
-        def flatten_dict(d, parent_key='', sep='_'):
-            items = []
-            for k, v in d.items():
-                new_key = f"{parent_key}{sep}{k}" if parent_key else k
-                if isinstance(v, dict):
-                    items.extend(flatten_dict(v, new_key, sep=sep).items())
-                elif isinstance(v, list):
-                    items.append((new_key, ', '.join(map(str, v))))
-                else:
-                    items.append((new_key, v))
-            return dict(items)
-        
         flat_data = flatten_dict(st.session_state.data_interfaces)
         for key, value in flat_data.items():
             data.append({
@@ -204,18 +203,6 @@ def export_additions_to_csv():
     if 'additions' in st.session_state:
         data = []
         
-        def flatten_dict(d, parent_key='', sep='_'):
-            items = []
-            for k, v in d.items():
-                new_key = f"{parent_key}{sep}{k}" if parent_key else k
-                if isinstance(v, dict):
-                    items.extend(flatten_dict(v, new_key, sep=sep).items())
-                elif isinstance(v, list):
-                    items.append((new_key, ', '.join(map(str, v))))
-                else:
-                    items.append((new_key, v))
-            return dict(items)
-        
         flat_data = flatten_dict(st.session_state.additions)
         for key, value in flat_data.items():
             data.append({
@@ -228,43 +215,181 @@ def export_additions_to_csv():
             return get_csv_data(df_export)
     return ""
 
+def _hierarchy_csv_frame(entries):
+    locations_df = _records_frame(entries)
+    locations_df['Section'] = 'Location Hierarchy'
+    return locations_df
+
+def _job_classifications_csv_frame(jobs):
+    jobs_data = []
+    for job in jobs:
+        row = {
+            "Section": "Job Classifications",
+            "Type": job["type"],
+            "Title": job["title"],
+            "Recording": job["recording"]
+        }
+        for i, id_val in enumerate(job["ids"]):
+            row[f"ID_{i+1}"] = id_val
+        jobs_data.append(row)
+    return pd.DataFrame(jobs_data)
+
 def export_all_data_to_csv():
-    """Export all configuration data to a single CSV file"""
-    all_sections = []
+    """Export all configuration data to a single CSV file.
+    
+    Each section's frame and the combined CSV text are cached under the
+    sections' content hashes.
+    """
+    cache = get_export_cache()
+    sections = []
     
     # Section 1: Location Hierarchy
     if 'hierarchy_data' in st.session_state and st.session_state.hierarchy_data["entries"]:
-        locations_df = pd.DataFrame(st.session_state.hierarchy_data["entries"])
-        locations_df['Section'] = 'Location Hierarchy'
-        all_sections.append(locations_df)
+        sections.append(("Location Hierarchy", st.session_state.hierarchy_data["entries"], _hierarchy_csv_frame))
     
     # Section 2: Job Classifications
-    if 'job_classifications' in st.session_state:
-        jobs_data = []
-        for job in st.session_state.job_classifications:
-            row = {
-                "Section": "Job Classifications",
-                "Type": job["type"],
-                "Title": job["title"],
-                "Recording": job["recording"]
-            }
-            for i, id_val in enumerate(job["ids"]):
-                row[f"ID_{i+1}"] = id_val
-            jobs_data.append(row)
-        
-        if jobs_data:
-            jobs_df = pd.DataFrame(jobs_data)
-            all_sections.append(jobs_df)
+    if 'job_classifications' in st.session_state and st.session_state.job_classifications:
+        sections.append(("Job Classifications", st.session_state.job_classifications, _job_classifications_csv_frame))
     
     # Continue with other sections...
-    if all_sections:
+    if not sections:
+        return ""
+    
+    digests = [(name, content_hash(content)) for name, content, _ in sections]
+    
+    def build_csv():
+        all_sections = [
+            cache.fetch(("csv", name), digest, lambda: build_frame(content))
+            for (name, content, build_frame), (_, digest) in zip(sections, digests)
+        ]
         combined_df = pd.concat(all_sections, ignore_index=True, sort=False)
         return get_csv_data(combined_df)
     
-    return ""
+    return cache.fetch(("csv",), content_hash(digests), build_csv)
+
+def flatten_dict(d, parent_key='', sep='_'):
+    """Flatten nested settings into sep-joined keys, joining list values with commas"""
+    items = []
+    for k, v in d.items():
+        new_key = f"{parent_key}{sep}{k}" if parent_key else k
+        if isinstance(v, dict):
+            items.extend(flatten_dict(v, new_key, sep=sep).items())
+        elif isinstance(v, list):
+            items.append((new_key, ', '.join(map(str, v))))
+        else:
+            items.append((new_key, v))
+    return dict(items)
+
+def _record_rows(records):
+    """Return the column union (in first-seen order, without row_id) and a row generator for a list of dicts"""
+    columns = [key for key in dict.fromkeys(key for record in records for key in record) if key != ROW_ID_FIELD]
+    return columns, ([record.get(c) for c in columns] for record in records)
+
+def _job_classification_rows(jobs):
+    """Return columns and rows for job classifications with one column per ID"""
+    id_count = max((len(job["ids"]) for job in jobs), default=0)
+    columns = ["Type", "Title", "Recording"] + [f"ID_{i+1}" for i in range(id_count)]
+    return columns, ([job["type"], job["title"], job["recording"]] + list(job["ids"]) for job in jobs)
+
+def _setting_rows(settings, key_header):
+    """Return columns and rows for a flattened settings dict"""
+    flat_data = flatten_dict(settings)
+    return [key_header, "Value"], ([key, str(value)] for key, value in flat_data.items())
+
+def _state_value(state, key):
+    """Return a session state value, treating missing or empty values as None"""
+    return state[key] if key in state and state[key] else None
 
-def export_all_data_to_excel():
-    """Export all configuration data to a single Excel file with multiple sheets"""
+def _hierarchy_content(state):
+    return state.hierarchy_data["entries"] or None if 'hierarchy_data' in state else None
+
+def _callout_reasons_content(state):
+    if 'selected_callout_reasons' not in state:
+        return None
+    # The catalog file can change underneath the selection
+    return (list(state.selected_callout_reasons), get_callout_catalog().mtime)
+
+def _callout_matrix_content(state):
+    if 'hierarchy_data' not in state:
+        return None
+    return (state.hierarchy_data["entries"], state.get('callout_types', []), get_callout_matrix().to_dict())
+
+def _callout_reason_rows(content):
+    try:
+        selected_reasons = get_callout_catalog().select(content[0])
+    except Exception:
+        selected_reasons = []
+    return _record_rows(selected_reasons) if selected_reasons else None
+
+def _callout_matrix_rows(content):
+    matrix_rows = build_callout_matrix_rows()
+    return _record_rows(matrix_rows) if matrix_rows else None
+
+def _global_config_rows(answers):
+    return ["Configuration_Key", "Value"], ([key, str(value)] for key, value in answers.items())
+
+def _optional_setting_rows(key_header):
+    return lambda settings: _setting_rows(settings, key_header) if flatten_dict(settings) else None
+
+# (sheet name, content of the section in session state, rows built from that content), in workbook order
+EXCEL_SHEETS = [
+    ('Location Hierarchy', _hierarchy_content, _record_rows),
+    ('Job Classifications', lambda state: _state_value(state, 'job_classifications'), _job_classification_rows),
+    ('Trouble Locations', lambda state: _state_value(state, 'trouble_locations'), _record_rows),
+    ('Event Types', lambda state: _state_value(state, 'event_types'), _record_rows),
+    ('Callout Reasons', _callout_reasons_content, _callout_reason_rows),
+    ('Callout Type Config', _callout_matrix_content, _callout_matrix_rows),
+    ('Global Configuration', lambda state: _state_value(state, 'global_config_answers'), _global_config_rows),
+    ('Data Interfaces', lambda state: state.get('data_interfaces'), _optional_setting_rows("Interface_Setting")),
+    ('Additions', lambda state: state.get('additions'), _optional_setting_rows("Addition_Setting")),
+    ('Other Responses', lambda state: _state_value(state, 'responses'),
+     lambda responses: (["Key", "Value"], ([k, v] for k, v in responses.items())))
+]
+
+def collect_excel_sections():
+    """Return (sheet_name, content, digest, rows_fn) for every section present in session state"""
+    sections = []
+    for sheet_name, content_fn, rows_fn in EXCEL_SHEETS:
+        content = content_fn(st.session_state)
+        if content is not None:
+            sections.append((sheet_name, content, content_hash(content), rows_fn))
+    return sections
+
+def iter_excel_sheets(sections):
+    """Yield (sheet_name, columns, rows) for every section with data, in workbook order.
+    
+    rows is the generator from the section's rows function, so each sheet is
+    streamed into the workbook without being collected first.
+    """
+    for sheet_name, content, _, rows_fn in sections:
+        sheet = rows_fn(content)
+        if sheet is not None:
+            yield (sheet_name,) + tuple(sheet)
+
+def _write_excel_cell(worksheet, row, col, value):
+    """Write one value with the matching xlsxwriter type; blanks are skipped"""
+    if value is None:
+        return
+    if isinstance(value, bool):
+        worksheet.write_boolean(row, col, value)
+    elif isinstance(value, (int, float)):
+        if value == value:  # Skip NaN
+            worksheet.write_number(row, col, value)
+    elif isinstance(value, str):
+        if value:
+            worksheet.write_string(row, col, value)
+    else:
+        # Lists and dicts (e.g. hierarchy codes) are written as their text form
+        worksheet.write_string(row, col, str(value))
+
+def export_all_data_to_excel(spool_to_disk=True):
+    """Export all configuration data to a single Excel file with multiple sheets.
+    
+    Rows are streamed from session state into xlsxwriter in constant_memory
+    mode. With spool_to_disk the workbook is assembled in a temporary file that
+    only stays in RAM below EXCEL_EXPORT_SPOOL_MAX_BYTES. Only the finished
+    bytes are cached, until a section's content changes.
+    """
     try:
         # Check if required dependencies are available
         import xlsxwriter
@@ -273,150 +398,35 @@ def export_all_data_to_excel():
         st.info("📋 **Solution**: `pip install xlsxwriter` or use JSON export instead")
         return b""
     
-    output = io.BytesIO()
+    cache = get_export_cache()
+    sections = collect_excel_sections()
+    digest = content_hash([(name, section_digest) for name, _, section_digest, _ in sections])
     
     try:
-        with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
-            # Export location hierarchy
-            if 'hierarchy_data' in st.session_state and st.session_state.hierarchy_data["entries"]:
-                locations_df = pd.DataFrame(st.session_state.hierarchy_data["entries"])
-                locations_df.to_excel(writer, sheet_name='Location Hierarchy', index=False)
-            
-            # Export job classifications
-            if 'job_classifications' in st.session_state:
-                jobs_data = []
-                for job in st.session_state.job_classifications:
-                    row = {
-                        "Type": job["type"],
-                        "Title": job["title"],
-                        "Recording": job["recording"]
-                    }
-                    for i, id_val in enumerate(job["ids"]):
-                        row[f"ID_{i+1}"] = id_val
-                    jobs_data.append(row)
-                
-                if jobs_data:
-                    jobs_df = pd.DataFrame(jobs_data)
-                    jobs_df.to_excel(writer, sheet_name='Job Classifications', index=False)
-            
-            # Export trouble locations
-            if 'trouble_locations' in st.session_state and st.session_state.trouble_locations:
-                trouble_df = pd.DataFrame(st.session_state.trouble_locations)
-                trouble_df.to_excel(writer, sheet_name='Trouble Locations', index=False)
-            
-            # Export event types
-            if 'event_types' in st.session_state and st.session_state.event_types:
-                events_df = pd.DataFrame(st.session_state.event_types)
-                events_df.to_excel(writer, sheet_name='Event Types', index=False)
-            
-            # Export callout reasons
-            if 'selected_callout_reasons' in st.session_state:
-                from utils.session import load_callout_reasons
-                try:
-                    callout_reasons = load_callout_reasons()
-                    selected_reasons = [r for r in callout_reasons if r["ID"] in st.session_state.selected_callout_reasons]
-                    if selected_reasons:
-                        reasons_df = pd.DataFrame(selected_reasons)
-                        reasons_df.to_excel(writer, sheet_name='Callout Reasons', index=False)
-                except:
-                    pass
-            
-            # Export callout type configuration (matrix)
-            matrix_data = []
-            if 'hierarchy_data' in st.session_state and 'responses' in st.session_state:
-                for entry in st.session_state.hierarchy_data["entries"]:
-                    if entry["level4"]:
-                        row = {
-                            "Location": entry["level4"],
-                            "Full_Path": f"{entry.get('level1', '')} > {entry.get('level2', '')} > {entry.get('level3', '')} > {entry['level4']}"
-                        }
-                        
-                        # Add callout types
-                        if 'callout_types' in st.session_state:
-                            for ct in st.session_state.callout_types:
-                                key = f"matrix_{entry['level4']}_{ct}".replace(" ", "_")
-                                row[f"CT_{ct}"] = "X" if st.session_state.responses.get(key, False) else ""
-                        
-                        matrix_data.append(row)
-            
-            if matrix_data:
-                matrix_df = pd.DataFrame(matrix_data)
-                matrix_df.to_excel(writer, sheet_name='Callout Type Config', index=False)
-            
-            # Export global configuration
-            if 'global_config_answers' in st.session_state and st.session_state.global_config_answers:
-                config_data = []
-                for key, value in st.session_state.global_config_answers.items():
-                    config_data.append({
-                        "Configuration_Key": key,
-                        "Value": str(value)
-                    })
-                
-                if config_data:
-                    config_df = pd.DataFrame(config_data)
-                    config_df.to_excel(writer, sheet_name='Global Configuration', index=False)
-            
-            # Export data interfaces
-            if 'data_interfaces' in st.session_state:
-                def flatten_dict(d, parent_key='', sep='_'):
-                    items = []
-                    for k, v in d.items():
-                        new_key = f"{parent_key}{sep}{k}" if parent_key else k
-                        if isinstance(v, dict):
-                            items.extend(flatten_dict(v, new_key, sep=sep).items())
-                        elif isinstance(v, list):
-                            items.append((new_key, ', '.join(map(str, v))))
-                        else:
-                            items.append((new_key, v))
-                    return dict(items)
-                
-                flat_data = flatten_dict(st.session_state.data_interfaces)
-                interface_data = []
-                for key, value in flat_data.items():
-                    interface_data.append({
-                        "Interface_Setting": key,
-                        "Value": str(value)
-                    })
-                
-                if interface_data:
-                    interface_df = pd.DataFrame(interface_data)
-                    interface_df.to_excel(writer, sheet_name='Data Interfaces', index=False)
-            
-            # Export additions
-            if 'additions' in st.session_state:
-                def flatten_dict(d, parent_key='', sep='_'):
-                    items = []
-                    for k, v in d.items():
-                        new_key = f"{parent_key}{sep}{k}" if parent_key else k
-                        if isinstance(v, dict):
-                            items.extend(flatten_dict(v, new_key, sep=sep).items())
-                        elif isinstance(v, list):
-                            items.append((new_key, ', '.join(map(str, v))))
-                        else:
-                            items.append((new_key, v))
-                    return dict(items)
-                
-                flat_data = flatten_dict(st.session_state.additions)
-                additions_data = []
-                for key, value in flat_data.items():
-                    additions_data.append({
-                        "Addition_Setting": key,
-                        "Value": str(value)
-                    })
-                
-                if additions_data:
-                    additions_df = pd.DataFrame(additions_data)
-                    additions_df.to_excel(writer, sheet_name='Additions', index=False)
-            
-            # Export generic responses (other form data)
-            if 'responses' in st.session_state and st.session_state.responses:
-                responses_data = [{"Key": k, "Value": v} for k, v in st.session_state.responses.items()]
-                responses_df = pd.DataFrame(responses_data)
-                responses_df.to_excel(writer, sheet_name='Other Responses', index=False)
-        
-        output.seek(0)
-        return output.getvalue()
-    
+        return cache.fetch(("xlsx",), digest,
+                           lambda: _write_workbook(xlsxwriter, iter_excel_sheets(sections), spool_to_disk))
     except Exception as e:
         st.error(f"Error creating Excel file: {str(e)}")
-        return b""
\ No newline at end of file
+        return b""
+
+def _write_workbook(xlsxwriter, sheets, spool_to_disk):
+    """Write (sheet_name, columns, rows) sheets to a workbook and return its bytes"""
+    if spool_to_disk:
+        output = tempfile.SpooledTemporaryFile(max_size=EXCEL_EXPORT_SPOOL_MAX_BYTES)
+    else:
+        output = io.BytesIO()
+    
+    with output:
+        workbook = xlsxwriter.Workbook(output, {'constant_memory': True})
+        header_format = workbook.add_format({'bold': True})
+        
+        for sheet_name, columns, rows in sheets:
+            worksheet = workbook.add_worksheet(sheet_name)
+            worksheet.write_row(0, 0, columns, header_format)
+            for row_idx, values in enumerate(rows, start=1):
+                for col_idx, value in enumerate(values):
+                    _write_excel_cell(worksheet, row_idx, col_idx, value)
+        
+        workbook.close()
+        output.seek(0)
+        return output.read()
@@ -0,0 +1,49 @@
+# ============================================================================
+# IMMUTABLE SHARED DATA
+# ============================================================================
+# Default templates are shared by every session. They are frozen so a
+# session can hold a reference to them until it writes, and thawed into a
+# private copy only for the section being edited.
+
+def _read_only(self, *args, **kwargs):
+    raise TypeError(f"{type(self).__name__} is read-only; thaw() it before writing")
+
+class FrozenDict(dict):
+    """dict that refuses to be modified"""
+    __slots__ = ()
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def __reduce__(self):
+        return (type(self), (dict(self),))
+
+class FrozenList(list):
+    """list that refuses to be modified"""
+    __slots__ = ()
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _read_only
+    append = extend = insert = pop = remove = clear = sort = reverse = _read_only
+
+    def __reduce__(self):
+        return (type(self), (list(self),))
+
+def is_frozen(value):
+    """Return True if value is a FrozenDict or FrozenList"""
+    return isinstance(value, (FrozenDict, FrozenList))
+
+def freeze(value):
+    """Return a deeply immutable version of value, reusing parts that are already frozen"""
+    if is_frozen(value):
+        return value
+    if isinstance(value, dict):
+        return FrozenDict((k, freeze(v)) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return FrozenList(freeze(v) for v in value)
+    return value
+
+def thaw(value):
+    """Return a mutable deep copy of value's frozen containers; anything else is returned as is"""
+    if isinstance(value, FrozenDict):
+        return {k: thaw(v) for k, v in value.items()}
+    if isinstance(value, FrozenList):
+        return [thaw(v) for v in value]
+    return value
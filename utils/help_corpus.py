@@ -0,0 +1,196 @@
+# ============================================================================
+# PRE-GENERATED HELP CORPUS
+# ============================================================================
+# Answers to the per-field help prompts from data/sig_descriptions.json and
+# the tab help topics in HELP_TOPICS, generated ahead of time so help buttons
+# don't wait on the API. A corpus generated from a different descriptions
+# file is ignored.
+#
+# Regenerate with:
+#     python -m utils.help_corpus [--workers N] [--refresh]
+import argparse
+import hashlib
+import json
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from config.constants import OPENAI_MODEL, HELP_TOPICS
+from config.settings import SIG_DESCRIPTIONS_PATH, HELP_CORPUS_PATH, AI_MAX_CONCURRENT_REQUESTS
+from utils.response_cache import response_cache_key
+
+# Bump when the file layout or the prompt wording changes
+HELP_CORPUS_VERSION = 2
+
+SYSTEM_PREAMBLE = "You are a helpful expert on ARCOS system implementation. "
+
+def build_system_content(context=""):
+    """Return the system message sent with every assistant request"""
+    return SYSTEM_PREAMBLE + context
+
+def field_help_prompt(tab_name, field_name):
+    """Return the help prompt for one field of a SIG tab"""
+    return (f"Explain in detail what information is needed for the '{field_name}' section in the '{tab_name}' "
+            f"tab of the ARCOS System Implementation Guide. Include examples, best practices, and common configurations.")
+
+def topic_help_prompt(tab_name, topic):
+    """Return the prompt sent by a tab's help button for one topic"""
+    return (f"Explain in detail what I need to know about {topic} when configuring the {tab_name} tab in ARCOS. "
+            f"Include examples and best practices.")
+
+def help_corpus_key(prompt, context=""):
+    """Return the corpus key of a prompt, the same key the response cache uses"""
+    return response_cache_key(OPENAI_MODEL, build_system_content(context), prompt)
+
+class HelpCorpus:
+    """Pre-generated answers keyed by help_corpus_key"""
+
+    def __init__(self, answers=None, mtime=None):
+        self.answers = answers or {}
+        self.mtime = mtime
+
+    def __len__(self):
+        return len(self.answers)
+
+    def get(self, key):
+        """Return the stored answer for key, or None"""
+        entry = self.answers.get(key)
+        return entry["answer"] if entry else None
+
+_corpus = None
+_corpus_lock = threading.Lock()
+
+def _file_mtime(path):
+    try:
+        return os.path.getmtime(path)
+    except OSError:
+        return None
+
+def _read_corpus_file(path, descriptions_path=None):
+    """Return the answers stored in a corpus file, or {} if it is missing or from another version/model.
+    
+    With descriptions_path, a corpus generated from a different version of
+    that file is ignored with a warning.
+    """
+    try:
+        with open(path, 'r') as file:
+            data = json.load(file)
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        print(f"Warning: help corpus unreadable - {str(e)}")
+        return {}
+    if data.get("version") != HELP_CORPUS_VERSION or data.get("model") != OPENAI_MODEL:
+        return {}
+    if descriptions_path is not None and data.get("source_sha256") != _file_hash(descriptions_path):
+        print(f"Warning: help corpus {path} was generated from a different {descriptions_path} - ignored, "
+              f"regenerate it with `python -m utils.help_corpus`")
+        return {}
+    return data.get("answers", {})
+
+def get_help_corpus(path=HELP_CORPUS_PATH, descriptions_path=SIG_DESCRIPTIONS_PATH):
+    """Return the process-wide help corpus, reloading it only when the file changes"""
+    global _corpus
+    mtime = _file_mtime(path)
+    corpus = _corpus
+    if corpus is not None and corpus.mtime == mtime:
+        return corpus
+
+    with _corpus_lock:
+        if _corpus is None or _corpus.mtime != mtime:
+            _corpus = HelpCorpus(_read_corpus_file(path, descriptions_path) if mtime is not None else {}, mtime)
+        return _corpus
+
+def lookup_help_answer(prompt, context=""):
+    """Return the pre-generated answer to prompt, or None on a miss"""
+    return get_help_corpus().get(help_corpus_key(prompt, context))
+
+def _file_hash(path):
+    try:
+        with open(path, 'rb') as file:
+            return hashlib.sha256(file.read()).hexdigest()
+    except OSError:
+        return None
+
+def iter_help_prompts(descriptions):
+    """Yield (tab_name, field_or_topic, prompt) for every SIG field and every tab help topic"""
+    for tab_name, tab_desc in descriptions.items():
+        for field_name in tab_desc.get("fields", {}):
+            yield tab_name, field_name, field_help_prompt(tab_name, field_name)
+    for tab_name, topics in HELP_TOPICS.items():
+        for topic in topics:
+            yield tab_name, topic, topic_help_prompt(tab_name, topic)
+
+def generate_help_corpus(descriptions_path=SIG_DESCRIPTIONS_PATH, output_path=HELP_CORPUS_PATH,
+                         workers=AI_MAX_CONCURRENT_REQUESTS, refresh=False):
+    """Generate answers for every field prompt concurrently and write the corpus file.
+
+    Answers already in the file are kept unless refresh is set. Returns the
+    number of prompts that failed.
+    """
+    # Imported here: the assistant module itself looks answers up in this corpus
+    from utils.ai_assistant import build_grounded_system_content, get_client, request_completion
+    from utils.rate_limiter import get_openai_gate
+
+    if getattr(get_client(), "is_placeholder", False):
+        raise RuntimeError("OPENAI_API_KEY is not configured; refusing to store placeholder answers")
+
+    with open(descriptions_path, 'r') as file:
+        descriptions = json.load(file)
+
+    answers = {} if refresh else _read_corpus_file(output_path, descriptions_path)
+    pending = [(tab, field, prompt) for tab, field, prompt in iter_help_prompts(descriptions)
+               if help_corpus_key(prompt) not in answers]
+    print(f"{len(answers)} answers kept, {len(pending)} to generate with {workers} workers")
+
+    # A batch run waits its turn under the rate limit instead of giving up
+    get_openai_gate().queue_timeout = None
+
+    failures = 0
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(request_completion, build_grounded_system_content(prompt), prompt): (tab, field, prompt)
+                   for tab, field, prompt in pending}
+        for done, future in enumerate(as_completed(futures), start=1):
+            tab, field, prompt = futures[future]
+            try:
+                answers[help_corpus_key(prompt)] = {
+                    "tab": tab, "field": field, "prompt": prompt, "answer": future.result()
+                }
+                print(f"[{done}/{len(pending)}] {tab} / {field}")
+            except Exception as e:
+                failures += 1
+                print(f"[{done}/{len(pending)}] FAILED {tab} / {field}: {str(e)}")
+
+    corpus = {
+        "version": HELP_CORPUS_VERSION,
+        "model": OPENAI_MODEL,
+        "source_sha256": _file_hash(descriptions_path),
+        "generated_at": datetime.now().isoformat(timespec="seconds"),
+        "answers": answers
+    }
+    # Write to a temporary file first so running sessions never read a partial corpus
+    tmp_path = f"{output_path}.tmp"
+    with open(tmp_path, 'w') as file:
+        json.dump(corpus, file, indent=2)
+    os.replace(tmp_path, output_path)
+    print(f"Wrote {len(answers)} answers to {output_path}")
+    return failures
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pre-generate help answers for every SIG field.")
+    parser.add_argument("--descriptions", default=SIG_DESCRIPTIONS_PATH, help="SIG descriptions JSON file")
+    parser.add_argument("--output", default=HELP_CORPUS_PATH, help="help corpus file to write")
+    parser.add_argument("--workers", type=int, default=AI_MAX_CONCURRENT_REQUESTS, help="concurrent API calls")
+    parser.add_argument("--refresh", action="store_true", help="regenerate answers already in the corpus")
+    args = parser.parse_args(argv)
+
+    try:
+        failures = generate_help_corpus(args.descriptions, args.output, args.workers, args.refresh)
+    except RuntimeError as e:
+        print(f"Error: {str(e)}")
+        return 1
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,253 @@
+# ============================================================================
+# LOCATION HIERARCHY INDEX
+# ============================================================================
+# A tree of the hierarchy entries with name and code lookups, kept up to date
+# entry by entry instead of being rebuilt from the flat list on every rerun.
+from collections import Counter, defaultdict
+import streamlit as st
+from utils.row_ids import ROW_ID_FIELD
+
+LEVEL_FIELDS = ("level1", "level2", "level3", "level4")
+
+def entry_levels(entry):
+    """Return all four level names of the entry, blanks included"""
+    return tuple(entry.get(field, "") for field in LEVEL_FIELDS)
+
+def entry_path(entry):
+    """Return the entry's level names down to the first blank level"""
+    path = []
+    for field in LEVEL_FIELDS:
+        name = entry.get(field, "")
+        if not name:
+            break
+        path.append(name)
+    return tuple(path)
+
+def entry_codes(entry):
+    """Return the entry's non-blank location codes"""
+    return tuple(code for code in entry.get("codes", []) if code)
+
+class HierarchyNode:
+    """One location at one level; row_ids are the entries whose path runs through it"""
+    __slots__ = ("level", "name", "parent", "children", "row_ids")
+
+    def __init__(self, level, name, parent):
+        self.level = level
+        self.name = name
+        self.parent = parent
+        self.children = {}
+        self.row_ids = {}
+
+    @property
+    def path(self):
+        """Return the level names from the top of the tree down to this node"""
+        names = []
+        node = self
+        while node.parent is not None:
+            names.append(node.name)
+            node = node.parent
+        return tuple(reversed(names))
+
+class HierarchyIndex:
+    """Tree, name and code index over a list of hierarchy entries.
+
+    Names are owned by a node on levels 1-3 (entries under the same parent
+    share it) and by the entry itself on Level 4, so a name with more than one
+    owner, or a code on more than one entry, is a duplicate.
+    """
+
+    def __init__(self, entries):
+        self.entries = entries
+        self.root = HierarchyNode(0, "", None)
+        self.rows = {}
+        self._indexed = {}
+        self.name_owners = defaultdict(Counter)
+        self.code_rows = defaultdict(Counter)
+        self.duplicate_names = set()
+        self.duplicate_codes = set()
+        self.changed = set()
+        for entry in entries:
+            self.add(entry)
+
+    def _owner_keys(self, row_id, path):
+        # Levels 1-3 are owned by their node, Level 4 by the entry
+        for depth, name in enumerate(path, start=1):
+            yield name, (path[:depth] if depth < len(LEVEL_FIELDS) else ("#", row_id))
+
+    def _add_name(self, name, owner):
+        owners = self.name_owners[name]
+        owners[owner] += 1
+        if len(owners) > 1:
+            self.duplicate_names.add(name)
+
+    def _remove_name(self, name, owner):
+        owners = self.name_owners[name]
+        owners[owner] -= 1
+        if owners[owner] <= 0:
+            del owners[owner]
+        if len(owners) <= 1:
+            self.duplicate_names.discard(name)
+        if not owners:
+            del self.name_owners[name]
+
+    def _add_code(self, code, row_id):
+        rows = self.code_rows[code]
+        rows[row_id] += 1
+        if sum(rows.values()) > 1:
+            self.duplicate_codes.add(code)
+
+    def _remove_code(self, code, row_id):
+        rows = self.code_rows[code]
+        rows[row_id] -= 1
+        if rows[row_id] <= 0:
+            del rows[row_id]
+        if sum(rows.values()) <= 1:
+            self.duplicate_codes.discard(code)
+        if not rows:
+            del self.code_rows[code]
+
+    def add(self, entry):
+        """Index a new entry (or re-index one that is already known)"""
+        row_id = entry[ROW_ID_FIELD]
+        if row_id in self.rows:
+            return self.update(entry)
+
+        levels, codes = entry_levels(entry), entry_codes(entry)
+        path = entry_path(entry)
+        self.rows[row_id] = entry
+        self._indexed[row_id] = (levels, codes)
+        self.changed.add(row_id)
+
+        node = self.root
+        for depth, name in enumerate(path, start=1):
+            child = node.children.get(name)
+            if child is None:
+                child = node.children[name] = HierarchyNode(depth, name, node)
+            child.row_ids[row_id] = None
+            node = child
+        for name, owner in self._owner_keys(row_id, path):
+            self._add_name(name, owner)
+        for code in codes:
+            self._add_code(code, row_id)
+        return True
+
+    def remove(self, row_id):
+        """Drop an entry from the index; return False if it wasn't indexed"""
+        if row_id not in self.rows:
+            return False
+        del self.rows[row_id]
+        levels, codes = self._indexed.pop(row_id)
+        path = entry_path(dict(zip(LEVEL_FIELDS, levels)))
+        self.changed.add(row_id)
+
+        node = self.root
+        for name in path:
+            child = node.children[name]
+            child.row_ids.pop(row_id, None)
+            if not child.row_ids:
+                del node.children[name]
+            node = child
+        for name, owner in self._owner_keys(row_id, path):
+            self._remove_name(name, owner)
+        for code in codes:
+            self._remove_code(code, row_id)
+        return True
+
+    def update(self, entry):
+        """Re-index an entry whose level names or codes changed; return True if anything moved"""
+        row_id = entry[ROW_ID_FIELD]
+        if self._indexed.get(row_id) == (entry_levels(entry), entry_codes(entry)):
+            return False
+        self.remove(row_id)
+        self.add(entry)
+        return True
+
+    def take_changes(self):
+        """Return the row ids added, edited or removed since the last call"""
+        changed, self.changed = self.changed, set()
+        return changed
+
+    def name_owner_rows(self, name):
+        """Return (level field, row id) for each location using name, one entry standing in for a shared node"""
+        owners = []
+        for owner in self.name_owners.get(name, ()):
+            if owner[0] == "#":
+                owners.append((LEVEL_FIELDS[-1], owner[1]))
+            else:
+                node = self.node(owner)
+                owners.append((LEVEL_FIELDS[len(owner) - 1], next(iter(node.row_ids))))
+        return owners
+
+    def node(self, path):
+        """Return the node at path, or None"""
+        node = self.root
+        for name in path:
+            node = node.children.get(name)
+            if node is None:
+                return None
+        return node
+
+    def child_count(self, path):
+        """Return how many distinct locations sit directly under path"""
+        node = self.node(path)
+        return len(node.children) if node else 0
+
+    def rows_with_code(self, code):
+        """Return the row ids of the entries using code"""
+        return list(self.code_rows.get(code, ()))
+
+    def staged_conflicts(self, staged, replaced_ids, check_ids):
+        """Return (row id, field, value) for each name or code of the check_ids entries that would clash.
+        
+        The clash is judged as if the entries in replaced_ids were replaced by
+        the staged entries, so edits that fix or swap duplicates among the
+        replaced entries don't clash.
+        """
+        names, codes = {}, {}
+        
+        def name_owners(name):
+            if name not in names:
+                names[name] = Counter(self.name_owners.get(name, {}))
+            return names[name]
+        
+        def code_rows(code):
+            if code not in codes:
+                codes[code] = Counter(self.code_rows.get(code, {}))
+            return codes[code]
+        
+        for row_id in replaced_ids:
+            if row_id in self._indexed:
+                levels, row_codes = self._indexed[row_id]
+                for name, owner in self._owner_keys(row_id, entry_path(dict(zip(LEVEL_FIELDS, levels)))):
+                    name_owners(name)[owner] -= 1
+                for code in row_codes:
+                    code_rows(code)[row_id] -= 1
+        for entry in staged:
+            row_id = entry[ROW_ID_FIELD]
+            for name, owner in self._owner_keys(row_id, entry_path(entry)):
+                name_owners(name)[owner] += 1
+            for code in entry_codes(entry):
+                code_rows(code)[row_id] += 1
+        
+        conflicts = []
+        for entry in staged:
+            row_id = entry[ROW_ID_FIELD]
+            if row_id not in check_ids:
+                continue
+            for depth, (name, owner) in enumerate(self._owner_keys(row_id, entry_path(entry))):
+                if any(other != owner and count > 0 for other, count in names[name].items()):
+                    conflicts.append((row_id, LEVEL_FIELDS[depth], name))
+            for code in dict.fromkeys(entry_codes(entry)):
+                if sum(count for count in codes[code].values() if count > 0) > 1:
+                    conflicts.append((row_id, "codes", code))
+        return conflicts
+
+def get_hierarchy_index(state=None):
+    """Return this session's hierarchy index, rebuilding it when the entries list is replaced"""
+    state = st.session_state if state is None else state
+    entries = state['hierarchy_data']["entries"]
+    index = state.get('hierarchy_index')
+    if index is None or index.entries is not entries:
+        index = HierarchyIndex(entries)
+        state['hierarchy_index'] = index
+    return index
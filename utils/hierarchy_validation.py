@@ -0,0 +1,108 @@
+# ============================================================================
+# LOCATION HIERARCHY VALIDATION
+# ============================================================================
+# Checks the location rules from the Location Hierarchy instructions:
+#   - names are at most 50 characters
+#   - names have a blank space at least every 25 characters
+#   - every Level 4 entry has a location code
+#   - every location name and every code is unique
+import re
+from collections import namedtuple
+import streamlit as st
+from utils.batch_edit import edited_rows
+from utils.hierarchy_index import LEVEL_FIELDS
+from utils.row_ids import ROW_ID_FIELD
+
+ValidationIssue = namedtuple('ValidationIssue', ['row_id', 'field', 'rule', 'message'])
+
+MAX_LOCATION_NAME_LENGTH = 50
+MAX_CONTIGUOUS_CHARACTERS = 25
+
+_LONG_RUN_RE = re.compile(rf"\S{{{MAX_CONTIGUOUS_CHARACTERS + 1},}}")
+
+def _too_long(row_id, field, name):
+    return ValidationIssue(row_id, field, "max_length",
+                           f"'{name}' is longer than {MAX_LOCATION_NAME_LENGTH} characters")
+
+def _long_run(row_id, field, name):
+    return ValidationIssue(row_id, field, "contiguous_characters",
+                           f"'{name}' needs a blank space at least every {MAX_CONTIGUOUS_CHARACTERS} characters")
+
+def _missing_code(row_id, name):
+    return ValidationIssue(row_id, "codes", "code_required", f"Level 4 location '{name}' needs a location code")
+
+def check_rows(entries):
+    """Return the single-row rule issues for entries in one pass"""
+    issues = []
+    for entry in entries:
+        row_id = entry[ROW_ID_FIELD]
+        for field in LEVEL_FIELDS:
+            name = entry.get(field, "") or ""
+            if len(name) > MAX_LOCATION_NAME_LENGTH:
+                issues.append(_too_long(row_id, field, name))
+            elif _LONG_RUN_RE.search(name):
+                issues.append(_long_run(row_id, field, name))
+        if entry.get("level4") and not any(entry.get("codes", [])):
+            issues.append(_missing_code(row_id, entry["level4"]))
+    return issues
+
+def duplicate_issues(index):
+    """Return an issue for every location sharing a name or code with another one"""
+    issues = []
+    for name in sorted(index.duplicate_names):
+        for field, row_id in index.name_owner_rows(name):
+            issues.append(ValidationIssue(row_id, field, "unique_name", f"'{name}' is used by more than one location"))
+    for code in sorted(index.duplicate_codes):
+        for row_id in index.rows_with_code(code):
+            issues.append(ValidationIssue(row_id, "codes", "unique_code", f"Code '{code}' is used more than once"))
+    return issues
+
+def batch_issues(index, originals, staged, removed_ids):
+    """Return the issues a batch edit of the originals would introduce.
+    
+    Only staged rows whose level names or codes were edited are checked, and
+    uniqueness is judged with all the originals replaced by their staged rows,
+    so a batch can fix or swap duplicates on its page. The code inputs only
+    appear once a row has a Level 4 name, so a Level 4 entered in this batch
+    isn't required to have a code yet.
+    """
+    kept = [row for row in staged if row[ROW_ID_FIELD] not in removed_ids]
+    edited = {row[ROW_ID_FIELD] for row in edited_rows(originals, staged, removed_ids, LEVEL_FIELDS + ("codes",))}
+    had_level4 = {row[ROW_ID_FIELD] for row in originals if row.get("level4")}
+    issues = [issue for issue in check_rows([row for row in kept if row[ROW_ID_FIELD] in edited])
+              if issue.rule != "code_required" or issue.row_id in had_level4]
+    for row_id, field, value in index.staged_conflicts(kept, [row[ROW_ID_FIELD] for row in originals], edited):
+        if field == "codes":
+            issues.append(ValidationIssue(row_id, field, "unique_code", f"Code '{value}' is already used by another location"))
+        else:
+            issues.append(ValidationIssue(row_id, field, "unique_name", f"'{value}' is already used by another location"))
+    return issues
+
+class HierarchyValidator:
+    """Keeps the single-row issues of every entry and re-checks only the rows the index saw change"""
+
+    def __init__(self):
+        self.index = None
+        self.row_issues = {}
+
+    def refresh(self, index):
+        """Bring the issues up to date with index and return the full issue list"""
+        if index is not self.index:
+            # A new index reports every row as changed
+            self.index = index
+            self.row_issues = {}
+
+        changed = index.take_changes()
+        if changed:
+            for row_id in changed:
+                self.row_issues.pop(row_id, None)
+            for issue in check_rows([index.rows[row_id] for row_id in changed if row_id in index.rows]):
+                self.row_issues.setdefault(issue.row_id, []).append(issue)
+
+        return [issue for issues in self.row_issues.values() for issue in issues] + duplicate_issues(index)
+
+def get_hierarchy_validator():
+    """Return this session's hierarchy validator"""
+    if 'hierarchy_validator' not in st.session_state:
+        st.session_state.hierarchy_validator = HierarchyValidator()
+    return st.session_state.hierarchy_validator
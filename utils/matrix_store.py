@@ -0,0 +1,120 @@
+# ============================================================================
+# CALLOUT TYPE MATRIX STORE
+# ============================================================================
+import streamlit as st
+
+class CalloutMatrix:
+    """Location x callout type assignments kept as one integer bitmask per location.
+
+    Locations and callout types are interned: each gets a fixed index on first
+    use, and a callout type's index is its bit position in every location mask.
+    Interned entries are never reused, so removing a callout type from the tab
+    doesn't shift the bits of the others.
+    """
+
+    def __init__(self, locations=None, callout_types=None, masks=None):
+        self.locations = list(locations or [])
+        self.callout_types = list(callout_types or [])
+        self.masks = list(masks or [0] * len(self.locations))
+        self._location_index = {loc: i for i, loc in enumerate(self.locations)}
+        self._ct_index = {ct: i for i, ct in enumerate(self.callout_types)}
+
+    def _location_pos(self, location, create=False):
+        pos = self._location_index.get(location)
+        if pos is None and create:
+            pos = len(self.locations)
+            self.locations.append(location)
+            self.masks.append(0)
+            self._location_index[location] = pos
+        return pos
+
+    def _ct_bit(self, callout_type, create=False):
+        pos = self._ct_index.get(callout_type)
+        if pos is None and create:
+            pos = len(self.callout_types)
+            self.callout_types.append(callout_type)
+            self._ct_index[callout_type] = pos
+        return None if pos is None else 1 << pos
+
+    def get(self, location, callout_type):
+        """Return whether callout_type is assigned to location"""
+        pos = self._location_pos(location)
+        bit = self._ct_bit(callout_type)
+        return bool(pos is not None and bit is not None and self.masks[pos] & bit)
+
+    def set(self, location, callout_type, value):
+        """Assign or unassign one callout type for one location"""
+        if not value and (location not in self._location_index or callout_type not in self._ct_index):
+            return
+        pos = self._location_pos(location, create=True)
+        bit = self._ct_bit(callout_type, create=True)
+        if value:
+            self.masks[pos] |= bit
+        else:
+            self.masks[pos] &= ~bit
+
+    def set_many(self, locations, callout_types, value):
+        """Assign or unassign several callout types across several locations at once"""
+        bits = 0
+        for ct in callout_types:
+            bits |= self._ct_bit(ct, create=True)
+        for location in locations:
+            pos = self._location_pos(location, create=True)
+            self.masks[pos] = self.masks[pos] | bits if value else self.masks[pos] & ~bits
+
+    def row(self, location, callout_types):
+        """Return the assignment flags of one location, in callout_types order"""
+        pos = self._location_pos(location)
+        mask = self.masks[pos] if pos is not None else 0
+        return [bool(mask & (self._ct_bit(ct) or 0)) for ct in callout_types]
+
+    def has_assignments(self):
+        """Return True if any location has at least one callout type assigned"""
+        return any(self.masks)
+
+    def to_dict(self):
+        """Return a JSON-serializable representation for session backups"""
+        return {
+            "callout_types": list(self.callout_types),
+            "locations": list(self.locations),
+            "masks": list(self.masks)
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """Rebuild a matrix saved with to_dict"""
+        return cls(data.get("locations", []), data.get("callout_types", []), data.get("masks", []))
+
+def legacy_matrix_key(location, callout_type):
+    """Return the flat responses key older versions used for one matrix cell"""
+    return f"matrix_{location}_{callout_type}".replace(" ", "_")
+
+def _legacy_flag(value):
+    # Values restored from spreadsheets come back as text
+    if isinstance(value, str):
+        return value.strip().lower() in ("true", "x", "yes", "1")
+    return bool(value)
+
+def get_callout_matrix(state=None):
+    """Return this session's callout type matrix, creating it on first use"""
+    state = st.session_state if state is None else state
+    matrix = state.get('callout_matrix')
+    if not isinstance(matrix, CalloutMatrix):
+        # Backups store the matrix as a plain dict
+        matrix = CalloutMatrix.from_dict(matrix) if isinstance(matrix, dict) else CalloutMatrix()
+        state['callout_matrix'] = matrix
+    return matrix
+
+def migrate_legacy_matrix_responses(responses, locations, callout_types, matrix):
+    """Move legacy matrix_{location}_{type} keys for known locations and types into matrix"""
+    if not any(k.startswith("matrix_") for k in responses):
+        return 0
+
+    moved = 0
+    for location in locations:
+        for ct in callout_types:
+            key = legacy_matrix_key(location, ct)
+            if key in responses:
+                matrix.set(location, ct, _legacy_flag(responses.pop(key)))
+                moved += 1
+    return moved
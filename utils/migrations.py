@@ -0,0 +1,55 @@
+# ============================================================================
+# SESSION SCHEMA MIGRATIONS
+# ============================================================================
+from utils.matrix_store import get_callout_matrix, migrate_legacy_matrix_responses
+from utils.row_ids import ROW_SECTIONS, assign_row_ids
+
+def _backfill_hierarchy_entry_fields(state):
+    """v1: give every hierarchy entry the callout_types and callout_reasons fields"""
+    for entry in state.get('hierarchy_data', {}).get("entries", []):
+        if "callout_types" not in entry:
+            entry["callout_types"] = {
+                "Normal": False,
+                "All Hands on Deck": False,
+                "Fill Shift": False,
+                "Travel": False,
+                "Notification": False,
+                "Notification (No Response)": False
+            }
+        if "callout_reasons" not in entry:
+            entry["callout_reasons"] = ""
+
+def _move_legacy_matrix_responses(state):
+    """v2: move flat matrix_{location}_{type} responses into the callout matrix"""
+    if 'hierarchy_data' in state and 'callout_types' in state:
+        locations = [e["level4"] for e in state['hierarchy_data']["entries"] if e.get("level4")]
+        migrate_legacy_matrix_responses(state.get('responses', {}), locations,
+                                        state['callout_types'], get_callout_matrix(state))
+
+def _assign_row_ids(state):
+    """v3: give every hierarchy entry and list row a persistent row_id"""
+    assign_row_ids(state.get('hierarchy_data', {}).get("entries", []))
+    for key in ROW_SECTIONS:
+        assign_row_ids(state.get(key, []))
+
+# Ordered (version, migration) pairs; a migration brings a session from the
+# previous version up to its own. Append new steps, never reorder or edit old ones.
+MIGRATIONS = [
+    (1, _backfill_hierarchy_entry_fields),
+    (2, _move_legacy_matrix_responses),
+    (3, _assign_row_ids)
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+def migrate_session(state):
+    """Run the migrations newer than the session's schema_version and return how many ran"""
+    version = state.get('schema_version', 0)
+    applied = 0
+    for target, migration in MIGRATIONS:
+        if version < target:
+            migration(state)
+            version = target
+            applied += 1
+    state['schema_version'] = version
+    return applied
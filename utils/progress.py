@@ -0,0 +1,99 @@
+# ============================================================================
+# SECTION COMPLETION TRACKING
+# ============================================================================
+import streamlit as st
+from utils.matrix_store import get_callout_matrix
+
+def _hierarchy_complete(state):
+    hierarchy_data = state.get('hierarchy_data')
+    return bool(hierarchy_data and hierarchy_data.get("entries")
+                and any(entry.get("level1") for entry in hierarchy_data["entries"]))
+
+def _trouble_locations_complete(state):
+    return any(loc.get("location") for loc in state.get('trouble_locations', []))
+
+def _job_classifications_complete(state):
+    return any(job.get("title") for job in state.get('job_classifications', []))
+
+def _callout_reasons_complete(state):
+    return bool(state.get('selected_callout_reasons'))
+
+def _event_types_complete(state):
+    return any(event.get("use") for event in state.get('event_types', []))
+
+def _callout_matrix_complete(state):
+    # Restored backups hold the matrix as a plain dict until first use
+    return 'callout_matrix' in state and get_callout_matrix(state).has_assignments()
+
+def _global_config_complete(state):
+    answers = state.get('global_config_answers', {})
+    return any(v for v in answers.values() if v not in (None, '', False, 0))
+
+def _data_interfaces_complete(state):
+    data_interfaces = state.get('data_interfaces')
+    if not data_interfaces:
+        return False
+    # Check if any top-level values are filled
+    if any(data_interfaces.get(k, '') for k in ('employee_data', 'pii_consideration', 'hri_oti_review')):
+        return True
+    # Also check nested dictionaries
+    for nested in ('hr_interface', 'overtime_interface'):
+        if any(v for v in data_interfaces.get(nested, {}).values() if v):
+            return True
+    return False
+
+def _additions_complete(state):
+    additions = state.get('additions', {})
+    return any(v for v in additions.values() if v not in (None, '', False, 0, [], {}))
+
+# Completion check for each tab, in display order
+SECTION_CHECKS = {
+    "Location Hierarchy": _hierarchy_complete,
+    "Trouble Locations": _trouble_locations_complete,
+    "Job Classifications": _job_classifications_complete,
+    "Callout Reasons": _callout_reasons_complete,
+    "Event Types": _event_types_complete,
+    "Callout Type Configuration": _callout_matrix_complete,
+    "Global Configuration": _global_config_complete,
+    "Data and Interfaces": _data_interfaces_complete,
+    "Additions": _additions_complete
+}
+
+class CompletionTracker:
+    """Per-section completion flags that are only re-checked when a section is marked dirty"""
+
+    def __init__(self):
+        self.complete = {section: False for section in SECTION_CHECKS}
+        self.dirty = set(SECTION_CHECKS)
+        self.completed_count = 0
+
+    @property
+    def total(self):
+        return len(SECTION_CHECKS)
+
+    def mark_dirty(self, section=None):
+        """Flag one section (or every section when None) for re-checking"""
+        if section is None:
+            self.dirty.update(SECTION_CHECKS)
+        elif section in SECTION_CHECKS:
+            self.dirty.add(section)
+
+    def refresh(self, state):
+        """Re-check dirty sections and return the number of completed sections"""
+        while self.dirty:
+            section = self.dirty.pop()
+            done = SECTION_CHECKS[section](state)
+            if done != self.complete[section]:
+                self.completed_count += 1 if done else -1
+                self.complete[section] = done
+        return self.completed_count
+
+def get_completion_tracker():
+    """Return this session's completion tracker, creating it on first use"""
+    if 'completion_tracker' not in st.session_state:
+        st.session_state.completion_tracker = CompletionTracker()
+    return st.session_state.completion_tracker
+
+def mark_section_dirty(section=None):
+    """Flag a section whose state is about to change so the progress bar re-checks it"""
+    get_completion_tracker().mark_dirty(section)
@@ -0,0 +1,291 @@
+# ============================================================================
+# API RATE LIMITING AND CIRCUIT BREAKER
+# ============================================================================
+import random
+import threading
+import time
+from collections import deque
+from config.settings import (
+    AI_MAX_CONCURRENT_REQUESTS,
+    AI_RATE_LIMIT_PER_MINUTE,
+    AI_RATE_LIMIT_BURST,
+    AI_QUEUE_TIMEOUT_SECONDS,
+    AI_MAX_RETRIES,
+    AI_RETRY_BASE_DELAY_SECONDS,
+    AI_RETRY_MAX_DELAY_SECONDS,
+    AI_CIRCUIT_FAILURE_THRESHOLD,
+    AI_CIRCUIT_RESET_SECONDS
+)
+
+class RateLimitTimeout(Exception):
+    """Raised when a call waits in the queue longer than its queue timeout"""
+
+class CircuitOpenError(Exception):
+    """Raised when calls are refused because the API has been failing"""
+
+class DeadlineExceeded(Exception):
+    """Raised when a streamed call is still running at its caller's deadline"""
+
+def remaining_seconds(deadline):
+    """Seconds left until a time.monotonic() deadline (never negative), or None without one"""
+    return None if deadline is None else max(deadline - time.monotonic(), 0)
+
+class TokenBucket:
+    """Thread-safe token bucket: rate tokens per second, holding at most capacity"""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, timeout=None):
+        """Take one token, waiting for it to refill; returns False on timeout"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+                wait = (1 - self._tokens) / self.rate
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                wait = min(wait, remaining)
+            time.sleep(wait)
+
+class CircuitBreaker:
+    """Opens after failure_threshold consecutive failures and refuses calls for reset_seconds.
+
+    Once reset_seconds have passed a single trial call is let through: success
+    closes the circuit, failure opens it again.
+    """
+
+    def __init__(self, failure_threshold, reset_seconds):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.failures = 0
+        self.opened_at = None
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at < self.reset_seconds:
+            return "open"
+        return "half-open"
+
+    def allow(self):
+        """Return True if a call may go ahead now"""
+        with self._lock:
+            state = self.state
+            if state == "closed":
+                return True
+            if state == "half-open" and not self._trial_running:
+                self._trial_running = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial_running = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self._trial_running or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+            self._trial_running = False
+
+class GateMetrics:
+    """Counters plus recent queue-wait and latency samples (in seconds)"""
+
+    def __init__(self, max_samples=500):
+        self.calls = 0
+        self.retries = 0
+        self.failures = 0
+        self.rejected = 0
+        self.queue_waits = deque(maxlen=max_samples)
+        self.latencies = deque(maxlen=max_samples)
+        self._lock = threading.Lock()
+
+    def record(self, name, value=1):
+        with self._lock:
+            if name in ("queue_waits", "latencies"):
+                getattr(self, name).append(value)
+            else:
+                setattr(self, name, getattr(self, name) + value)
+
+    def snapshot(self):
+        """Return the counters and p50/p95/max of the recorded samples"""
+        with self._lock:
+            summary = {"calls": self.calls, "retries": self.retries,
+                       "failures": self.failures, "rejected": self.rejected}
+            for name in ("queue_waits", "latencies"):
+                samples = sorted(getattr(self, name))
+                summary[name] = {
+                    "count": len(samples),
+                    "p50": samples[len(samples) // 2] if samples else 0.0,
+                    "p95": samples[min(len(samples) - 1, int(len(samples) * 0.95))] if samples else 0.0,
+                    "max": samples[-1] if samples else 0.0
+                }
+            return summary
+
+def _status_code(exc):
+    return getattr(exc, "status_code", None)
+
+def is_retryable_error(exc):
+    """Default retry check: rate limiting (429) and server errors (5xx)"""
+    status = _status_code(exc)
+    return status is not None and (status == 429 or status >= 500)
+
+def _retry_after(exc):
+    # Honour a Retry-After header (in seconds) when the API sends one
+    headers = getattr(getattr(exc, "response", None), "headers", None) or {}
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+class ApiGate:
+    """Process-wide admission control for calls to one API.
+
+    Calls queue for a concurrency slot (semaphore) and a rate token (token
+    bucket), are retried with exponential backoff on retryable errors, and
+    are refused outright while the circuit breaker is open.
+    
+    call and stream take an optional deadline (a time.monotonic() value) from
+    a caller that stops waiting at that point: queueing is cut short and no
+    retry is started that couldn't finish before it.
+    """
+
+    def __init__(self, max_concurrent, rate_per_minute, burst, queue_timeout,
+                 max_retries, base_delay, max_delay, failure_threshold, reset_seconds,
+                 retryable=is_retryable_error):
+        self.bucket = TokenBucket(rate_per_minute / 60.0, burst)
+        self.slots = threading.BoundedSemaphore(max_concurrent)
+        self.breaker = CircuitBreaker(failure_threshold, reset_seconds)
+        self.metrics = GateMetrics()
+        self.queue_timeout = queue_timeout
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retryable = retryable
+
+    def _admit(self, deadline=None):
+        """Wait for a concurrency slot and a rate token; the caller must release the slot.
+
+        A queue_timeout of None waits as long as it takes, or until deadline.
+        """
+        started = time.monotonic()
+        queue_timeout = self.queue_timeout
+        if deadline is not None:
+            left = remaining_seconds(deadline)
+            queue_timeout = left if queue_timeout is None else min(queue_timeout, left)
+        if not self.slots.acquire(timeout=queue_timeout):
+            self.metrics.record("rejected")
+            raise RateLimitTimeout("The assistant is busy. Please try again in a moment.")
+        remaining = None if queue_timeout is None else max(queue_timeout - (time.monotonic() - started), 0)
+        if not self.bucket.acquire(timeout=remaining):
+            self.slots.release()
+            self.metrics.record("rejected")
+            raise RateLimitTimeout("The assistant is busy. Please try again in a moment.")
+        # Checked last so a half-open trial is only granted to a call that can run now
+        if not self.breaker.allow():
+            self.slots.release()
+            self.metrics.record("rejected")
+            raise CircuitOpenError("The assistant is temporarily unavailable after repeated API errors. Please try again shortly.")
+        self.metrics.record("queue_waits", time.monotonic() - started)
+
+    def _backoff(self, attempt, exc, deadline=None):
+        """Sleep before the next attempt; returns False instead if the wait would pass deadline"""
+        delay = _retry_after(exc)
+        if delay is None:
+            delay = self.base_delay * (2 ** attempt) * (0.5 + random.random())
+        delay = min(delay, self.max_delay)
+        if deadline is not None and delay >= remaining_seconds(deadline):
+            return False
+        time.sleep(delay)
+        return True
+
+    def _run(self, fn, deadline=None):
+        # Runs fn with retries; returns (result, started) where started is the time of the successful attempt
+        attempt = 0
+        while True:
+            self._admit(deadline)
+            started = time.monotonic()
+            try:
+                result = fn()
+                self.metrics.record("calls")
+                return result, started
+            except Exception as e:
+                self.slots.release()
+                if not self.retryable(e):
+                    # The API answered (e.g. a 400), so it counts as reachable
+                    self.breaker.record_success()
+                    self.metrics.record("failures")
+                    raise
+                self.breaker.record_failure()
+                if (attempt < self.max_retries and self.breaker.state == "closed"
+                        and self._backoff(attempt, e, deadline)):
+                    self.metrics.record("retries")
+                    attempt += 1
+                    continue
+                self.metrics.record("failures")
+                raise
+
+    def call(self, fn, deadline=None):
+        """Run fn() under the gate and return its result"""
+        result, started = self._run(fn, deadline)
+        self.slots.release()
+        self.metrics.record("latencies", time.monotonic() - started)
+        self.breaker.record_success()
+        return result
+
+    def stream(self, fn, deadline=None):
+        """Run fn() under the gate and yield from the iterator it returns.
+
+        Only opening the stream is retried; the concurrency slot is held until
+        the stream has been consumed or closed, or deadline passes.
+        """
+        stream, started = self._run(fn, deadline)
+        # The stream opened, so the API is up whatever happens mid-stream
+        self.breaker.record_success()
+        try:
+            for item in stream:
+                if deadline is not None and time.monotonic() > deadline:
+                    raise DeadlineExceeded("The assistant took too long to answer.")
+                yield item
+        finally:
+            # Drops the connection of a stream abandoned part way
+            close = getattr(stream, "close", None)
+            if close is not None:
+                close()
+            self.slots.release()
+            self.metrics.record("latencies", time.monotonic() - started)
+
+_openai_gate = None
+_openai_gate_lock = threading.Lock()
+
+def get_openai_gate(retryable=is_retryable_error):
+    """Return the process-wide gate for OpenAI calls configured in settings"""
+    global _openai_gate
+    if _openai_gate is None:
+        with _openai_gate_lock:
+            if _openai_gate is None:
+                _openai_gate = ApiGate(
+                    AI_MAX_CONCURRENT_REQUESTS, AI_RATE_LIMIT_PER_MINUTE, AI_RATE_LIMIT_BURST,
+                    AI_QUEUE_TIMEOUT_SECONDS, AI_MAX_RETRIES, AI_RETRY_BASE_DELAY_SECONDS,
+                    AI_RETRY_MAX_DELAY_SECONDS, AI_CIRCUIT_FAILURE_THRESHOLD, AI_CIRCUIT_RESET_SECONDS,
+                    retryable
+                )
+    return _openai_gate
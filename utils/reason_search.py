@@ -0,0 +1,102 @@
+# ============================================================================
+# CALLOUT REASON SEARCH INDEX
+# ============================================================================
+import threading
+from collections import Counter, defaultdict
+from utils.callout_catalog import get_callout_catalog, LABEL_FIELD, ID_FIELD
+
+# Queries shorter than a trigram scan the pre-lowered fields instead
+TRIGRAM_LENGTH = 3
+
+# Share of the query's trigrams a reason needs to show up as a close match
+FUZZY_MIN_SCORE = 0.5
+
+# Keeps a match from spanning the end of the ID and the start of the label
+_FIELD_SEPARATOR = "\x00"
+
+def trigrams(text):
+    """Return the set of three-character substrings of text"""
+    return {text[i:i + TRIGRAM_LENGTH] for i in range(len(text) - TRIGRAM_LENGTH + 1)}
+
+class ReasonSearchIndex:
+    """Lowercased ID and label of every catalog reason plus a trigram index over them.
+
+    Results are positions in catalog.reasons, in catalog order, so the caller
+    only looks up the reasons it actually displays.
+    """
+
+    def __init__(self, catalog):
+        self.catalog = catalog
+        self.ids = [str(r.get(ID_FIELD, "")) for r in catalog.reasons]
+        self.keys = [f"{reason_id}{_FIELD_SEPARATOR}{r.get(LABEL_FIELD, '')}".lower()
+                     for reason_id, r in zip(self.ids, catalog.reasons)]
+        self.postings = defaultdict(list)
+        for pos, key in enumerate(self.keys):
+            for gram in trigrams(key):
+                self.postings[gram].append(pos)
+        self._cache = {}
+
+    def __len__(self):
+        return len(self.keys)
+
+    def search(self, term):
+        """Return the positions of reasons whose ID or label contains term, ignoring case.
+        
+        Results are cached per term and shared, so don't modify the returned list.
+        """
+        term = term.lower().strip()
+        if not term:
+            return list(range(len(self.keys)))
+        if term in self._cache:
+            return self._cache[term]
+
+        if len(term) < TRIGRAM_LENGTH:
+            candidates = range(len(self.keys))
+        else:
+            # Every trigram of the term must occur in a match; start from the rarest
+            postings = sorted((self.postings.get(gram, ()) for gram in trigrams(term)), key=len)
+            candidates = set(postings[0])
+            for posting in postings[1:]:
+                if not candidates:
+                    break
+                candidates.intersection_update(posting)
+            candidates = sorted(candidates)
+
+        # Trigrams narrow the candidates; the substring check keeps the old matching rules
+        matches = [pos for pos in candidates if term in self.keys[pos]]
+        if len(self._cache) > 256:
+            self._cache.clear()
+        self._cache[term] = matches
+        return matches
+
+    def rank(self, term, limit=None):
+        """Return the positions of reasons sharing most of term's trigrams, closest first"""
+        grams = trigrams(term.lower().strip())
+        if not grams:
+            return []
+        hits = Counter()
+        for gram in grams:
+            hits.update(self.postings.get(gram, ()))
+        ranked = sorted((pos for pos, count in hits.items() if count / len(grams) >= FUZZY_MIN_SCORE),
+                        key=lambda pos: (-hits[pos], pos))
+        return ranked[:limit] if limit else ranked
+
+_search_index = None
+_search_index_lock = threading.Lock()
+
+def get_reason_search_index(catalog=None):
+    """Return the process-wide search index for catalog, rebuilt only when the catalog changes.
+    
+    Pass the catalog whose reasons the results will index into, so a reload
+    in between can't pair positions with another catalog's list.
+    """
+    global _search_index
+    catalog = get_callout_catalog() if catalog is None else catalog
+    index = _search_index
+    if index is not None and index.catalog is catalog:
+        return index
+
+    with _search_index_lock:
+        if _search_index is None or _search_index.catalog is not catalog:
+            _search_index = ReasonSearchIndex(catalog)
+        return _search_index
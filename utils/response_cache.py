@@ -0,0 +1,149 @@
+# ============================================================================
+# AI RESPONSE CACHE
+# ============================================================================
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from config.settings import (
+    AI_RESPONSE_CACHE_MAX_ENTRIES,
+    AI_RESPONSE_CACHE_TTL_SECONDS,
+    AI_RESPONSE_CACHE_PATH
+)
+
+def response_cache_key(model, context, prompt):
+    """Return the cache key for one (model, system context, prompt) request"""
+    payload = json.dumps([model, context, prompt], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+class ResponseCache:
+    """Thread-safe TTL/LRU cache of assistant responses, shared by every session.
+
+    Identical requests that arrive while one is already being answered wait
+    for that answer instead of calling the API again. With a db_path, entries
+    are also written to a SQLite file so they survive restarts.
+    """
+
+    def __init__(self, max_entries=256, ttl_seconds=86400, db_path=None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.db_path = db_path
+        self._entries = OrderedDict()
+        self._in_flight = {}
+        self._lock = threading.Lock()
+        self._db = self._open_db(db_path) if db_path else None
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def _open_db(self, db_path):
+        try:
+            db = sqlite3.connect(db_path, check_same_thread=False)
+            db.execute("CREATE TABLE IF NOT EXISTS responses "
+                       "(key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)")
+            db.execute("DELETE FROM responses WHERE expires_at <= ?", (time.time(),))
+            db.commit()
+            return db
+        except sqlite3.Error as e:
+            print(f"Warning: AI response cache file unavailable - {str(e)}")
+            return None
+
+    def _lookup(self, key, now):
+        # Caller holds self._lock
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry[0] > now:
+                self._entries.move_to_end(key)
+                return entry[1]
+            del self._entries[key]
+        if self._db is not None:
+            row = self._db.execute("SELECT value, expires_at FROM responses WHERE key = ? AND expires_at > ?",
+                                   (key, now)).fetchone()
+            if row is not None:
+                self._remember(key, row[0], row[1])
+                return row[0]
+        return None
+
+    def _remember(self, key, value, expires_at):
+        # Caller holds self._lock
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def get(self, key):
+        """Return the cached response for key, or None if missing or expired"""
+        with self._lock:
+            return self._lookup(key, time.time())
+
+    def put(self, key, value):
+        """Store a response under key for ttl_seconds"""
+        expires_at = time.time() + self.ttl_seconds
+        with self._lock:
+            self._remember(key, value, expires_at)
+            if self._db is not None:
+                try:
+                    self._db.execute("INSERT OR REPLACE INTO responses (key, value, expires_at) VALUES (?, ?, ?)",
+                                     (key, value, expires_at))
+                    self._db.commit()
+                except sqlite3.Error as e:
+                    print(f"Warning: could not persist AI response - {str(e)}")
+
+    def get_or_compute(self, key, compute):
+        """Return the cached response for key, calling compute() once on a miss.
+
+        Concurrent callers with the same key share a single compute() call.
+        Exceptions are passed on to every waiting caller and nothing is cached.
+        """
+        with self._lock:
+            value = self._lookup(key, time.time())
+            if value is not None:
+                self.hits += 1
+                return value
+            future = self._in_flight.get(key)
+            leader = future is None
+            if leader:
+                future = self._in_flight[key] = Future()
+                self.misses += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            return future.result()
+
+        try:
+            value = compute()
+            self.put(key, value)
+            future.set_result(value)
+            return value
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+
+    def clear(self):
+        """Drop every cached response, including the persisted ones"""
+        with self._lock:
+            self._entries.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM responses")
+                self._db.commit()
+
+_response_cache = None
+_response_cache_lock = threading.Lock()
+
+def get_response_cache():
+    """Return the process-wide response cache configured in settings"""
+    global _response_cache
+    if _response_cache is None:
+        with _response_cache_lock:
+            if _response_cache is None:
+                _response_cache = ResponseCache(AI_RESPONSE_CACHE_MAX_ENTRIES,
+                                                AI_RESPONSE_CACHE_TTL_SECONDS,
+                                                AI_RESPONSE_CACHE_PATH)
+    return _response_cache
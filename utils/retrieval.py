@@ -0,0 +1,141 @@
+# ============================================================================
+# LOCAL RETRIEVAL INDEX FOR ASSISTANT PROMPTS
+# ============================================================================
+import json
+import math
+import re
+import threading
+from collections import Counter, defaultdict, namedtuple
+from config.settings import SIG_DESCRIPTIONS_PATH, AI_CONTEXT_TOKEN_BUDGET, AI_CONTEXT_TOP_K
+from utils.callout_catalog import get_callout_catalog, LABEL_FIELD, ID_FIELD
+
+Snippet = namedtuple('Snippet', ['source', 'title', 'text'])
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+# Words too common in questions and descriptions to help ranking
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "can", "do", "does", "for", "from", "how",
+    "i", "if", "in", "is", "it", "of", "on", "or", "should", "that", "the", "this", "to", "what",
+    "when", "which", "with", "you", "your", "arcos"
+}
+
+def tokenize(text):
+    """Lowercase text and split it into index terms"""
+    return [word for word in _WORD_RE.findall(text.lower()) if word not in STOPWORDS]
+
+def estimate_tokens(text):
+    """Rough model token count for text (about four characters per token)"""
+    return (len(text) + 3) // 4
+
+def _sig_description_snippets(path=SIG_DESCRIPTIONS_PATH):
+    try:
+        with open(path, 'r') as file:
+            descriptions = json.load(file)
+    except Exception as e:
+        print(f"Warning: SIG descriptions not indexed - {str(e)}")
+        return []
+
+    snippets = []
+    for tab_name, tab_desc in descriptions.items():
+        snippets.append(Snippet("sig", tab_name, tab_desc.get("description", "")))
+        for field_name, field_info in tab_desc.get("fields", {}).items():
+            parts = [field_info.get("description", "")]
+            if field_info.get("example"):
+                parts.append(f"Example: {field_info['example']}")
+            if field_info.get("best_practices"):
+                parts.append(f"Best practices: {field_info['best_practices']}")
+            snippets.append(Snippet("sig", f"{tab_name} > {field_name}", " ".join(parts)))
+    return snippets
+
+def _callout_reason_snippets(catalog):
+    snippets = []
+    for reason in catalog.reasons:
+        label = reason.get(LABEL_FIELD)
+        if label:
+            text = f"Callout reason {reason.get(ID_FIELD, '')}: {label} (verbiage: {reason.get('Verbiage', '')})"
+            snippets.append(Snippet("callout_reasons", f"Callout Reasons > {label}", text))
+    return snippets
+
+def _global_config_snippets():
+    from utils.global_config_questions import GLOBAL_CONFIG_QUESTIONS
+
+    # One snippet per category keeps related checkbox options together
+    grouped = defaultdict(list)
+    for section, questions in GLOBAL_CONFIG_QUESTIONS.items():
+        for question in questions:
+            text = question["question"]
+            if question.get("options"):
+                text += f" (options: {', '.join(map(str, question['options']))})"
+            grouped[(section, question.get("category", ""))].append(text)
+    return [Snippet("global_config", f"Global Configuration > {section} > {category}", "; ".join(texts))
+            for (section, category), texts in grouped.items()]
+
+class BM25Index:
+    """Okapi BM25 ranking over a fixed list of snippets"""
+
+    def __init__(self, snippets, k1=1.5, b=0.75):
+        self.snippets = snippets
+        self.k1 = k1
+        self.b = b
+        self.postings = defaultdict(list)
+        self.doc_lengths = []
+        for doc_id, snippet in enumerate(snippets):
+            terms = tokenize(f"{snippet.title} {snippet.text}")
+            self.doc_lengths.append(len(terms))
+            for term, tf in Counter(terms).items():
+                self.postings[term].append((doc_id, tf))
+        self.avg_length = sum(self.doc_lengths) / len(self.doc_lengths) if self.doc_lengths else 0
+        n = len(snippets)
+        self.idf = {term: math.log(1 + (n - len(docs) + 0.5) / (len(docs) + 0.5))
+                    for term, docs in self.postings.items()}
+
+    def search(self, query, k=5):
+        """Return up to k (score, snippet) pairs for query, best first"""
+        scores = defaultdict(float)
+        for term in set(tokenize(query)):
+            idf = self.idf.get(term)
+            if idf is None:
+                continue
+            for doc_id, tf in self.postings[term]:
+                norm = self.k1 * (1 - self.b + self.b * self.doc_lengths[doc_id] / self.avg_length)
+                scores[doc_id] += idf * tf * (self.k1 + 1) / (tf + norm)
+        best = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:k]
+        return [(score, self.snippets[doc_id]) for doc_id, score in best]
+
+_index = None
+_index_catalog = None
+_index_lock = threading.Lock()
+
+def get_retrieval_index():
+    """Return the process-wide index, built once and rebuilt only when the callout catalog changes"""
+    global _index, _index_catalog
+    catalog = get_callout_catalog()
+    if _index is not None and _index_catalog is catalog:
+        return _index
+
+    with _index_lock:
+        if _index is None or _index_catalog is not catalog:
+            snippets = _sig_description_snippets() + _callout_reason_snippets(catalog) + _global_config_snippets()
+            _index = BM25Index(snippets)
+            _index_catalog = catalog
+        return _index
+
+def build_reference_context(question, token_budget=AI_CONTEXT_TOKEN_BUDGET, top_k=AI_CONTEXT_TOP_K):
+    """Return the top-ranked snippets for question as prompt text, within token_budget"""
+    lines = []
+    remaining = token_budget
+    for _, snippet in get_retrieval_index().search(question, top_k):
+        line = f"- {snippet.title}: {snippet.text}"
+        cost = estimate_tokens(line)
+        if cost > remaining:
+            if lines:
+                continue
+            # Always include the best match, cut down to the budget
+            line = line[:remaining * 4]
+            cost = remaining
+        lines.append(line)
+        remaining -= cost
+        if remaining <= 0:
+            break
+    return "\n".join(lines)
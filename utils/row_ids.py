@@ -0,0 +1,39 @@
+# ============================================================================
+# STABLE ROW IDENTITIES
+# ============================================================================
+# Rows in the hierarchy, trouble location, job classification and event type
+# lists carry a row_id that never changes, so widget keys survive inserts and
+# deletes elsewhere in the list.
+import uuid
+
+ROW_ID_FIELD = "row_id"
+
+# Session state lists whose rows carry a row_id
+ROW_SECTIONS = ['job_classifications', 'trouble_locations', 'event_types']
+
+def new_row_id():
+    """Return a fresh row id"""
+    return uuid.uuid4().hex[:12]
+
+def with_row_id(record):
+    """Give record a row id if it doesn't have one yet and return it"""
+    if ROW_ID_FIELD not in record:
+        record[ROW_ID_FIELD] = new_row_id()
+    return record
+
+def assign_row_ids(records):
+    """Give every record without a row id a new one and return how many were assigned"""
+    assigned = 0
+    for record in records:
+        if ROW_ID_FIELD not in record:
+            record[ROW_ID_FIELD] = new_row_id()
+            assigned += 1
+    return assigned
+
+def remove_row(records, row_id):
+    """Remove the record with row_id from records; return False if it isn't there"""
+    for i, record in enumerate(records):
+        if record.get(ROW_ID_FIELD) == row_id:
+            del records[i]
+            return True
+    return False
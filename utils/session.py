@@ -2,22 +2,30 @@
 # SESSION STATE MANAGEMENT
 # ============================================================================
 import streamlit as st
-import json
 from config.constants import (
     DEFAULT_HIERARCHY_DATA, 
     DEFAULT_CALLOUT_TYPES, 
     DEFAULT_CALLOUT_REASONS,
-    DEFAULT_JOB_CLASSIFICATION,
-    DEFAULT_TROUBLE_LOCATION
+    DEFAULT_JOB_CLASSIFICATIONS,
+    DEFAULT_TROUBLE_LOCATIONS
 )
+from utils.callout_catalog import get_callout_catalog
+from utils.chat_history import ChatHistory
+from utils.frozen import is_frozen, thaw
+from utils.migrations import SCHEMA_VERSION, migrate_session
+from utils.row_ids import assign_row_ids
 
 def initialize_session_state():
-    """Initialize session state variables if they don't exist"""
+    """Initialize session state variables once per session and bring them up to SCHEMA_VERSION"""
+    # Sessions that have been initialized and migrated need no further checks
+    if st.session_state.get('schema_version', 0) >= SCHEMA_VERSION:
+        return
+    
     if 'responses' not in st.session_state:
         st.session_state.responses = {}
     
     if 'chat_history' not in st.session_state:
-        st.session_state.chat_history = []
+        st.session_state.chat_history = ChatHistory()
     
     if 'current_tab' not in st.session_state:
         st.session_state.current_tab = "Location Hierarchy"
@@ -26,21 +34,6 @@ def initialize_session_state():
         # Initialize with default data
         st.session_state.hierarchy_data = DEFAULT_HIERARCHY_DATA
     
-    # If existing entries don't have callout_types or callout_reasons fields, add them
-    if 'hierarchy_data' in st.session_state:
-        for entry in st.session_state.hierarchy_data["entries"]:
-            if "callout_types" not in entry:
-                entry["callout_types"] = {
-                    "Normal": False,
-                    "All Hands on Deck": False,
-                    "Fill Shift": False,
-                    "Travel": False,
-                    "Notification": False,
-                    "Notification (No Response)": False
-                }
-            if "callout_reasons" not in entry:
-                entry["callout_reasons"] = ""
-        
     if 'callout_types' not in st.session_state:
         st.session_state.callout_types = DEFAULT_CALLOUT_TYPES
     
@@ -48,51 +41,38 @@ def initialize_session_state():
         st.session_state.callout_reasons = DEFAULT_CALLOUT_REASONS
         
     if 'job_classifications' not in st.session_state:
-        st.session_state.job_classifications = [DEFAULT_JOB_CLASSIFICATION]
+        st.session_state.job_classifications = DEFAULT_JOB_CLASSIFICATIONS
     
     if 'trouble_locations' not in st.session_state:
-        st.session_state.trouble_locations = [DEFAULT_TROUBLE_LOCATION]
+        st.session_state.trouble_locations = DEFAULT_TROUBLE_LOCATIONS
     
     if 'event_types' not in st.session_state:
         # Initialize event types with default data (this will be populated from actual defaults later)
         st.session_state.event_types = load_default_event_types()
+        assign_row_ids(st.session_state.event_types)
     
     if 'selected_callout_reasons' not in st.session_state:
-        try:
-            # Try to load from callout_reasons.json
-            callout_reasons = load_callout_reasons()
-            st.session_state.selected_callout_reasons = [r["ID"] for r in callout_reasons if r.get("Use?") == "x"]
-        except:
-            # Default to empty if can't load
-            st.session_state.selected_callout_reasons = []
+        st.session_state.selected_callout_reasons = list(get_callout_catalog().used_ids)
     
     if 'default_callout_reason' not in st.session_state:
-        try:
-            callout_reasons = load_callout_reasons()
-            default_reasons = [r["ID"] for r in callout_reasons if r.get("Default?") == "x"]
-            st.session_state.default_callout_reason = default_reasons[0] if default_reasons else ""
-        except:
-            st.session_state.default_callout_reason = ""
+        st.session_state.default_callout_reason = get_callout_catalog().default_id
     
     if 'current_page' not in st.session_state:
         st.session_state.current_page = 0
+    
+    migrate_session(st.session_state)
+
+def thaw_section(key):
+    """Return the session's writable copy of a section, copying it first if it still references frozen defaults"""
+    value = st.session_state.get(key)
+    if is_frozen(value):
+        value = thaw(value)
+        st.session_state[key] = value
+    return value
 
 def load_callout_reasons():
-    """Load callout reasons from JSON file"""
-    try:
-        with open('data/callout_reasons.json', 'r') as file:
-            return json.load(file)
-    except Exception as e:
-        print(f"Error loading callout reasons: {str(e)}")
-        # Return a basic set if file can't be loaded
-        return [
-            {"ID": "0", "Callout Reason Drop-Down Label": "", "Use?": "x", "Default?": "x", "Verbiage": "n/a"},
-            {"ID": "1001", "Callout Reason Drop-Down Label": "Broken Line", "Use?": "x", "Default?": "", "Verbiage": "Pre-recorded"},
-            {"ID": "1002", "Callout Reason Drop-Down Label": "Depression Road", "Use?": "x", "Default?": "", "Verbiage": "Pre-recorded"},
-            {"ID": "1003", "Callout Reason Drop-Down Label": "Depression Yard", "Use?": "x", "Default?": "", "Verbiage": "Pre-recorded"},
-            {"ID": "1007", "Callout Reason Drop-Down Label": "Emergency", "Use?": "x", "Default?": "", "Verbiage": "Pre-recorded"},
-            {"ID": "1008", "Callout Reason Drop-Down Label": "Odor", "Use?": "x", "Default?": "", "Verbiage": "Pre-recorded"}
-        ]
+    """Load callout reasons from the shared catalog"""
+    return get_callout_catalog().reasons
 
 def load_default_event_types():
     """Load default event types"""
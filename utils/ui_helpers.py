@@ -99,4 +99,32 @@ def render_icon_tabs(tabs, tab_icons):
                           help=f"Switch to {tab} tab", 
                           disabled=tab == current_tab):
             st.session_state.current_tab = tab
-            st.rerun()
\ No newline at end of file
+            st.rerun()
+
+def render_pagination_controls(total_items, items_per_page, page_key):
+    """Render Previous/Next controls and return the (start, end) slice for the current page"""
+    total_pages = max(1, (total_items + items_per_page - 1) // items_per_page)
+    
+    # Cap current page to valid range
+    page = st.session_state.get(page_key, 0)
+    page = max(0, min(page, total_pages - 1))
+    st.session_state[page_key] = page
+    
+    if total_pages > 1:
+        page_cols = st.columns([1, 3, 1])
+        
+        with page_cols[0]:
+            if st.button("◀ Previous", key=f"{page_key}_prev", disabled=page == 0):
+                st.session_state[page_key] = page - 1
+                st.rerun()
+        
+        with page_cols[1]:
+            st.write(f"Page {page + 1} of {total_pages}")
+        
+        with page_cols[2]:
+            if st.button("Next ▶", key=f"{page_key}_next", disabled=page >= total_pages - 1):
+                st.session_state[page_key] = page + 1
+                st.rerun()
+    
+    start = page * items_per_page
+    return start, min(start + items_per_page, total_items)